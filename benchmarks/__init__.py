@@ -0,0 +1 @@
+"""Data-access benchmarks run against a local warehouse stand-in"""
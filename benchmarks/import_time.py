@@ -0,0 +1,102 @@
+"""
+Import-time budget report
+Measures what importing each page's modules costs on a cold interpreter (python -X
+importtime in a fresh process), which is paid before the first byte of a cold start,
+and checks it against a budget. Modules the app is meant to import lazily are listed
+when a page still loads them eagerly.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 600 --fail-over-budget
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+# Import time allowed per page, in milliseconds
+IMPORT_BUDGET_MS = 750.0
+
+# Heavy modules that should only be imported by the code paths needing them
+DEFERRED_MODULES = ('pandas', 'pyarrow', 'databricks.sql', 'duckdb')
+
+# Direct imports listed per page, heaviest first
+TOP_IMPORTS = 5
+
+
+def entry_points():
+    """The main script and every page, relative to the app root"""
+    return ["app.py"] + sorted(str(path.relative_to(APP_ROOT)) for path in (APP_ROOT / "pages").glob("*.py"))
+
+
+def script_imports(path):
+    """Source of the top-level import statements of a script, in order"""
+    source = (APP_ROOT / path).read_text()
+    return "\n".join(ast.get_source_segment(source, node) for node in ast.parse(source).body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def measure(code):
+    """Import code in a fresh interpreter; returns [(name, depth, self_us, cumulative_us)]"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(APP_ROOT), os.getenv("PYTHONPATH")])))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_ROOT, env=env,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def report(path, repeat, startup):
+    """Fastest of `repeat` cold imports of a page's modules, leaving out interpreter startup"""
+    code = script_imports(path)
+    runs = [[module for module in measure(code) if module[0] not in startup] for _ in range(repeat)]
+    modules = min(runs, key=lambda run: sum(cumulative for _, depth, _, cumulative in run if depth == 0))
+    direct = sorted(((name, cumulative / 1000) for name, depth, _, cumulative in modules if depth == 0),
+                    key=lambda item: item[1], reverse=True)
+    loaded = {name for name, *_ in modules}
+    return {
+        'total_ms': sum(ms for _, ms in direct),
+        'top': direct[:TOP_IMPORTS],
+        'eager': [module for module in DEFERRED_MODULES if module in loaded],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="import time allowed per page")
+    parser.add_argument("--repeat", type=int, default=3, help="cold imports per page; the fastest is reported")
+    parser.add_argument("--fail-over-budget", action="store_true", help="exit with status 1 when a page is over")
+    args = parser.parse_args(argv)
+
+    # Modules every interpreter imports before running any code (site, encodings, ...)
+    startup = {name for name, *_ in measure("pass")}
+    over = []
+    print(f"{'page':<28} {'import ms':>10}  status      heaviest imports")
+    for path in entry_points():
+        result = report(path, args.repeat, startup)
+        status = "OK" if result['total_ms'] <= args.budget_ms else "OVER"
+        if status == "OVER":
+            over.append(path)
+        top = ", ".join(f"{name} {ms:.0f}" for name, ms in result['top'])
+        print(f"{path:<28} {result['total_ms']:>10.0f}  {status:<10}  {top}")
+        if result['eager']:
+            print(f"{'':<28} {'':>10}  eager: {', '.join(result['eager'])}")
+
+    print(f"\nBudget {args.budget_ms:.0f} ms per page: {len(over)} over" + "".join(f"\n  {path}" for path in over))
+    return 1 if over and args.fail_over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Bulk-load synthetic CRM data into a warehouse
+Generates production-like data with utils.synthetic_data and writes it in chunks to
+the configured Databricks workspace, or to the local stand-in when LOCAL_SQL_DATABASE
+is set (use a file path so the data outlives the process).
+
+    LOCAL_SQL_DATABASE=./local_warehouse.duckdb python -m benchmarks.load_data --accounts 100000
+    python -m benchmarks.load_data --accounts 1000000 --target edip_crm --batch-size 500
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from utils import database_manager, data_manager_databricks
+from utils.connection_pool import get_connection_pool
+from utils.synthetic_data import DEFAULT_CHUNK_SIZE, CrmDataGenerator, load_edip_crm, load_warehouse
+
+TARGETS = {
+    # target: (create tables, loader)
+    'warehouse': (database_manager.create_database_schema, load_warehouse),
+    'edip_crm': (data_manager_databricks.create_database_schema, load_edip_crm),
+}
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--accounts", type=int, required=True, help="number of accounts to generate")
+    parser.add_argument("--target", choices=sorted(TARGETS), default='warehouse',
+                        help="database_manager tables (warehouse) or data_manager_databricks tables (edip_crm)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed; the same seed gives the same data")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="accounts generated per chunk")
+    parser.add_argument("--batch-size", type=int, help="rows per INSERT (default DATABRICKS_BULK_BATCH_SIZE)")
+    args = parser.parse_args(argv)
+
+    # Outside a Streamlit session every st.* call logs a bare-mode warning
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    if get_connection_pool() is None:
+        parser.error("no warehouse configured: set the DATABRICKS_* variables or LOCAL_SQL_DATABASE")
+
+    create_tables, load = TARGETS[args.target]
+    if not create_tables():
+        return 1
+
+    started = time.perf_counter()
+
+    def progress(loaded):
+        elapsed = time.perf_counter() - started
+        print(f"{loaded:>12,} / {args.accounts:,} accounts  {loaded / elapsed:,.0f} accounts/s", flush=True)
+
+    generator = CrmDataGenerator(args.accounts, seed=args.seed)
+    loaded = load(generator.chunks(args.chunk_size), batch_size=args.batch_size, progress=progress)
+    print(f"Loaded {loaded:,} accounts in {time.perf_counter() - started:.1f}s")
+    return 0 if loaded == args.accounts else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+"""
+Concurrent-session load test for the Streamlit app
+Drives N simulated browser sessions headlessly through Streamlit's AppTest, each one
+repeatedly running a realistic flow (search accounts, view an account, add an update,
+filter use cases), and reports rerun latency percentiles, errors and process memory as
+the session count rises, ending with an estimate of sessions per instance.
+
+    python -m benchmarks.load_test --sessions 1,5,10,20 --duration 30
+    python -m benchmarks.load_test --sessions 10 --latency-ms 30 --p95-target-ms 2000
+
+Unless LOCAL_SQL_DATABASE is set, the warehouse pages run against an in-memory local
+stand-in seeded with --accounts synthetic accounts; the session store pages share
+--session-accounts synthetic accounts loaded once per process (SYNTHETIC_ACCOUNTS).
+"""
+
+import argparse
+import gc
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+MAIN_SCRIPT = str(APP_ROOT / "app.py")
+ACCOUNTS_PAGE = "app.py"
+UPDATES_PAGE = "pages/4_Updates.py"
+USE_CASES_PAGE = "pages/2_Use_Cases.py"
+
+DEFAULT_SESSIONS = (1, 5, 10, 20)
+SEARCH_TERMS = ('finance', 'team 1', 'sales', 'john', 'ops', 'marketing', 'BSN00001', 'tech')
+FILTER_LABELS = ("Filter by Business Area", "Filter by Status", "Filter by Enablement Tier")
+
+# Seconds an AppTest rerun may take before it counts as an error
+RERUN_TIMEOUT = 60
+
+# Rows per INSERT when seeding the local warehouse
+SEED_BATCH_SIZE = 1000
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def rss_mb():
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def share_runtime():
+    """Let concurrent AppTests share one Streamlit runtime, as sessions of a server do
+
+    Every AppTest.run() installs a fresh mock Runtime as the process-wide singleton and
+    removes it when the script finishes, which pulls it away from scripts still running
+    in other threads, and compiles the page again into a fresh script cache. It also
+    switches AppTest mode on only for the duration of each run, so one session finishing
+    turns it off under the others and their widgets lose the format functions AppTest
+    reads back. From now on the first runtime installed serves every script, compiled
+    pages are shared and AppTest mode stays on.
+    """
+    import contextlib
+
+    from streamlit import config
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = lambda: script_cache
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda options: contextlib.nullcontext()
+    shared = []
+
+    def instance(cls):
+        if not shared:
+            if cls._instance is None:
+                raise RuntimeError("Runtime hasn't been created!")
+            shared.append(cls._instance)
+        return shared[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: bool(shared) or cls._instance is not None)
+
+
+class SimulatedSession:
+    """One browser session: an AppTest with its own session state, driven through flows
+
+    Every AppTest.run() is one rerun and is recorded as (flow, milliseconds, error).
+    """
+
+    def __init__(self, rng, samples):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = rng
+        self.samples = samples
+        self.app = AppTest.from_file(MAIN_SCRIPT, default_timeout=RERUN_TIMEOUT)
+        self.page = None
+
+    def rerun(self, flow, action=None):
+        """Apply a widget interaction, rerun the script and record how it went"""
+        started = time.perf_counter()
+        error = None
+        try:
+            (action() if action else self.app).run()
+            if self.app.exception:
+                error = self.app.exception[0].message
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.samples.append((flow, (time.perf_counter() - started) * 1000, error))
+        return error is None
+
+    def open(self, flow, page):
+        """Navigate to a page unless the session is already on it"""
+        if self.page == page:
+            return True
+        if self.page is None:
+            ok = self.rerun(flow)
+            if page != ACCOUNTS_PAGE:
+                ok = ok and self.rerun(flow, lambda: self.app.switch_page(page))
+        else:
+            ok = self.rerun(flow, lambda: self.app.switch_page(page))
+        self.page = page if ok else None
+        return ok
+
+    def _widget(self, widgets, label):
+        for widget in widgets:
+            if widget.label.startswith(label):
+                return widget
+        return None
+
+    def search(self):
+        if not self.open('search', ACCOUNTS_PAGE):
+            return
+        box = self._widget(self.app.text_input, "Search accounts")
+        if box is not None:
+            self.rerun('search', lambda: box.input(self.rng.choice(SEARCH_TERMS)))
+
+    def view_account(self):
+        if not self.open('view_account', ACCOUNTS_PAGE):
+            return
+        tables = [table for table in self.app.dataframe if (table.key or "").startswith("accounts_table")]
+        if not tables or tables[0].value.empty:
+            return
+        # AppTest cannot click a grid row: set the selection the browser would send with
+        # each rerun, then press the View button the selection brings up
+        table_key = tables[0].key
+        selection = {"selection": {"rows": [self.rng.randrange(len(tables[0].value))], "columns": []}}
+
+        def select():
+            self.app.session_state[table_key] = selection
+            return self.app
+
+        if not self.rerun('view_account', select):
+            return
+        button = self._widget(self.app.button, "View ")
+        if button is not None:
+            # View switches to the Account Details page
+            self.page = None
+            if self.rerun('view_account', lambda: (select(), button.click())[1]):
+                self.page = "pages/1_Account_Details.py"
+
+    def add_update(self):
+        if not self.open('add_update', UPDATES_PAGE):
+            return
+        author = self._widget(self.app.text_input, "Author")
+        description = self._widget(self.app.text_area, "Description")
+        submit = self._widget(self.app.button, "Add Update")
+        if author is None or description is None or submit is None:
+            return
+        author.input(f"Load Tester {self.rng.randrange(100)}")
+        description.input(f"Load test update {self.rng.randrange(10**6)}")
+        self.rerun('add_update', submit.click)
+
+    def filter_use_cases(self):
+        if not self.open('filter_use_cases', USE_CASES_PAGE):
+            return
+        box = self._widget(self.app.selectbox, self.rng.choice(FILTER_LABELS))
+        if box is not None and box.options:
+            self.rerun('filter_use_cases', lambda: box.select(self.rng.choice(box.options)))
+
+    FLOWS = ('search', 'view_account', 'add_update', 'filter_use_cases')
+
+    def run_flow(self):
+        getattr(self, self.rng.choice(self.FLOWS))()
+
+
+def run_level(sessions, duration, think_time, seed):
+    """Run `sessions` concurrent sessions for `duration` seconds and return their samples
+
+    Sessions are returned too so the caller can measure memory while they are alive.
+    """
+    samples = []
+    started = [None] * sessions
+    barrier = threading.Barrier(sessions)
+
+    def drive(index):
+        rng = random.Random(f"{seed}:{sessions}:{index}")
+        session = started[index] = SimulatedSession(rng, samples)
+        barrier.wait()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            session.run_flow()
+            if think_time:
+                time.sleep(rng.uniform(0, 2 * think_time))
+
+    threads = [threading.Thread(target=drive, args=(i,), daemon=True) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, started
+
+
+def summarize(sessions, samples, elapsed, rss, baseline_rss):
+    latencies = sorted(ms for _, ms, _ in samples)
+    errors = [error for _, _, error in samples if error]
+    return {
+        'sessions': sessions,
+        'reruns': len(samples),
+        'reruns_per_sec': len(samples) / elapsed if elapsed else 0.0,
+        'p50_ms': _percentile(latencies, 0.50) if latencies else 0.0,
+        'p95_ms': _percentile(latencies, 0.95) if latencies else 0.0,
+        'p99_ms': _percentile(latencies, 0.99) if latencies else 0.0,
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'rss_mb': rss,
+        'mb_per_session': (rss - baseline_rss) / sessions,
+        'flows': {
+            flow: _percentile(sorted(ms for name, ms, _ in samples if name == flow), 0.95)
+            for flow in SimulatedSession.FLOWS if any(name == flow for name, _, _ in samples)
+        },
+    }
+
+
+def seed_warehouse(accounts):
+    """Create and fill the database_manager tables in the configured warehouse"""
+    from utils import database_manager
+    from utils.synthetic_data import CrmDataGenerator, load_warehouse
+
+    if not database_manager.create_database_schema():
+        return False
+    if not database_manager.get_all_accounts():
+        load_warehouse(CrmDataGenerator(accounts).chunks(), batch_size=SEED_BATCH_SIZE)
+    return True
+
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", default=",".join(str(s) for s in DEFAULT_SESSIONS),
+                        help="comma-separated concurrent session counts to ramp through")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run each session count")
+    parser.add_argument("--think-time", type=float, default=0.5,
+                        help="mean pause between flows of a session, in seconds")
+    parser.add_argument("--accounts", type=int, default=2000, help="accounts seeded into the local warehouse")
+    parser.add_argument("--session-accounts", type=int, default=500,
+                        help="synthetic accounts loaded into the shared session store")
+    parser.add_argument("--latency-ms", type=float, help="simulated latency of every local warehouse round trip")
+    parser.add_argument("--p95-target-ms", type=float, default=1000.0,
+                        help="rerun p95 a session count must stay under to count as sustainable")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the flows")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("LOCAL_SQL_DATABASE", ":memory:")
+    os.environ.setdefault("SYNTHETIC_ACCOUNTS", str(args.session_accounts))
+    if args.latency_ms is not None:
+        os.environ["LOCAL_SQL_LATENCY_MS"] = str(args.latency_ms)
+    # Pages import utils.* relative to the app root
+    sys.path.insert(0, str(APP_ROOT))
+
+    # Outside a Streamlit session every st.* call logs a bare-mode warning, and parsing the
+    # config (on the first run) reapplies logger.level
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    if not seed_warehouse(args.accounts):
+        parser.error("could not create the warehouse tables")
+    share_runtime()
+
+    gc.collect()
+    baseline_rss = rss_mb()
+    print(f"Baseline RSS {baseline_rss:.0f} MB, {args.duration:.0f}s per level, "
+          f"think time {args.think_time}s\n")
+    print(f"{'sessions':>8} {'reruns':>7} {'reruns/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'errors':>7} {'RSS MB':>8} {'MB/sess':>8}")
+
+    results = []
+    for sessions in (int(level) for level in args.sessions.split(",")):
+        started = time.perf_counter()
+        samples, alive = run_level(sessions, args.duration, args.think_time, args.seed)
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        result = summarize(sessions, samples, elapsed, rss_mb(), baseline_rss)
+        results.append(result)
+        del alive
+        print(f"{sessions:>8} {result['reruns']:>7} {result['reruns_per_sec']:>9.1f} "
+              f"{result['p50_ms']:>9.0f} {result['p95_ms']:>9.0f} {result['p99_ms']:>9.0f} "
+              f"{result['errors']:>7} {result['rss_mb']:>8.0f} {result['mb_per_session']:>8.1f}", flush=True)
+        if result['first_error']:
+            print(f"{'':>8} first error: {result['first_error'][:200]}")
+        print(f"{'':>8} p95 by flow: " + ", ".join(f"{flow} {ms:.0f} ms" for flow, ms in result['flows'].items()))
+
+    sustainable = [result for result in results
+                   if result['p95_ms'] <= args.p95_target_ms and result['errors'] == 0]
+    if sustainable:
+        best = max(sustainable, key=lambda result: result['sessions'])
+        print(f"\nSessions per instance: {best['sessions']} "
+              f"(highest tested count with p95 <= {args.p95_target_ms:.0f} ms and no errors, "
+              f"~{best['mb_per_session']:.1f} MB per session)")
+    else:
+        print(f"\nNo tested session count kept p95 under {args.p95_target_ms:.0f} ms without errors")
+    return 0 if sustainable else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Data-access benchmark suite
+Seeds a local DuckDB stand-in for the Databricks warehouse (utils.local_sql) at each
+requested scale, times every public function of utils.database_manager and
+utils.data_manager_databricks against it and compares the results with the stored
+baselines in benchmarks/baselines.json.
+
+    python -m benchmarks.run --scales 1000,10000
+    python -m benchmarks.run --scales 1000 --save-baseline
+    python -m benchmarks.run --scales 10000 --latency-ms 30 --only bundle,page
+
+Reads run with an empty query cache, so they measure the query and not a cache hit.
+--latency-ms simulates the network round trip to a remote warehouse, which exposes code
+paths that issue many small statements.
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Table names must be fixed before database_manager reads them at import
+os.environ.setdefault("DATABRICKS_CATALOG", "benchmark_catalog")
+os.environ.setdefault("DATABRICKS_SCHEMA", "benchmark_schema")
+os.environ.setdefault("DATABRICKS_TABLE_PREFIX", "edip_crm")
+
+import streamlit as st
+
+from benchmarks.seed import (
+    PEOPLE, PLATFORMS, STATUSES, seed_crm_tables, seed_databricks_tables
+)
+import utils.connection_pool as connection_pool
+from utils.connection_pool import ConnectionPool
+from utils.id_allocator import IdAllocator
+from utils.instrumentation import instrumentation
+from utils.local_sql import LocalWarehouse
+from utils.query_cache import query_cache
+from utils.query_filters import ListingFilter
+from utils.synthetic_data import CrmDataGenerator, load_edip_crm, load_warehouse
+from utils import database_manager, data_manager_databricks
+
+DEFAULT_SCALES = (1_000, 10_000, 100_000, 1_000_000)
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# Per-function sampling: stop after MAX_ITERATIONS calls or TIME_BUDGET seconds, whichever comes
+# first, but always take at least MIN_ITERATIONS samples
+MIN_ITERATIONS = 3
+MAX_ITERATIONS = 50
+TIME_BUDGET = 5.0
+
+# A function regresses when its p50 exceeds the baseline by this fraction and by NOISE_FLOOR_MS
+REGRESSION_TOLERANCE = 0.5
+NOISE_FLOOR_MS = 1.0
+
+# Rows written per call by the bulk insert benchmarks
+BULK_ROWS = 100
+
+# Rows per INSERT when loading synthetic data into the local warehouse
+SYNTHETIC_LOAD_BATCH_SIZE = 1000
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class Workload:
+    """Random but reproducible arguments for the benchmarked functions"""
+
+    def __init__(self, accounts, seed=0):
+        self.accounts = accounts
+        self.random = random.Random(seed)
+        self._sequence = 0
+
+    def bsnid(self):
+        return f"BSN{self.random.randint(1, self.accounts):07d}"
+
+    def new_bsnid(self):
+        self._sequence += 1
+        return f"BNEW{self._sequence:07d}"
+
+    def person(self):
+        return self.random.choice(PEOPLE)
+
+    def platform(self):
+        return self.random.choice(PLATFORMS)
+
+    def search_term(self):
+        return self.random.choice(["Team 1", "finance", self.person().split()[0], "team 42"])
+
+    def accounts_batch(self):
+        return [{
+            'bsnid': self.new_bsnid(), 'team': f"Benchmark team {self._sequence}", 'business_area': 'Finance',
+            'vp': self.person(), 'admin': self.person(), 'primary_it_partner': self.person()
+        } for _ in range(BULK_ROWS)]
+
+    def use_cases_batch(self):
+        return [{
+            'account_bsnid': self.bsnid(), 'platform': self.platform(), 'problem': "Benchmark problem",
+            'solution': "Benchmark solution", 'author': self.person()
+        } for _ in range(BULK_ROWS)]
+
+    def updates_batch(self):
+        return [{
+            'account_bsnid': self.bsnid(), 'author': self.person(), 'platform': self.platform(),
+            'description': "Benchmark update", 'update_date': date.today()
+        } for _ in range(BULK_ROWS)]
+
+    def statuses_batch(self):
+        return [{
+            'account_bsnid': self.bsnid(), 'platform': self.platform(),
+            'status': self.random.choice(STATUSES), 'enablement_tier': 'Tier 1'
+        } for _ in range(BULK_ROWS)]
+
+
+def _cases(workload):
+    """(module, function name, argument factory) for every benchmarked function"""
+    w = workload
+    dm, dmd = database_manager, data_manager_databricks
+    no_args = lambda: ((), {})
+    bsnid_arg = lambda: ((w.bsnid(),), {})
+
+    def uninitialized_session():
+        # initialize_data only does work once per session
+        st.session_state.pop('databricks_initialized', None)
+        return (), {}
+
+    return [
+        (dm, 'get_databricks_connection', no_args),
+        (dm, 'create_database_schema', no_args),
+        (dm, 'get_sample_accounts', no_args),
+        (dm, 'get_sample_account_detail', lambda: (("BSN001",), {})),
+        (dm, 'get_account_by_bsnid', bsnid_arg),
+        (dm, 'get_account_use_cases', bsnid_arg),
+        (dm, 'get_account_updates', bsnid_arg),
+        (dm, 'get_platform_status', bsnid_arg),
+        (dm, 'get_account_bundle', bsnid_arg),
+        (dm, 'get_account_samples', no_args),
+        (dm, 'get_account_by_bsnid_arrow', bsnid_arg),
+        (dm, 'get_account_use_cases_arrow', bsnid_arg),
+        (dm, 'get_account_updates_arrow', bsnid_arg),
+        (dm, 'get_platform_status_arrow', bsnid_arg),
+        (dm, 'get_all_accounts', no_args),
+        (dm, 'get_all_use_cases', no_args),
+        (dm, 'get_all_updates', no_args),
+        (dm, 'get_all_accounts_arrow', no_args),
+        (dm, 'get_all_use_cases_arrow', no_args),
+        (dm, 'get_all_updates_arrow', no_args),
+        (dm, 'search_accounts', lambda: ((w.search_term(),), {'limit': 50})),
+        (dm, 'get_accounts_page', no_args),
+        (dm, 'get_use_cases_page', lambda: ((), {'filters': ListingFilter.from_selections(platform=w.platform())})),
+        (dm, 'get_updates_page', lambda: ((), {'filters': ListingFilter.from_selections(author=w.person())})),
+        (dm, 'get_filter_options', lambda: (('use_cases', 'author'), {})),
+        (dm, 'get_system_stats', no_args),
+        (dm, 'get_it_partner_assignments', no_args),
+        (dm, 'get_crm_tables', no_args),
+        (dm, 'add_use_case', lambda: ((w.bsnid(), w.platform(), "Benchmark problem", "Benchmark solution",
+                                       w.person()), {})),
+        (dm, 'add_update', lambda: ((w.bsnid(), w.person(), w.platform(), "Benchmark update",
+                                     date.today().isoformat()), {})),
+        (dm, 'add_accounts_bulk', lambda: ((w.accounts_batch(),), {})),
+        (dm, 'add_use_cases_bulk', lambda: ((w.use_cases_batch(),), {})),
+        (dm, 'add_updates_bulk', lambda: ((w.updates_batch(),), {})),
+        (dm, 'add_platform_statuses_bulk', lambda: ((w.statuses_batch(),), {})),
+        (dmd, 'get_databricks_connection', no_args),
+        (dmd, 'initialize_data', uninitialized_session),
+        (dmd, 'create_database_schema', no_args),
+        (dmd, 'search_accounts', lambda: ((w.search_term(),), {})),
+        (dmd, 'add_account', lambda: (("Benchmark team", "Finance", w.person(), w.person(), w.person()),
+                                      {'platforms_status': {p: 'Requested' for p in PLATFORMS}})),
+        (dmd, 'get_account_use_cases', bsnid_arg),
+        (dmd, 'add_use_case', lambda: ((w.bsnid(), "Benchmark problem", "Benchmark solution", w.person(),
+                                        'In Progress', 'Tier 1', w.platform()), {})),
+        (dmd, 'get_account_updates', bsnid_arg),
+    ]
+
+
+def _public_functions(module):
+    """Names of the public functions defined in a module"""
+    return {
+        name for name, member in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith('_') and getattr(member, '__module__', None) == module.__name__
+    }
+
+
+def check_coverage(cases):
+    """Names of public data-access functions without a benchmark case"""
+    covered = {(module.__name__, name) for module, name, _ in cases}
+    return sorted(
+        f"{module.__name__}.{name}"
+        for module in (database_manager, data_manager_databricks)
+        for name in _public_functions(module)
+        if (module.__name__, name) not in covered
+    )
+
+
+def seed(accounts, latency_ms=0.0, jitter_ms=0.0, synthetic=False):
+    """Point the connection pool at a fresh local warehouse seeded with `accounts` accounts
+
+    Every round trip to it is delayed by latency_ms plus up to jitter_ms. With synthetic,
+    the data comes from utils.synthetic_data (skewed, slower to load) instead of the
+    uniform set-based seed.
+    """
+    warehouse = LocalWarehouse()
+    if connection_pool._pool is not None:
+        connection_pool._pool.close()
+    connection_pool._pool = ConnectionPool(
+        lambda: warehouse.connect(latency_ms, jitter_ms), min_size=1, max_size=4
+    )
+    # BSNID blocks reserved from a previous scale's warehouse are meaningless in this one
+    data_manager_databricks._bsnid_allocator = IdAllocator(
+        connection_pool.get_connection_pool, data_manager_databricks.SEQUENCES_TABLE, "bsnid",
+        seed_query=data_manager_databricks._bsnid_allocator.seed_query
+    )
+
+    started = time.perf_counter()
+    database_manager.create_database_schema()
+    data_manager_databricks.create_database_schema()
+    if synthetic:
+        generator = CrmDataGenerator(accounts)
+        load_warehouse(generator.chunks(), batch_size=SYNTHETIC_LOAD_BATCH_SIZE)
+        load_edip_crm(generator.chunks(), batch_size=SYNTHETIC_LOAD_BATCH_SIZE)
+        return warehouse, time.perf_counter() - started
+
+    with connection_pool._pool.cursor() as cursor:
+        seed_crm_tables(cursor, database_manager.CATALOG_NAME, database_manager.SCHEMA_NAME,
+                        database_manager.TABLE_PREFIX, accounts)
+        seed_databricks_tables(cursor, accounts)
+    return warehouse, time.perf_counter() - started
+
+
+def measure(func, make_args):
+    """Time calls of func with fresh arguments and an empty query cache"""
+    samples = []
+    deadline = time.perf_counter() + TIME_BUDGET
+    while len(samples) < MAX_ITERATIONS and (len(samples) < MIN_ITERATIONS or time.perf_counter() < deadline):
+        args, kwargs = make_args()
+        query_cache.clear()
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    total_ms = sum(samples)
+    return {
+        'iterations': len(samples),
+        'ops_per_sec': len(samples) / (total_ms / 1000) if total_ms else 0.0,
+        'p50_ms': _percentile(samples, 0.50),
+        'p95_ms': _percentile(samples, 0.95),
+        'p99_ms': _percentile(samples, 0.99),
+        'max_ms': samples[-1]
+    }
+
+
+def compare(result, baseline):
+    """Annotate a result with its change against a baseline entry"""
+    if not baseline:
+        return {'baseline_p50_ms': None, 'change': None, 'status': 'new'}
+    change = (result['p50_ms'] - baseline['p50_ms']) / baseline['p50_ms'] if baseline['p50_ms'] else 0.0
+    slower_ms = result['p50_ms'] - baseline['p50_ms']
+    if change > REGRESSION_TOLERANCE and slower_ms > NOISE_FLOOR_MS:
+        status = 'REGRESSION'
+    elif change < -REGRESSION_TOLERANCE and -slower_ms > NOISE_FLOOR_MS:
+        status = 'faster'
+    else:
+        status = 'ok'
+    return {'baseline_p50_ms': baseline['p50_ms'], 'change': change, 'status': status}
+
+
+def run_scale(accounts, baselines, only=None, latency_ms=0.0, jitter_ms=0.0, synthetic=False):
+    """Seed one scale and benchmark every case; returns {function: result}"""
+    warehouse, seed_seconds = seed(accounts, latency_ms, jitter_ms, synthetic)
+    print(f"\n== {accounts:,} accounts (seeded in {seed_seconds:.1f}s) ==")
+    print(f"{'function':<58}{'iter':>6}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'base p50':>10}{'change':>9}{'errors':>8}  status")
+
+    results = {}
+    for module, name, make_args in _cases(Workload(accounts)):
+        key = f"{module.__name__.rsplit('.', 1)[-1]}.{name}"
+        if only and not any(pattern in key for pattern in only):
+            continue
+        instrumentation.reset()
+        result = measure(getattr(module, name), make_args)
+        # Functions report failures through instrumentation rather than by raising
+        result['errors'] = sum(stats['errors'] for stats in instrumentation.stats() if stats['function'] == key)
+        result.update(compare(result, baselines.get(key)))
+        results[key] = result
+        change = f"{result['change']:+.0%}" if result['change'] is not None else "-"
+        base = f"{result['baseline_p50_ms']:.2f}" if result['baseline_p50_ms'] is not None else "-"
+        print(f"{key:<58}{result['iterations']:>6}{result['ops_per_sec']:>10.1f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{base:>10}{change:>9}{result['errors']:>8}  {result['status']}")
+
+    connection_pool._pool.close()
+    connection_pool._pool = None
+    warehouse.close()
+    return results
+
+
+def load_baselines(path=BASELINES_PATH):
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results, path=BASELINES_PATH):
+    """Merge the p50/p95/p99 and throughput of each scale into the stored baselines"""
+    baselines = load_baselines(path)
+    scales = baselines.setdefault('scales', {})
+    for accounts, functions in results.items():
+        scales[str(accounts)] = {
+            key: {metric: round(result[metric], 3) for metric in ('ops_per_sec', 'p50_ms', 'p95_ms', 'p99_ms')}
+            for key, result in functions.items()
+        }
+    baselines['recorded'] = {
+        'at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine()
+    }
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="comma-separated account counts to seed")
+    parser.add_argument("--only", default="", help="comma-separated substrings selecting functions")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated network latency added to every warehouse round trip")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency, up to this much")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="seed realistic skewed data from utils.synthetic_data instead of uniform rows")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baselines")
+    parser.add_argument("--output", help="also write the full results as JSON to this file")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    args = parser.parse_args(argv)
+    # Baselines are measured on uniform data without latency and only compare with such runs
+    comparable = not (args.latency_ms > 0 or args.jitter_ms > 0 or args.synthetic)
+    if args.save_baseline and not comparable:
+        parser.error("baselines are recorded on uniform data without simulated latency")
+
+    # Outside a Streamlit session every st.* call logs a bare-mode warning
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    missing = check_coverage(_cases(Workload(1)))
+    if missing:
+        parser.error(f"public functions without a benchmark case: {', '.join(missing)}")
+
+    stored = load_baselines().get('scales', {}) if comparable else {}
+    only = [pattern for pattern in args.only.split(",") if pattern]
+    results = {}
+    for accounts in (int(scale) for scale in args.scales.split(",")):
+        results[accounts] = run_scale(accounts, stored.get(str(accounts), {}), only,
+                                      args.latency_ms, args.jitter_ms, args.synthetic)
+
+    regressions = [f"{accounts:,} accounts: {key}" for accounts, functions in results.items()
+                   for key, result in functions.items() if result['status'] == 'REGRESSION']
+    print(f"\n{len(regressions)} regression(s)" + "".join(f"\n  {line}" for line in regressions))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({str(accounts): functions for accounts, functions in results.items()}, f, indent=2)
+    if args.save_baseline:
+        save_baselines(results)
+        print(f"Baselines saved to {BASELINES_PATH}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
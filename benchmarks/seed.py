@@ -0,0 +1,87 @@
+"""
+Seed a local warehouse with CRM tables at a given scale
+Fills the database_manager tables ({catalog}.{schema}.{prefix}_*) and the
+data_manager_databricks tables (edip_crm.main.*), once created by their
+create_database_schema(), with uniform generated rows in set-based INSERT ... SELECT
+statements, so a million accounts seed in seconds
+"""
+
+# Rows generated per account
+USE_CASES_PER_ACCOUNT = 2
+UPDATES_PER_ACCOUNT = 3
+PLATFORMS = ('Databricks', 'Snowflake', 'Power Platform')
+STATUSES = ('Completed', 'In Progress', 'Requested', 'None')
+BUSINESS_AREAS = ('Finance', 'Marketing', 'Operations', 'HR', 'Sales', 'Technology', 'Legal', 'Supply Chain')
+PEOPLE = ('John Smith', 'Sarah Johnson', 'Mike Davis', 'Lisa Wang', 'Robert Kim', 'Jennifer Walsh',
+          'David Rodriguez', 'Mark Thompson', 'Sarah Chen', 'Lisa Brown')
+
+
+def _pick(values, expression):
+    """SQL expression choosing one of values by an integer expression"""
+    items = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+    return f"[{items}][({expression}) % {len(values)} + 1]"
+
+
+def seed_crm_tables(cursor, catalog, schema, prefix, accounts):
+    """Fill the database_manager tables with `accounts` accounts and their related rows"""
+    table = f"{catalog}.{schema}.{prefix}"
+    bsnid = "'BSN' || lpad(CAST(i AS VARCHAR), 7, '0')"
+    cursor.execute(f"""
+        INSERT INTO {table}_accounts
+        SELECT {bsnid}, 'Team ' || i, {_pick(BUSINESS_AREAS, 'i * 7')}, {_pick(PEOPLE, 'i')},
+               {_pick(PEOPLE, 'i * 3')}, {_pick(PEOPLE, 'i * 5')},
+               'https://dev.azure.com/org/team' || i, '', now() - to_days(CAST(i % 900 AS INTEGER)), now()
+        FROM range(1, {accounts + 1}) t(i)
+    """)
+    cursor.execute(f"""
+        INSERT INTO {table}_platforms_status
+        SELECT uuid()::VARCHAR, {bsnid}, {_pick(PLATFORMS, 'p')}, {_pick(STATUSES, 'i + p')},
+               'Tier ' || ((i + p) % 3 + 1), now(), now()
+        FROM range(1, {accounts + 1}) t(i), range(0, {len(PLATFORMS)}) s(p)
+    """)
+    cursor.execute(f"""
+        INSERT INTO {table}_use_cases
+        SELECT uuid()::VARCHAR, {bsnid}, {_pick(PLATFORMS, 'i + n')},
+               'Problem ' || n || ' of team ' || i || ': manual reporting takes days to reconcile',
+               'Automate the pipeline for team ' || i || ' on a shared warehouse',
+               {_pick(PEOPLE, 'i + n')}, now() - to_minutes(CAST(i * 7 + n AS BIGINT)), now()
+        FROM range(1, {accounts + 1}) t(i), range(0, {USE_CASES_PER_ACCOUNT}) s(n)
+    """)
+    cursor.execute(f"""
+        INSERT INTO {table}_updates
+        SELECT uuid()::VARCHAR, {bsnid}, {_pick(PEOPLE, 'i * 2 + n')}, {_pick(PLATFORMS, 'i + n')},
+               'Weekly sync ' || n || ' with team ' || i || ': migration on track',
+               CAST(current_date - CAST((i + n * 11) % 365 AS INTEGER) AS DATE),
+               now() - to_minutes(CAST(i * 5 + n AS BIGINT))
+        FROM range(1, {accounts + 1}) t(i), range(0, {UPDATES_PER_ACCOUNT}) s(n)
+    """)
+
+
+def seed_databricks_tables(cursor, accounts):
+    """Fill the edip_crm.main tables created by data_manager_databricks.create_database_schema"""
+    bsnid = "'BSN' || lpad(CAST(i AS VARCHAR), 7, '0')"
+    cursor.execute(f"""
+        INSERT INTO edip_crm.main.accounts
+        SELECT {bsnid}, 'Team ' || i, {_pick(BUSINESS_AREAS, 'i * 7')}, {_pick(PEOPLE, 'i')},
+               {_pick(PEOPLE, 'i * 3')}, {_pick(PEOPLE, 'i * 5')}, '', '', now(), now()
+        FROM range(1, {accounts + 1}) t(i)
+    """)
+    cursor.execute(f"""
+        INSERT INTO edip_crm.main.platforms_status
+        SELECT uuid()::VARCHAR, {bsnid}, {_pick(PLATFORMS, 'p')}, {_pick(STATUSES, 'i + p')}, now(), now()
+        FROM range(1, {accounts + 1}) t(i), range(0, {len(PLATFORMS)}) s(p)
+    """)
+    cursor.execute(f"""
+        INSERT INTO edip_crm.main.use_cases
+        SELECT uuid()::VARCHAR, {bsnid}, 'Problem ' || n || ' of team ' || i, 'Automate the pipeline',
+               {_pick(PEOPLE, 'i + n')}, {_pick(STATUSES, 'i + n')}, 'Tier ' || ((i + n) % 3 + 1),
+               {_pick(PLATFORMS, 'i + n')}, now() - to_minutes(CAST(i * 7 + n AS BIGINT)), now()
+        FROM range(1, {accounts + 1}) t(i), range(0, {USE_CASES_PER_ACCOUNT}) s(n)
+    """)
+    cursor.execute(f"""
+        INSERT INTO edip_crm.main.updates
+        SELECT uuid()::VARCHAR, {bsnid}, {_pick(PEOPLE, 'i * 2 + n')},
+               CAST(current_date - CAST((i + n * 11) % 365 AS INTEGER) AS DATE), {_pick(PLATFORMS, 'i + n')},
+               'Weekly sync ' || n || ' with team ' || i, now() - to_minutes(CAST(i * 5 + n AS BIGINT)), now()
+        FROM range(1, {accounts + 1}) t(i), range(0, {UPDATES_PER_ACCOUNT}) s(n)
+    """)
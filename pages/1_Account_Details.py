@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
 from utils.database_manager import (
-    get_account_by_bsnid, get_account_use_cases, get_account_updates, get_platform_status
+    get_account_bundle, get_account_samples, get_databricks_connection
 )
+from utils.page_profiler import start_page_profile, finish_page_profile
 
 # Page configuration
 st.set_page_config(
@@ -11,6 +11,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Opt-in rerun profiling (PAGE_PROFILER=1 or ?profile=1)
+page_profile = start_page_profile("Account Details")
+
 st.title("Account Details")
 
 # Show persistent success message if exists
@@ -26,7 +29,6 @@ if 'selected_account' not in st.session_state:
     st.stop()
 
 # Test database connection first
-from utils.database_manager import get_databricks_connection
 conn = get_databricks_connection()
 if not conn:
     st.error("Database connection failed. Please check your .env file configuration:")
@@ -39,35 +41,26 @@ DATABRICKS_TOKEN=your-access-token
         st.switch_page("app.py") 
     st.stop()
 
-# Get the selected account from database
+# Get the selected account, its platform status, use cases and updates in one round trip
 bsnid = st.session_state.selected_account
-st.write(f"Looking for account: {bsnid}")
+bundle = get_account_bundle(bsnid)
 
-# Show what accounts are available in database
-conn = get_databricks_connection()
-if conn:
-    try:
-        with conn.cursor() as cursor:
-            from utils.database_manager import CATALOG_NAME, SCHEMA_NAME, TABLE_PREFIX
-            cursor.execute(f"""
-                SELECT bsnid, team FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
-                LIMIT 10
-            """)
-            available_accounts = cursor.fetchall()
-            st.write("Available accounts in database:")
-            for acc in available_accounts:
-                st.write(f"- BSNID: {acc[0]}, Team: {acc[1]}")
-    except Exception as e:
-        st.error(f"Error checking available accounts: {e}")
-
-account = get_account_by_bsnid(bsnid)
-if not account:
+# Connection diagnostics are opt-in so a normal page view costs a single query
+if st.sidebar.checkbox("Show connection diagnostics"):
+    st.sidebar.write(f"Looking for account: {bsnid}")
+    st.sidebar.write("Available accounts in database:")
+    for acc in get_account_samples(limit=10):
+        st.sidebar.write(f"- BSNID: {acc[0]}, Team: {acc[1]}")
+
+if not bundle:
     st.error(f"Account with BSNID '{bsnid}' not found in database.")
     st.info("The account either doesn't exist or the database credentials are not properly configured.")
     if st.button("← Back to All Accounts"):
         st.switch_page("app.py")
     st.stop()
 
+account = bundle.account
+
 # Back button
 if st.button("← Back to All Accounts"):
     # Clear any editing states
@@ -118,7 +111,7 @@ st.markdown("---")
 # Platforms and Onboarding Status
 st.subheader("Platforms & Onboarding Status")
 
-platforms_status = get_platform_status(account['bsnid'])
+platforms_status = bundle.platform_status
 
 if platforms_status:
     # Display platform status
@@ -142,7 +135,7 @@ st.markdown("---")
 # Use Cases
 st.subheader("Use Cases")
 
-use_cases = get_account_use_cases(account['bsnid'])
+use_cases = bundle.use_cases
 
 if use_cases:
     # Display use cases in a table format
@@ -156,8 +149,7 @@ if use_cases:
             'Created': uc['created_at'].strftime('%Y-%m-%d') if uc['created_at'] else 'Unknown'
         })
     
-    df = pd.DataFrame(use_cases_data)
-    st.dataframe(df, use_container_width=True)
+    st.dataframe(use_cases_data, use_container_width=True)
     
     # Display detailed use cases
     st.write("**Detailed Use Cases:**")
@@ -183,7 +175,7 @@ st.markdown("---")
 # Updates
 st.subheader("Recent Updates")
 
-updates = get_account_updates(account['bsnid'])
+updates = bundle.updates
 
 if updates:
     # Display updates in chronological order
@@ -218,4 +210,6 @@ with col2:
 
 with col3:
     if st.button("Admin Panel", use_container_width=True):
-        st.switch_page("pages/3_Admin.py")
\ No newline at end of file
+        st.switch_page("pages/3_Admin.py")
+
+finish_page_profile(page_profile)
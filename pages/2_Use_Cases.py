@@ -1,9 +1,12 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-from utils.database_manager import (
-    get_all_accounts, add_use_case, get_all_use_cases
+from utils.data_manager import (
+    initialize_data, add_use_case, update_use_case, add_update, get_use_cases_page, get_updates_page,
+    get_filter_options, search_use_cases
 )
+from utils.query_filters import ListingFilter
+from utils.pagination import DEFAULT_PAGE_SIZE, PAGE_SIZE_OPTIONS, load_page, page_controls
+from utils.page_profiler import start_page_profile, finish_page_profile
 
 # Page configuration
 st.set_page_config(
@@ -12,6 +15,12 @@ st.set_page_config(
     layout="wide"
 )
 
+# Opt-in rerun profiling (PAGE_PROFILER=1 or ?profile=1)
+page_profile = start_page_profile("Use Cases")
+
+# Initialize data
+initialize_data()
+
 st.title("Use Cases Management")
 
 # Show persistent success message if exists
@@ -25,230 +34,274 @@ if st.button("← Back to All Accounts"):
 
 st.markdown("---")
 
-# Check if editing a specific use case
-edit_mode = False
-use_case_to_edit = None
-if 'edit_use_case_id' in st.session_state and st.session_state.edit_use_case_id in st.session_state.use_cases:
-    edit_mode = True
-    use_case_to_edit = st.session_state.use_cases[st.session_state.edit_use_case_id]
-    st.info(f"Editing use case: {use_case_to_edit['problem'][:50]}...")
+# Each interactive region below is a fragment with its own data dependencies: a widget
+# inside one reruns only that region, and a change that invalidates the others reruns the page
+@st.fragment
+def use_case_form():
+    """Add or edit a use case; a successful save reruns the page so the listing and stats refresh"""
+    # Check if editing a specific use case
+    edit_mode = False
+    use_case_to_edit = None
+    if 'edit_use_case_id' in st.session_state and st.session_state.edit_use_case_id in st.session_state.use_cases:
+        edit_mode = True
+        use_case_to_edit = st.session_state.use_cases[st.session_state.edit_use_case_id]
+        st.info(f"Editing use case: {use_case_to_edit['problem'][:50]}...")
 
-# Add/Edit Use Case Form
-st.subheader("Add New Use Case" if not edit_mode else "Edit Use Case")
+    # Add/Edit Use Case Form
+    st.subheader("Add New Use Case" if not edit_mode else "Edit Use Case")
 
-with st.form("use_case_form"):
-    col1, col2 = st.columns(2)
+    with st.form("use_case_form"):
+        col1, col2 = st.columns(2)
     
-    with col1:
-        # Account selection
-        if not edit_mode and 'selected_account_for_use_case' in st.session_state:
-            selected_account = st.session_state.selected_account_for_use_case
-            account_options = {bsnid: f"{acc['team']} ({acc['business_area']})" 
-                            for bsnid, acc in st.session_state.accounts.items()}
-            selected_account_display = account_options.get(selected_account, "Unknown Account")
-            st.write(f"**Account:** {selected_account_display}")
-        else:
-            account_options = {bsnid: f"{acc['team']} ({acc['business_area']})" 
-                            for bsnid, acc in st.session_state.accounts.items()}
-            if account_options:
-                if edit_mode and use_case_to_edit:
-                    # Find the current account for the use case
-                    current_account = use_case_to_edit.get('account_bsnid', '')
-                    current_index = list(account_options.keys()).index(current_account) if current_account in account_options else 0
-                    selected_account = st.selectbox("Select Account", 
-                                                  options=list(account_options.keys()),
-                                                  format_func=lambda x: account_options[x],
-                                                  index=current_index)
-                else:
-                    selected_account = st.selectbox("Select Account", 
-                                                  options=list(account_options.keys()),
-                                                  format_func=lambda x: account_options[x])
+        with col1:
+            # Account selection
+            if not edit_mode and 'selected_account_for_use_case' in st.session_state:
+                selected_account = st.session_state.selected_account_for_use_case
+                account_options = {bsnid: f"{acc['team']} ({acc['business_area']})" 
+                                for bsnid, acc in st.session_state.accounts.items()}
+                selected_account_display = account_options.get(selected_account, "Unknown Account")
+                st.write(f"**Account:** {selected_account_display}")
             else:
-                st.error("No accounts available. Please add accounts first.")
-                st.stop()
+                account_options = {bsnid: f"{acc['team']} ({acc['business_area']})" 
+                                for bsnid, acc in st.session_state.accounts.items()}
+                if account_options:
+                    if edit_mode and use_case_to_edit:
+                        # Find the current account for the use case
+                        current_account = use_case_to_edit.get('account_bsnid', '')
+                        current_index = list(account_options.keys()).index(current_account) if current_account in account_options else 0
+                        selected_account = st.selectbox("Select Account", 
+                                                      options=list(account_options.keys()),
+                                                      format_func=account_options.get,
+                                                      index=current_index)
+                    else:
+                        selected_account = st.selectbox("Select Account", 
+                                                      options=list(account_options.keys()),
+                                                      format_func=account_options.get)
+                else:
+                    st.error("No accounts available. Please add accounts first.")
+                    st.stop()
         
-        # Problem description
-        problem = st.text_area("Problem Description", 
-                             value=use_case_to_edit['problem'] if edit_mode and use_case_to_edit else "",
-                             height=100,
-                             help="Describe the business problem or challenge")
+            # Problem description
+            problem = st.text_area("Problem Description", 
+                                 value=use_case_to_edit['problem'] if edit_mode and use_case_to_edit else "",
+                                 height=100,
+                                 help="Describe the business problem or challenge")
         
-        # Solution description
-        solution = st.text_area("Solution Description", 
-                              value=use_case_to_edit['solution'] if edit_mode and use_case_to_edit else "",
-                              height=100,
-                              help="Describe the proposed or implemented solution")
+            # Solution description
+            solution = st.text_area("Solution Description", 
+                                  value=use_case_to_edit['solution'] if edit_mode and use_case_to_edit else "",
+                                  height=100,
+                                  help="Describe the proposed or implemented solution")
     
-    with col2:
-        # Leader
-        leader = st.text_input("Leader", 
-                             value=use_case_to_edit['leader'] if edit_mode and use_case_to_edit else "",
-                             help="Person responsible for this use case")
+        with col2:
+            # Leader
+            leader = st.text_input("Leader", 
+                                 value=use_case_to_edit['leader'] if edit_mode and use_case_to_edit else "",
+                                 help="Person responsible for this use case")
         
-        # Status
-        status_options = ["Active", "Completed", "On Hold", "Cancelled", "Planning"]
-        current_status_index = 0
-        if edit_mode and use_case_to_edit and use_case_to_edit['status'] in status_options:
-            current_status_index = status_options.index(use_case_to_edit['status'])
+            # Status
+            status_options = ["Active", "Completed", "On Hold", "Cancelled", "Planning"]
+            current_status_index = 0
+            if edit_mode and use_case_to_edit and use_case_to_edit['status'] in status_options:
+                current_status_index = status_options.index(use_case_to_edit['status'])
         
-        status = st.selectbox("Status", 
-                            options=status_options,
-                            index=current_status_index)
+            status = st.selectbox("Status", 
+                                options=status_options,
+                                index=current_status_index)
         
-        # Enablement Tier
-        tier_index = 0
-        if edit_mode and use_case_to_edit and use_case_to_edit['enablement_tier'] in st.session_state.enablement_tiers:
-            tier_index = st.session_state.enablement_tiers.index(use_case_to_edit['enablement_tier'])
+            # Enablement Tier
+            tier_index = 0
+            if edit_mode and use_case_to_edit and use_case_to_edit['enablement_tier'] in st.session_state.enablement_tiers:
+                tier_index = st.session_state.enablement_tiers.index(use_case_to_edit['enablement_tier'])
         
-        enablement_tier = st.selectbox("Enablement Tier", 
-                                     st.session_state.enablement_tiers,
-                                     index=tier_index,
-                                     help="Select the appropriate enablement tier")
+            enablement_tier = st.selectbox("Enablement Tier", 
+                                         st.session_state.enablement_tiers,
+                                         index=tier_index,
+                                         help="Select the appropriate enablement tier")
         
-        # Platform
-        platform_index = 0
-        if edit_mode and use_case_to_edit and 'platform' in use_case_to_edit and use_case_to_edit['platform'] in st.session_state.platforms:
-            platform_index = st.session_state.platforms.index(use_case_to_edit['platform'])
+            # Platform
+            platform_index = 0
+            if edit_mode and use_case_to_edit and 'platform' in use_case_to_edit and use_case_to_edit['platform'] in st.session_state.platforms:
+                platform_index = st.session_state.platforms.index(use_case_to_edit['platform'])
         
-        platform = st.selectbox("Platform", 
-                               st.session_state.platforms,
-                               index=platform_index,
-                               help="Select the primary platform for this use case")
-    
-    # Form submission
-    col1, col2, col3 = st.columns([1, 1, 2])
+            platform = st.selectbox("Platform", 
+                                   st.session_state.platforms,
+                                   index=platform_index,
+                                   help="Select the primary platform for this use case")
     
-    with col1:
-        submitted = st.form_submit_button("Update Use Case" if edit_mode else "Add Use Case", 
-                                        use_container_width=True)
+        # Form submission
+        col1, col2, col3 = st.columns([1, 1, 2])
     
-    with col2:
-        if edit_mode:
-            cancelled = st.form_submit_button("Cancel Edit", use_container_width=True)
-            if cancelled:
-                if 'edit_use_case_id' in st.session_state:
-                    del st.session_state.edit_use_case_id
-                st.rerun()
+        with col1:
+            submitted = st.form_submit_button("Update Use Case" if edit_mode else "Add Use Case", 
+                                            use_container_width=True)
     
-    if submitted:
-        if problem and solution and leader:
+        with col2:
             if edit_mode:
-                update_use_case(st.session_state.edit_use_case_id, problem, solution, leader, status, enablement_tier, platform)
-                st.session_state.use_case_success_message = "✅ Use case has been successfully updated with your changes!"
-                if 'edit_use_case_id' in st.session_state:
-                    del st.session_state.edit_use_case_id
+                cancelled = st.form_submit_button("Cancel Edit", use_container_width=True)
+                if cancelled:
+                    if 'edit_use_case_id' in st.session_state:
+                        del st.session_state.edit_use_case_id
+                    st.rerun()
+    
+        if submitted:
+            if problem and solution and leader:
+                if edit_mode:
+                    update_use_case(st.session_state.edit_use_case_id, problem, solution, leader, status, enablement_tier, platform)
+                    st.session_state.use_case_success_message = "✅ Use case has been successfully updated with your changes!"
+                    if 'edit_use_case_id' in st.session_state:
+                        del st.session_state.edit_use_case_id
+                else:
+                    add_use_case(selected_account, problem, solution, leader, status, enablement_tier, platform)
+                    account_name = st.session_state.accounts[selected_account]['team']
+                    st.session_state.use_case_success_message = f"✅ New use case has been successfully created and added to {account_name}!"
+                    if 'selected_account_for_use_case' in st.session_state:
+                        del st.session_state.selected_account_for_use_case
+                st.rerun()
             else:
-                use_case_id = add_use_case(selected_account, problem, solution, leader, status, enablement_tier, platform)
-                account_name = st.session_state.accounts[selected_account]['team']
-                st.session_state.use_case_success_message = f"✅ New use case has been successfully created and added to {account_name}!"
-                if 'selected_account_for_use_case' in st.session_state:
-                    del st.session_state.selected_account_for_use_case
-            st.rerun()
-        else:
-            st.error("Please fill in all required fields (Problem, Solution, Leader)")
+                st.error("Please fill in all required fields (Problem, Solution, Leader)")
+
+use_case_form()
 
 st.markdown("---")
 
-# Display all use cases
-st.subheader("All Use Cases")
+@st.fragment
+def use_case_listing():
+    """Search, filters and the current page of use cases"""
+    # Display all use cases
+    st.subheader("All Use Cases")
 
-if st.session_state.use_cases:
-    # Create a comprehensive view of all use cases
-    use_cases_data = []
-    for uc_id, uc in st.session_state.use_cases.items():
-        account_info = st.session_state.accounts.get(uc['account_bsnid'], {})
-        use_cases_data.append({
-            'Account': account_info.get('team', 'Unknown'),
-            'Business Area': account_info.get('business_area', 'Unknown'),
-            'Problem': uc['problem'][:60] + "..." if len(uc['problem']) > 60 else uc['problem'],
-            'Solution': uc['solution'][:60] + "..." if len(uc['solution']) > 60 else uc['solution'],
-            'Leader': uc['leader'],
-            'Status': uc['status'],
-            'Enablement Tier': uc['enablement_tier'],
-            'Platform': uc.get('platform', 'Not specified'),
-            'ID': uc_id
-        })
+    if st.session_state.use_cases:
+        def use_case_account(use_case):
+            return st.session_state.accounts.get(use_case['account_bsnid'], {})
     
-    # Filter options
-    col1, col2, col3 = st.columns(3)
+        use_case_search = st.text_input(
+            "Search problems and solutions",
+            key="use_case_search",
+            help='Matches whole words, best matches first. Put words in "quotes" to find an exact phrase.'
+        )
     
-    with col1:
-        business_areas = ['All'] + list(set([uc['Business Area'] for uc in use_cases_data]))
-        selected_ba = st.selectbox("Filter by Business Area", business_areas)
+        # Filter options
+        col1, col2, col3 = st.columns(3)
     
-    with col2:
-        statuses = ['All'] + list(set([uc['Status'] for uc in use_cases_data]))
-        selected_status = st.selectbox("Filter by Status", statuses)
+        with col1:
+            business_areas = ['All'] + get_filter_options('use_cases', 'business_area')
+            selected_ba = st.selectbox("Filter by Business Area", business_areas)
+    
+        with col2:
+            statuses = ['All'] + get_filter_options('use_cases', 'status')
+            selected_status = st.selectbox("Filter by Status", statuses)
     
-    with col3:
-        tiers = ['All'] + list(set([uc['Enablement Tier'] for uc in use_cases_data]))
-        selected_tier = st.selectbox("Filter by Enablement Tier", tiers)
+        with col3:
+            tiers = ['All'] + get_filter_options('use_cases', 'enablement_tier')
+            selected_tier = st.selectbox("Filter by Enablement Tier", tiers)
     
-    # Apply filters
-    filtered_data = use_cases_data.copy()
-    if selected_ba != 'All':
-        filtered_data = [uc for uc in filtered_data if uc['Business Area'] == selected_ba]
-    if selected_status != 'All':
-        filtered_data = [uc for uc in filtered_data if uc['Status'] == selected_status]
-    if selected_tier != 'All':
-        filtered_data = [uc for uc in filtered_data if uc['Enablement Tier'] == selected_tier]
+        use_case_filters = ListingFilter.from_selections(
+            business_area=selected_ba,
+            status=selected_status,
+            enablement_tier=selected_tier
+        )
+    
+        use_case_page_size = st.selectbox("Use cases per page", PAGE_SIZE_OPTIONS,
+                                          index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                                          key="use_cases_page_size")
+    
+        if use_case_search.strip():
+            # Full-text matches ranked by relevance, with the matching words highlighted
+            use_case_hits = search_use_cases(use_case_search, limit=use_case_page_size, filters=use_case_filters)
+            loaded_use_cases = [uc for uc, _ in use_case_hits]
+            use_case_snippets = {uc['id']: snippet for uc, snippet in use_case_hits}
+            use_case_page = None
+        else:
+            # Only the page on screen is fetched and rendered, newest first
+            use_case_page, use_case_page_number = load_page(
+                'use_cases_listing',
+                (use_case_filters, use_case_page_size),
+                lambda token: get_use_cases_page(token, limit=use_case_page_size, filters=use_case_filters)
+            )
+            loaded_use_cases = use_case_page.rows
+            use_case_snippets = {}
     
-    st.write(f"**Showing {len(filtered_data)} of {len(use_cases_data)} use cases**")
+        if use_case_search.strip():
+            st.write(f"**Showing the {len(loaded_use_cases)} best matches for: {use_case_search.strip()}**")
+        elif loaded_use_cases:
+            first_use_case = (use_case_page_number - 1) * use_case_page_size + 1
+            st.write(f"**Showing use cases {first_use_case}–{first_use_case + len(loaded_use_cases) - 1} "
+                     f"of {len(st.session_state.use_cases)}**")
     
-    # Display filtered use cases
-    if filtered_data:
-        for i, uc_data in enumerate(filtered_data):
-            with st.expander(f"{uc_data['Account']} - {uc_data['Problem'][:40]}..."):
-                col1, col2 = st.columns(2)
+        # Display the page as one summary line per use case; detail is built only for entries toggled open
+        if loaded_use_cases:
+            for uc in loaded_use_cases:
+                account_info = use_case_account(uc)
+                if uc['id'] in use_case_snippets:
+                    st.markdown(use_case_snippets[uc['id']])
+                summary = f"{account_info.get('team', 'Unknown')} - {uc['problem'][:40]}... ({uc['status']})"
+                if not st.toggle(summary, key=f"use_case_{uc['id']}"):
+                    continue
+                with st.container(border=True):
+                    col1, col2 = st.columns(2)
                 
-                with col1:
-                    st.write(f"**Account:** {uc_data['Account']}")
-                    st.write(f"**Business Area:** {uc_data['Business Area']}")
-                    st.write(f"**Problem:** {st.session_state.use_cases[uc_data['ID']]['problem']}")
-                    st.write(f"**Solution:** {st.session_state.use_cases[uc_data['ID']]['solution']}")
+                    with col1:
+                        st.write(f"**Account:** {account_info.get('team', 'Unknown')}")
+                        st.write(f"**Business Area:** {account_info.get('business_area', 'Unknown')}")
+                        st.write(f"**Problem:** {uc['problem']}")
+                        st.write(f"**Solution:** {uc['solution']}")
                 
-                with col2:
-                    st.write(f"**Leader:** {uc_data['Leader']}")
-                    st.write(f"**Status:** {uc_data['Status']}")
-                    st.write(f"**Enablement Tier:** {uc_data['Enablement Tier']}")
+                    with col2:
+                        st.write(f"**Leader:** {uc['leader']}")
+                        st.write(f"**Status:** {uc['status']}")
+                        st.write(f"**Enablement Tier:** {uc['enablement_tier']}")
                     
-                    # Action buttons
-                    col_edit, col_view = st.columns(2)
-                    with col_edit:
-                        if st.button(f"Edit", key=f"edit_{uc_data['ID']}"):
-                            st.session_state.edit_use_case_id = uc_data['ID']
-                            st.rerun()
-                    with col_view:
-                        if st.button(f"View Account", key=f"view_{uc_data['ID']}"):
-                            st.session_state.selected_account = st.session_state.use_cases[uc_data['ID']]['account_bsnid']
-                            st.switch_page("pages/1_Account_Details.py")
-    else:
-        st.info("No use cases match the selected filters.")
+                        # Action buttons
+                        col_edit, col_view = st.columns(2)
+                        with col_edit:
+                            if st.button("Edit", key=f"edit_{uc['id']}"):
+                                st.session_state.edit_use_case_id = uc['id']
+                                # The form is a separate fragment, so rerun the whole page
+                                st.rerun()
+                        with col_view:
+                            if st.button("View Account", key=f"view_{uc['id']}"):
+                                st.session_state.selected_account = uc['account_bsnid']
+                                st.switch_page("pages/1_Account_Details.py")
+        
+            if use_case_page is not None:
+                page_controls('use_cases_listing', use_case_page, use_case_page_number)
+        elif use_case_search.strip():
+            st.info("No use cases match your search.")
+        else:
+            st.info("No use cases match the selected filters.")
         
-else:
-    st.info("No use cases available. Add your first use case using the form above.")
+    else:
+        st.info("No use cases available. Add your first use case using the form above.")
+
+use_case_listing()
 
-# Statistics
 st.markdown("---")
-st.subheader("Use Case Statistics")
 
-if st.session_state.use_cases:
-    col1, col2, col3, col4 = st.columns(4)
+# Statistics
+def use_case_statistics():
+    """Totals over every use case"""
+    st.subheader("Use Case Statistics")
+
+    if st.session_state.use_cases:
+        col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.metric("Total Use Cases", len(st.session_state.use_cases))
+        with col1:
+            st.metric("Total Use Cases", len(st.session_state.use_cases))
     
-    with col2:
-        active_count = len([uc for uc in st.session_state.use_cases.values() if uc['status'] == 'Active'])
-        st.metric("Active Use Cases", active_count)
+        with col2:
+            active_count = len([uc for uc in st.session_state.use_cases.values() if uc['status'] == 'Active'])
+            st.metric("Active Use Cases", active_count)
     
-    with col3:
-        completed_count = len([uc for uc in st.session_state.use_cases.values() if uc['status'] == 'Completed'])
-        st.metric("Completed Use Cases", completed_count)
+        with col3:
+            completed_count = len([uc for uc in st.session_state.use_cases.values() if uc['status'] == 'Completed'])
+            st.metric("Completed Use Cases", completed_count)
     
-    with col4:
-        tier1_count = len([uc for uc in st.session_state.use_cases.values() if uc['enablement_tier'] == 'Tier 1'])
-        st.metric("Tier 1 Use Cases", tier1_count)
+        with col4:
+            tier1_count = len([uc for uc in st.session_state.use_cases.values() if uc['enablement_tier'] == 'Tier 1'])
+            st.metric("Tier 1 Use Cases", tier1_count)
+
+use_case_statistics()
 
 # Updates Section
 st.markdown("---")
@@ -257,7 +310,9 @@ st.header("Updates Management")
 # Create tabs for Updates functionality
 update_tab1, update_tab2 = st.tabs(["Add Update", "View All Updates"])
 
-with update_tab1:
+@st.fragment
+def add_update_form():
+    """Add an update to an account; a successful save reruns the page so the listing refreshes"""
     st.subheader("Add New Update")
     
     with st.form("add_update_form"):
@@ -315,73 +370,87 @@ with update_tab1:
             else:
                 st.error("Please fill in all required fields (Author, Date, and Description)")
 
-with update_tab2:
+with update_tab1:
+    add_update_form()
+
+@st.fragment
+def use_case_updates_listing():
+    """Filters and the current page of updates"""
     st.subheader("All Updates")
     
     if st.session_state.updates:
-        # Create a comprehensive view of all updates
-        updates_data = []
-        for update_id, update in st.session_state.updates.items():
-            account_info = st.session_state.accounts.get(update['account_bsnid'], {})
-            updates_data.append({
-                'Account': account_info.get('team', 'Unknown'),
-                'Business Area': account_info.get('business_area', 'Unknown'),
-                'Author': update['author'],
-                'Date': update['date'].strftime('%Y-%m-%d %H:%M'),
-                'Platform': update['platform'],
-                'Description': update['description'][:80] + "..." if len(update['description']) > 80 else update['description'],
-                'Full Description': update['description'],
-                'ID': update_id
-            })
-        
         # Filter options for updates
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            update_business_areas = ['All'] + list(set([upd['Business Area'] for upd in updates_data]))
+            update_business_areas = ['All'] + get_filter_options('updates', 'business_area')
             selected_update_ba = st.selectbox("Filter by Business Area", update_business_areas, key="update_ba_filter")
         
         with col2:
-            update_platforms = ['All'] + list(set([upd['Platform'] for upd in updates_data]))
+            update_platforms = ['All'] + get_filter_options('updates', 'platform')
             selected_update_platform = st.selectbox("Filter by Platform", update_platforms, key="update_platform_filter")
         
         with col3:
-            update_authors = ['All'] + list(set([upd['Author'] for upd in updates_data]))
+            update_authors = ['All'] + get_filter_options('updates', 'author')
             selected_update_author = st.selectbox("Filter by Author", update_authors, key="update_author_filter")
         
-        # Apply filters
-        filtered_updates = updates_data
-        if selected_update_ba != 'All':
-            filtered_updates = [upd for upd in filtered_updates if upd['Business Area'] == selected_update_ba]
-        if selected_update_platform != 'All':
-            filtered_updates = [upd for upd in filtered_updates if upd['Platform'] == selected_update_platform]
-        if selected_update_author != 'All':
-            filtered_updates = [upd for upd in filtered_updates if upd['Author'] == selected_update_author]
+        update_filters = ListingFilter.from_selections(
+            business_area=selected_update_ba,
+            platform=selected_update_platform,
+            author=selected_update_author
+        )
+        
+        update_page_size = st.selectbox("Updates per page", PAGE_SIZE_OPTIONS,
+                                        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                                        key="use_case_updates_page_size")
+        
+        # Only the page on screen is fetched and rendered, most recent first
+        update_page, update_page_number = load_page(
+            'use_case_updates_listing',
+            (update_filters, update_page_size),
+            lambda token: get_updates_page(token, limit=update_page_size, filters=update_filters)
+        )
         
-        st.write(f"**Showing {len(filtered_updates)} of {len(updates_data)} updates**")
+        if update_page.rows:
+            first_update = (update_page_number - 1) * update_page_size + 1
+            st.write(f"**Showing updates {first_update}–{first_update + len(update_page.rows) - 1} "
+                     f"of {len(st.session_state.updates)}**")
+        else:
+            st.info("No updates match the selected filters.")
         
-        # Display updates
-        for update in filtered_updates:
-            with st.expander(f"{update['Account']} - {update['Platform']} - {update['Date']}"):
+        # Display the page as one summary line per update; detail is built only for entries toggled open
+        for update in update_page.rows:
+            account_info = st.session_state.accounts.get(update['account_bsnid'], {})
+            update_timestamp = update['date'].strftime('%Y-%m-%d %H:%M')
+            summary = f"{account_info.get('team', 'Unknown')} - {update['platform']} - {update_timestamp}"
+            if not st.toggle(summary, key=f"use_case_update_{update['id']}"):
+                continue
+            with st.container(border=True):
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    st.write(f"**Account:** {update['Account']}")
-                    st.write(f"**Business Area:** {update['Business Area']}")
+                    st.write(f"**Account:** {account_info.get('team', 'Unknown')}")
+                    st.write(f"**Business Area:** {account_info.get('business_area', 'Unknown')}")
                 
                 with col2:
-                    st.write(f"**Author:** {update['Author']}")
-                    st.write(f"**Platform:** {update['Platform']}")
+                    st.write(f"**Author:** {update['author']}")
+                    st.write(f"**Platform:** {update['platform']}")
                 
                 with col3:
-                    st.write(f"**Date:** {update['Date']}")
+                    st.write(f"**Date:** {update_timestamp}")
                 
                 st.markdown("**Description:**")
-                st.write(update['Full Description'])
+                st.write(update['description'])
+        
+        if update_page.rows:
+            page_controls('use_case_updates_listing', update_page, update_page_number)
     
     else:
         st.info("No updates available. Add your first update using the form above.")
 
+with update_tab2:
+    use_case_updates_listing()
+
 # Navigation
 st.sidebar.title("Navigation")
 st.sidebar.markdown("""
@@ -390,14 +459,21 @@ st.sidebar.markdown("""
 - **View Account**: Click "View Account" to see the full account details
 """)
 
-if st.session_state.use_cases:
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Quick Stats")
+def quick_stats():
+    """Status distribution in the sidebar"""
+    if st.session_state.use_cases:
+        st.markdown("---")
+        st.subheader("Quick Stats")
     
-    # Status distribution
-    status_counts = {}
-    for uc in st.session_state.use_cases.values():
-        status_counts[uc['status']] = status_counts.get(uc['status'], 0) + 1
+        # Status distribution
+        status_counts = {}
+        for uc in st.session_state.use_cases.values():
+            status_counts[uc['status']] = status_counts.get(uc['status'], 0) + 1
     
-    for status, count in status_counts.items():
-        st.sidebar.write(f"**{status}:** {count}")
+        for status, count in status_counts.items():
+            st.write(f"**{status}:** {count}")
+
+with st.sidebar:
+    quick_stats()
+
+finish_page_profile(page_profile)
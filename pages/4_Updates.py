@@ -1,9 +1,11 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 from utils.data_manager import (
-    initialize_data, add_update, get_account_updates, update_update
+    initialize_data, add_update, get_updates_page, get_filter_options, search_updates
 )
+from utils.query_filters import ListingFilter
+from utils.pagination import DEFAULT_PAGE_SIZE, PAGE_SIZE_OPTIONS, load_page, page_controls
+from utils.page_profiler import start_page_profile, finish_page_profile
 
 # Page configuration
 st.set_page_config(
@@ -12,6 +14,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Opt-in rerun profiling (PAGE_PROFILER=1 or ?profile=1)
+page_profile = start_page_profile("Updates")
+
 # Initialize data
 initialize_data()
 
@@ -31,7 +36,11 @@ st.markdown("---")
 # Create tabs for Updates functionality
 update_tab1, update_tab2 = st.tabs(["Add Update", "View All Updates"])
 
-with update_tab1:
+# Each interactive region below is a fragment with its own data dependencies: a widget
+# inside one reruns only that region, and a change that invalidates the others reruns the page
+@st.fragment
+def add_update_form():
+    """Add an update to an account; a successful save reruns the page so the listing and stats refresh"""
     st.subheader("Add New Update")
     
     with st.form("add_update_form"):
@@ -89,114 +98,152 @@ with update_tab1:
             else:
                 st.error("Please fill in all required fields (Author, Date, and Description)")
 
-with update_tab2:
+with update_tab1:
+    add_update_form()
+
+@st.fragment
+def updates_listing():
+    """Search, filters and the current page of updates"""
     st.subheader("All Updates")
     
     if st.session_state.updates:
-        # Create a comprehensive view of all updates
-        updates_data = []
-        for update_id, update in st.session_state.updates.items():
-            account_info = st.session_state.accounts.get(update['account_bsnid'], {})
-            updates_data.append({
-                'Account': account_info.get('team', 'Unknown'),
-                'Business Area': account_info.get('business_area', 'Unknown'),
-                'Author': update['author'],
-                'Date': update['date'].strftime('%Y-%m-%d %H:%M'),
-                'Platform': update['platform'],
-                'Description': update['description'][:80] + "..." if len(update['description']) > 80 else update['description'],
-                'Full Description': update['description'],
-                'ID': update_id
-            })
+        update_search = st.text_input(
+            "Search descriptions",
+            key="update_search",
+            help='Matches whole words, best matches first. Put words in "quotes" to find an exact phrase.'
+        )
         
         # Filter options for updates
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            update_business_areas = ['All'] + list(set([upd['Business Area'] for upd in updates_data]))
+            update_business_areas = ['All'] + get_filter_options('updates', 'business_area')
             selected_update_ba = st.selectbox("Filter by Business Area", update_business_areas, key="update_ba_filter")
         
         with col2:
-            update_platforms = ['All'] + list(set([upd['Platform'] for upd in updates_data]))
+            update_platforms = ['All'] + get_filter_options('updates', 'platform')
             selected_update_platform = st.selectbox("Filter by Platform", update_platforms, key="update_platform_filter")
         
         with col3:
-            update_authors = ['All'] + list(set([upd['Author'] for upd in updates_data]))
+            update_authors = ['All'] + get_filter_options('updates', 'author')
             selected_update_author = st.selectbox("Filter by Author", update_authors, key="update_author_filter")
         
-        # Apply filters
-        filtered_updates = updates_data
-        if selected_update_ba != 'All':
-            filtered_updates = [upd for upd in filtered_updates if upd['Business Area'] == selected_update_ba]
-        if selected_update_platform != 'All':
-            filtered_updates = [upd for upd in filtered_updates if upd['Platform'] == selected_update_platform]
-        if selected_update_author != 'All':
-            filtered_updates = [upd for upd in filtered_updates if upd['Author'] == selected_update_author]
+        update_filters = ListingFilter.from_selections(
+            business_area=selected_update_ba,
+            platform=selected_update_platform,
+            author=selected_update_author
+        )
+        
+        update_page_size = st.selectbox("Updates per page", PAGE_SIZE_OPTIONS,
+                                        index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+                                        key="updates_page_size")
         
-        st.write(f"**Showing {len(filtered_updates)} of {len(updates_data)} updates**")
+        if update_search.strip():
+            # Full-text matches ranked by relevance, with the matching words highlighted
+            update_hits = search_updates(update_search, limit=update_page_size, filters=update_filters)
+            loaded_updates = [update for update, _ in update_hits]
+            update_snippets = {update['id']: snippet for update, snippet in update_hits}
+            update_page = None
+        else:
+            # Only the page on screen is fetched and rendered, most recent first
+            update_page, update_page_number = load_page(
+                'updates_listing',
+                (update_filters, update_page_size),
+                lambda token: get_updates_page(token, limit=update_page_size, filters=update_filters)
+            )
+            loaded_updates = update_page.rows
+            update_snippets = {}
+        
+        if update_search.strip():
+            st.write(f"**Showing the {len(loaded_updates)} best matches for: {update_search.strip()}**")
+        elif loaded_updates:
+            first_update = (update_page_number - 1) * update_page_size + 1
+            st.write(f"**Showing updates {first_update}–{first_update + len(loaded_updates) - 1} "
+                     f"of {len(st.session_state.updates)}**")
+        else:
+            st.info("No updates match the selected filters.")
         
-        # Display updates
-        for update in filtered_updates:
-            with st.expander(f"{update['Account']} - {update['Platform']} - {update['Date']}"):
+        # Display the page as one summary line per update; detail is built only for entries toggled open
+        for update in loaded_updates:
+            account_info = st.session_state.accounts.get(update['account_bsnid'], {})
+            update_timestamp = update['date'].strftime('%Y-%m-%d %H:%M')
+            if update['id'] in update_snippets:
+                st.markdown(update_snippets[update['id']])
+            summary = f"{account_info.get('team', 'Unknown')} - {update['platform']} - {update_timestamp}"
+            if not st.toggle(summary, key=f"update_{update['id']}"):
+                continue
+            with st.container(border=True):
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    st.write(f"**Account:** {update['Account']}")
-                    st.write(f"**Business Area:** {update['Business Area']}")
+                    st.write(f"**Account:** {account_info.get('team', 'Unknown')}")
+                    st.write(f"**Business Area:** {account_info.get('business_area', 'Unknown')}")
                 
                 with col2:
-                    st.write(f"**Author:** {update['Author']}")
-                    st.write(f"**Platform:** {update['Platform']}")
+                    st.write(f"**Author:** {update['author']}")
+                    st.write(f"**Platform:** {update['platform']}")
                 
                 with col3:
-                    st.write(f"**Date:** {update['Date']}")
+                    st.write(f"**Date:** {update_timestamp}")
                 
                 st.markdown("**Description:**")
-                st.write(update['Full Description'])
+                st.write(update['description'])
+        
+        if update_page is not None and loaded_updates:
+            page_controls('updates_listing', update_page, update_page_number)
     
     else:
         st.info("No updates available. Add your first update using the form above.")
 
-# Statistics
+with update_tab2:
+    updates_listing()
+
 st.markdown("---")
-st.subheader("Update Statistics")
 
-if st.session_state.updates:
-    col1, col2, col3, col4 = st.columns(4)
+# Statistics
+def update_statistics():
+    """Most active platform, author and business area over every update"""
+    st.subheader("Update Statistics")
+
+    if st.session_state.updates:
+        col1, col2, col3, col4 = st.columns(4)
     
-    with col1:
-        st.metric("Total Updates", len(st.session_state.updates))
+        with col1:
+            st.metric("Total Updates", len(st.session_state.updates))
     
-    with col2:
-        platform_counts = {}
-        for update in st.session_state.updates.values():
-            platform_counts[update['platform']] = platform_counts.get(update['platform'], 0) + 1
-        if platform_counts:
-            most_used_platform = sorted(platform_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
-        else:
-            most_used_platform = "None"
-        st.metric("Most Active Platform", most_used_platform)
+        with col2:
+            platform_counts = {}
+            for update in st.session_state.updates.values():
+                platform_counts[update['platform']] = platform_counts.get(update['platform'], 0) + 1
+            if platform_counts:
+                most_used_platform = sorted(platform_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
+            else:
+                most_used_platform = "None"
+            st.metric("Most Active Platform", most_used_platform)
     
-    with col3:
-        author_counts = {}
-        for update in st.session_state.updates.values():
-            author_counts[update['author']] = author_counts.get(update['author'], 0) + 1
-        if author_counts:
-            most_active_author = sorted(author_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
-        else:
-            most_active_author = "None"
-        st.metric("Most Active Author", most_active_author)
+        with col3:
+            author_counts = {}
+            for update in st.session_state.updates.values():
+                author_counts[update['author']] = author_counts.get(update['author'], 0) + 1
+            if author_counts:
+                most_active_author = sorted(author_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
+            else:
+                most_active_author = "None"
+            st.metric("Most Active Author", most_active_author)
     
-    with col4:
-        business_area_counts = {}
-        for update in st.session_state.updates.values():
-            account_info = st.session_state.accounts.get(update['account_bsnid'], {})
-            ba = account_info.get('business_area', 'Unknown')
-            business_area_counts[ba] = business_area_counts.get(ba, 0) + 1
-        if business_area_counts:
-            most_active_ba = sorted(business_area_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
-        else:
-            most_active_ba = "None"
-        st.metric("Most Active Business Area", most_active_ba)
+        with col4:
+            business_area_counts = {}
+            for update in st.session_state.updates.values():
+                account_info = st.session_state.accounts.get(update['account_bsnid'], {})
+                ba = account_info.get('business_area', 'Unknown')
+                business_area_counts[ba] = business_area_counts.get(ba, 0) + 1
+            if business_area_counts:
+                most_active_ba = sorted(business_area_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
+            else:
+                most_active_ba = "None"
+            st.metric("Most Active Business Area", most_active_ba)
+
+update_statistics()
 
 # Navigation
 st.sidebar.title("Navigation")
@@ -206,14 +253,21 @@ st.sidebar.markdown("""
 - **Statistics**: View update statistics and trends
 """)
 
-if st.session_state.updates:
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Quick Stats")
+def quick_stats():
+    """Platform distribution in the sidebar"""
+    if st.session_state.updates:
+        st.markdown("---")
+        st.subheader("Quick Stats")
     
-    # Platform distribution
-    platform_counts = {}
-    for update in st.session_state.updates.values():
-        platform_counts[update['platform']] = platform_counts.get(update['platform'], 0) + 1
+        # Platform distribution
+        platform_counts = {}
+        for update in st.session_state.updates.values():
+            platform_counts[update['platform']] = platform_counts.get(update['platform'], 0) + 1
     
-    for platform, count in platform_counts.items():
-        st.sidebar.write(f"**{platform}:** {count} updates")
\ No newline at end of file
+        for platform, count in platform_counts.items():
+            st.write(f"**{platform}:** {count} updates")
+
+with st.sidebar:
+    quick_stats()
+
+finish_page_profile(page_profile)
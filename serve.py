@@ -0,0 +1,19 @@
+"""
+Start the Streamlit server with a process warmup
+Runs `streamlit run app.py` in this process after starting utils.warmup, so the
+connection pool, warehouse and query cache are warm by the time sessions arrive.
+Arguments are passed on to streamlit:
+
+    python serve.py --server.port 5000
+"""
+
+import sys
+
+from streamlit.web import cli
+
+from utils.warmup import warmup
+
+if __name__ == "__main__":
+    warmup.start()
+    sys.argv = ["streamlit", "run", "app.py", *sys.argv[1:]]
+    sys.exit(cli.main())
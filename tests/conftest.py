@@ -0,0 +1,7 @@
+"""
+Test setup: point the warehouse at an in-memory local stand-in before utils is imported
+"""
+
+import os
+
+os.environ.setdefault("LOCAL_SQL_DATABASE", ":memory:")
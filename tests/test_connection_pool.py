@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from utils.connection_pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, operation, parameters=None):
+        if self.connection.broken:
+            raise RuntimeError("session expired")
+
+    def fetchone(self):
+        return (1,)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+        self.broken = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.open = False
+
+
+def test_checkout_times_out_when_pool_is_exhausted():
+    pool = ConnectionPool(FakeConnection, min_size=0, max_size=1, timeout=0.05)
+    conn = pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_waiting_checkout_gets_released_connection():
+    pool = ConnectionPool(FakeConnection, min_size=0, max_size=1, timeout=5)
+    conn = pool.acquire()
+    threading.Timer(0.05, pool.release, args=(conn,)).start()
+
+    assert pool.acquire() is conn
+    assert pool.stats()['timeouts'] == 0
+
+
+def test_closed_connection_is_replaced_on_checkout():
+    pool = ConnectionPool(FakeConnection, min_size=1, max_size=1)
+    conn = pool.acquire()
+    conn.close()
+    pool.release(conn)
+
+    replacement = pool.acquire()
+    assert replacement is not conn and replacement.open
+    stats = pool.stats()
+    assert stats['reconnects'] == 1
+    assert stats['created'] == 2
+    assert stats['size'] == 1
+
+
+def test_idle_connection_failing_ping_is_replaced():
+    pool = ConnectionPool(FakeConnection, min_size=1, max_size=1, health_check_interval=0)
+    conn = pool.acquire()
+    conn.broken = True
+    pool.release(conn)
+
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert not conn.open
+    assert pool.stats()['failed_health_checks'] == 1
+
+
+def test_connection_is_discarded_after_a_failure_that_killed_it():
+    pool = ConnectionPool(FakeConnection, min_size=0, max_size=1)
+
+    with pytest.raises(RuntimeError):
+        with pool.cursor() as cursor:
+            cursor.connection.broken = True
+            cursor.execute("SELECT 1")
+
+    stats = pool.stats()
+    assert stats['size'] == 0 and stats['idle'] == 0
+    with pool.connection() as conn:
+        assert not conn.broken
+
+
+def test_failed_connect_frees_its_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("warehouse starting")
+        return FakeConnection()
+
+    pool = ConnectionPool(connect, min_size=0, max_size=1, timeout=0.05)
+    with pytest.raises(ConnectionError):
+        pool.acquire()
+    assert pool.acquire().open
+    assert pool.stats()['size'] == 1
+
+
+def test_invalid_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        ConnectionPool(FakeConnection, min_size=2, max_size=1)
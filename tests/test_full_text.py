@@ -0,0 +1,78 @@
+from utils.full_text import FullTextIndex, parse_query, tokenize
+
+FIELDS = ('problem', 'solution')
+
+
+def build(records):
+    index = FullTextIndex(FIELDS)
+    for doc_id, (problem, solution) in records.items():
+        index.add(doc_id, {'problem': problem, 'solution': solution})
+    return index
+
+
+def test_tokenize_and_parse_query():
+    assert tokenize("Spark-based ETL, v2!") == ["spark", "based", "etl", "v2"]
+    assert parse_query('etl "data quality" "spark" etl') == (["etl", "spark"], [["data", "quality"]])
+
+
+def test_documents_with_more_occurrences_rank_higher():
+    index = build({
+        1: ("Pipeline latency", "Tune the pipeline"),
+        2: ("Pipeline latency pipeline pipeline", "Tune the pipeline"),
+        3: ("Dashboard refresh", "Cache results"),
+    })
+
+    assert [doc_id for doc_id, _ in index.search("pipeline")] == [2, 1]
+
+
+def test_rare_terms_outweigh_common_ones():
+    index = build({
+        1: ("Report report report", "Manual"),
+        2: ("Report", "Forecasting"),
+        3: ("Report", "Manual"),
+    })
+
+    assert index.search("report forecasting")[0][0] == 2
+
+
+def test_phrase_requires_adjacent_tokens_in_one_field():
+    index = build({
+        1: ("The data quality checks fail", ""),
+        2: ("Quality of the data", ""),
+        3: ("Missing data", "Quality checks added"),
+    })
+
+    assert [doc_id for doc_id, _ in index.search('"data quality"')] == [1]
+
+
+def test_phrase_and_terms_combine():
+    index = build({
+        1: ("Data quality in finance", ""),
+        2: ("Data quality in marketing", ""),
+        3: ("Finance forecasting", ""),
+    })
+
+    assert [doc_id for doc_id, _ in index.search('"data quality" finance')] == [1]
+
+
+def test_no_match_or_empty_query_returns_nothing():
+    index = build({1: ("Pipeline", "")})
+
+    assert index.search("warehouse") == []
+    assert index.search("  ") == []
+
+
+def test_removed_document_no_longer_matches():
+    index = build({1: ("Pipeline", ""), 2: ("Pipeline rebuild", "")})
+    index.remove(1)
+    index.add(2, {'problem': "Dashboard", 'solution': ""})
+
+    assert index.search("pipeline") == []
+    assert len(index) == 1
+
+
+def test_snippet_highlights_the_first_match():
+    index = build({1: ("Nightly loads are slow", "Partition the source table by date")})
+
+    assert index.snippet(1, "partition") == ('solution', "**Partition** the source table by date")
+    assert index.snippet(1, "missing") == ('problem', "Nightly loads are slow")
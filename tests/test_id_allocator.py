@@ -0,0 +1,118 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from utils.connection_pool import ConnectionPool
+from utils.id_allocator import IdAllocationError, IdAllocator, create_sequence_table
+from utils.local_sql import LocalWarehouse
+
+TABLE = "id_sequences"
+
+
+@pytest.fixture
+def pool():
+    warehouse = LocalWarehouse()
+    pool = ConnectionPool(warehouse.connect, min_size=0, max_size=4)
+    with pool.cursor() as cursor:
+        create_sequence_table(cursor, TABLE)
+    yield pool
+    pool.close()
+    warehouse.close()
+
+
+def counter_rows(pool, name="use_case"):
+    with pool.cursor() as cursor:
+        cursor.execute(f"SELECT next_value FROM {TABLE} WHERE name = ?", (name,))
+        return [row[0] for row in cursor.fetchall()]
+
+
+class RacingPool:
+    """Pool whose reservations lose the compare-and-swap to another writer a number of times"""
+
+    def __init__(self, pool, races):
+        self.pool = pool
+        self.races = races
+
+    @contextmanager
+    def cursor(self):
+        with self.pool.cursor() as cursor:
+            yield RacingCursor(cursor, self)
+
+
+class RacingCursor:
+    def __init__(self, cursor, racing_pool):
+        self._cursor = cursor
+        self._racing_pool = racing_pool
+
+    def execute(self, operation, parameters=None):
+        if operation.lstrip().startswith("UPDATE") and self._racing_pool.races:
+            self._racing_pool.races -= 1
+            # Another process reserves a block between our read and our update
+            self._cursor.execute(f"UPDATE {TABLE} SET next_value = next_value + 100")
+        return self._cursor.execute(operation, parameters)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def test_values_are_handed_out_from_reserved_blocks(pool):
+    allocator = IdAllocator(lambda: pool, TABLE, "use_case", block_size=5)
+
+    assert [allocator.next_value() for _ in range(7)] == [1, 2, 3, 4, 5, 6, 7]
+    assert allocator.blocks_reserved == 2
+    assert counter_rows(pool) == [11]
+
+
+def test_sequence_is_seeded_after_the_highest_value_in_use(pool):
+    allocator = IdAllocator(lambda: pool, TABLE, "use_case", seed_query="SELECT 41", block_size=5)
+    assert allocator.next_value() == 42
+
+
+def test_lost_compare_and_swap_is_retried_from_the_new_value(pool):
+    IdAllocator(lambda: pool, TABLE, "use_case", block_size=5).next_value()
+    allocator = IdAllocator(lambda: RacingPool(pool, races=2), TABLE, "use_case", block_size=5)
+
+    assert allocator.next_value() == 206
+    assert allocator.conflicts == 2
+    assert counter_rows(pool) == [211]
+
+
+def test_reservation_gives_up_after_repeated_conflicts(pool, monkeypatch):
+    monkeypatch.setattr("utils.id_allocator.time.sleep", lambda seconds: None)
+    allocator = IdAllocator(lambda: RacingPool(pool, races=100), TABLE, "use_case", block_size=5)
+
+    with pytest.raises(IdAllocationError):
+        allocator.next_value()
+
+
+def test_duplicate_counter_rows_are_collapsed_to_the_highest(pool):
+    with pool.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {TABLE} VALUES ('use_case', 10), ('use_case', 30), ('use_case', 30)")
+    allocator = IdAllocator(lambda: pool, TABLE, "use_case", block_size=5)
+
+    assert allocator.next_value() == 30
+    assert counter_rows(pool) == [35, 35]
+    assert allocator.next_value() == 31
+
+
+def test_concurrent_allocators_never_share_a_value(pool):
+    allocators = [IdAllocator(lambda: pool, TABLE, "use_case", block_size=3) for _ in range(4)]
+    values = []
+
+    def allocate(allocator):
+        for _ in range(30):
+            values.append(allocator.next_value())
+
+    threads = [threading.Thread(target=allocate, args=(allocator,)) for allocator in allocators]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(values) == 120 and len(set(values)) == 120
+
+
+def test_missing_pool_raises():
+    with pytest.raises(IdAllocationError):
+        IdAllocator(lambda: None, TABLE, "use_case", block_size=5).next_value()
@@ -0,0 +1,97 @@
+from datetime import date, datetime
+
+import pytest
+
+from utils import database_manager
+from utils.connection_pool import get_connection_pool
+from utils.pagination import decode_page_token, encode_page_token, make_page
+from utils.query_cache import query_cache
+
+TABLE = f"{database_manager.CATALOG_NAME}.{database_manager.SCHEMA_NAME}.{database_manager.TABLE_PREFIX}"
+
+
+@pytest.fixture
+def warehouse():
+    database_manager.create_database_schema()
+    with get_connection_pool().cursor() as cursor:
+        for table in ("accounts", "use_cases"):
+            cursor.execute(f"DELETE FROM {TABLE}_{table}")
+    query_cache.clear()
+    yield
+    query_cache.clear()
+
+
+def insert_accounts(rows):
+    with get_connection_pool().cursor() as cursor:
+        for bsnid, team in rows:
+            cursor.execute(f"INSERT INTO {TABLE}_accounts (bsnid, team, business_area) VALUES (?, ?, 'Finance')",
+                           (bsnid, team))
+
+
+def walk(fetch_page):
+    """Every row of a listing, following next_token until the last page"""
+    rows, token, pages = [], None, 0
+    while True:
+        page = fetch_page(token)
+        rows.extend(page.rows)
+        pages += 1
+        if page.next_token is None:
+            return rows, pages
+        token = page.next_token
+
+
+def test_token_round_trips_strings_numbers_dates_and_none():
+    key = ("Team A", 42, 1.5, None, datetime(2024, 5, 1, 12, 30, 15, 250), date(2024, 5, 1))
+    assert decode_page_token(encode_page_token(key)) == key
+
+
+def test_token_is_url_safe():
+    token = encode_page_token(["?&/+ é", "x" * 40])
+    assert all(c.isalnum() or c in "-_=" for c in token)
+
+
+def test_invalid_token_raises_value_error():
+    with pytest.raises(ValueError):
+        decode_page_token("not a token!")
+
+
+def test_make_page_sets_next_token_only_when_rows_remain():
+    rows = [(i, f"row {i}") for i in range(4)]
+    assert make_page(rows[:3], 3, lambda row: (row[0],)).next_token is None
+
+    page = make_page(rows, 3, lambda row: (row[0],))
+    assert page.rows == rows[:3]
+    assert decode_page_token(page.next_token) == (2,)
+
+
+def test_account_pages_cover_ties_and_null_teams_exactly_once(warehouse):
+    rows = [(f"B{i:03}", "Shared team") for i in range(7)]
+    rows += [(f"N{i:03}", None) for i in range(5)]
+    rows += [(f"E{i:03}", "") for i in range(2)]
+    rows += [("A001", "Alpha"), ("Z001", "Zulu")]
+    insert_accounts(rows)
+
+    accounts, pages = walk(lambda token: database_manager.get_accounts_page(page_token=token, limit=3))
+
+    bsnids = [account['bsnid'] for account in accounts]
+    assert sorted(bsnids) == sorted(bsnid for bsnid, _ in rows)
+    assert pages == 6
+    teams = [account['team'] or '' for account in accounts]
+    assert teams == sorted(teams)
+
+
+def test_use_case_pages_break_created_at_ties_by_id(warehouse):
+    insert_accounts([("A001", "Alpha")])
+    created_at = datetime(2024, 1, 1, 9, 0)
+    database_manager.add_use_cases_bulk([
+        {'account_bsnid': "A001", 'platform': "Databricks", 'problem': f"Problem {i}",
+         'solution': "Solution", 'author': "Author", 'created_at': created_at}
+        for i in range(10)
+    ])
+
+    use_cases, _ = walk(lambda token: database_manager.get_use_cases_page(page_token=token, limit=4))
+
+    ids = [use_case['use_case_id'] for use_case in use_cases]
+    assert len(ids) == 10 and len(set(ids)) == 10
+    assert ids == sorted(ids, reverse=True)
+    assert {use_case['created_at'] for use_case in use_cases} == {created_at}
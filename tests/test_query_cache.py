@@ -0,0 +1,125 @@
+import pytest
+
+from utils import query_cache as query_cache_module
+from utils.query_cache import QueryCache, mark_uncacheable, track_uncacheable
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(query_cache_module, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_their_entity_ttl(clock):
+    cache = QueryCache(ttls={'accounts': 10})
+    calls = []
+
+    @cache.cached('accounts')
+    def get_accounts():
+        calls.append(1)
+        return len(calls)
+
+    assert get_accounts() == 1
+    clock.now += 9
+    assert get_accounts() == 1
+    clock.now += 2
+    assert get_accounts() == 2
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 2 and stats['expirations'] == 1
+
+
+def test_invalidate_evicts_only_the_matching_arguments(clock):
+    cache = QueryCache()
+    calls = []
+
+    @cache.cached('use_cases')
+    def get_use_cases(bsnid, limit=10):
+        calls.append(bsnid)
+        return [bsnid] * limit
+
+    get_use_cases("A")
+    get_use_cases("B")
+    get_use_cases.invalidate("A", limit=10)
+    get_use_cases("A")
+    get_use_cases("B")
+    assert calls == ["A", "B", "A"]
+
+
+def test_invalidate_entity_evicts_every_entry_of_that_entity(clock):
+    cache = QueryCache()
+    cache.set(("page", 1), 'use_case_pages', "p1")
+    cache.set(("page", 2), 'use_case_pages', "p2")
+    cache.set(("stats",), 'stats', "s")
+
+    assert cache.invalidate_entity('use_case_pages') == 2
+    assert cache.get(("page", 1), 'use_case_pages') == (False, None)
+    assert cache.get(("stats",), 'stats') == (True, "s")
+
+
+def test_zero_ttl_disables_caching(clock):
+    cache = QueryCache(ttls={'stats': 0})
+    calls = []
+
+    @cache.cached('stats')
+    def get_stats():
+        calls.append(1)
+
+    get_stats()
+    get_stats()
+    assert len(calls) == 2
+
+
+def test_uncacheable_results_are_not_stored_and_propagate_to_callers(clock):
+    cache = QueryCache()
+    failing = [True]
+
+    @cache.cached('accounts')
+    def get_accounts():
+        if failing[0]:
+            mark_uncacheable()
+            return []
+        return ["A"]
+
+    @cache.cached('account_bundle')
+    def get_bundle():
+        return {'accounts': get_accounts()}
+
+    assert get_bundle() == {'accounts': []}
+    failing[0] = False
+    assert get_bundle() == {'accounts': ["A"]}
+    assert cache.stats()['entries'] == 2
+
+
+def test_track_uncacheable_reports_failed_calls(clock):
+    cache = QueryCache()
+
+    @cache.cached('accounts')
+    def get_accounts(fail):
+        if fail:
+            mark_uncacheable()
+        return []
+
+    with track_uncacheable() as call:
+        get_accounts(False)
+    assert call['cacheable']
+
+    with track_uncacheable() as call:
+        get_accounts(True)
+    assert not call['cacheable']
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries(clock):
+    cache = QueryCache(max_entries=2)
+    for i in range(3):
+        cache.set(i, 'accounts', i)
+    assert cache.get(0, 'accounts') == (False, None)
+    assert cache.get(2, 'accounts') == (True, 2)
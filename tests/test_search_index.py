@@ -0,0 +1,65 @@
+from utils.search_index import TrigramIndex, normalize
+
+
+def account(team, business_area="Finance", vp="", admin="", primary_it_partner=""):
+    return {'team': team, 'business_area': business_area, 'vp': vp, 'admin': admin,
+            'primary_it_partner': primary_it_partner}
+
+
+def build(records):
+    index = TrigramIndex()
+    for doc_id, record in records.items():
+        index.add(doc_id, record)
+    return index
+
+
+def test_normalize_lowercases_and_collapses_whitespace():
+    assert normalize("  Data   Platform\tTeam ") == "data platform team"
+    assert normalize(None) == ""
+
+
+def test_equal_beats_prefix_beats_word_prefix_beats_substring():
+    index = build({
+        'substring': account("Megadata"),
+        'word_prefix': account("Core Data Services"),
+        'prefix': account("Data Platform"),
+        'equal': account("Data"),
+    })
+
+    assert [doc_id for doc_id, _ in index.search("data")] == ['equal', 'prefix', 'word_prefix', 'substring']
+
+
+def test_ties_keep_insertion_order_and_limit_applies():
+    index = build({f"A{i}": account(f"Data team {i}") for i in range(5)})
+
+    assert [doc_id for doc_id, _ in index.search("data", limit=3)] == ['A0', 'A1', 'A2']
+
+
+def test_any_search_field_matches():
+    index = build({'A': account("Payments", vp="Sarah Johnson"), 'B': account("Payroll")})
+
+    assert [doc_id for doc_id, _ in index.search("johnson")] == ['A']
+
+
+def test_typo_falls_back_to_fuzzy_similarity():
+    index = build({'A': account("Marketing Analytics"), 'B': account("Finance Operations")})
+
+    results = index.search("marketng")
+    assert [doc_id for doc_id, _ in results] == ['A']
+    assert 0 < results[0][1] < 1
+
+
+def test_blank_term_returns_everything_in_insertion_order():
+    index = build({'B': account("Beta"), 'A': account("Alpha")})
+
+    assert index.search("  ") == [('B', 0.0), ('A', 0.0)]
+
+
+def test_replaced_and_removed_records_stop_matching():
+    index = build({'A': account("Legacy Reporting"), 'B': account("Reporting Hub")})
+    index.add('A', account("Modern Analytics"))
+    index.remove('B')
+
+    assert index.search("reporting") == []
+    assert [doc_id for doc_id, _ in index.search("analytics")] == ['A']
+    assert len(index) == 1 and 'B' not in index
@@ -0,0 +1,86 @@
+import threading
+
+from utils.records import Account, make_account, make_use_case
+from utils.shared_store import RecordMap, SharedStore
+
+
+def account(bsnid, team):
+    return make_account(bsnid, team, "Finance", "VP", "Admin", "Partner")
+
+
+def test_record_map_matches_a_dict_under_inserts_and_replacements():
+    expected = {i: i for i in range(50)}
+    records = RecordMap(expected)
+    for i in list(range(0, 80, 3)) + list(range(100, 120)):
+        records = records.with_item(i, -i)
+        expected[i] = -i
+
+    assert dict(records) == expected
+    assert list(records) == list(expected)
+    assert list(records.items()) == list(expected.items())
+    assert list(records.values()) == list(expected.values())
+    assert len(records) == len(expected)
+    assert records.get(1000, "missing") == "missing"
+
+
+def test_with_item_leaves_the_original_unchanged():
+    original = RecordMap({'A': 1})
+    updated = original.with_item('A', 2).with_item('B', 3)
+
+    assert dict(original) == {'A': 1}
+    assert dict(updated) == {'A': 2, 'B': 3}
+
+
+def test_session_snapshot_is_unaffected_by_later_writes():
+    store = SharedStore()
+    with store.lock.write():
+        store.put('accounts', 'A', account('A', "Alpha"))
+
+    # A session reads the map once per run and keeps that reference
+    snapshot = store.accounts
+    with store.lock.write():
+        store.put('accounts', 'A', account('A', "Alpha renamed"))
+        store.put('accounts', 'B', account('B', "Beta"))
+
+    assert snapshot['A'].team == "Alpha" and 'B' not in snapshot
+    assert store.accounts['A'].team == "Alpha renamed" and 'B' in store.accounts
+
+
+def test_writes_are_visible_to_other_sessions_and_clear_filter_options():
+    store = SharedStore()
+    store.filter_options[('use_cases', 'platform')] = ["Databricks"]
+    written = threading.Event()
+
+    def writer():
+        with store.lock.write():
+            store.put('use_cases', 1, make_use_case(1, 'A', "Problem", "Solution", "Lead",
+                                                    "Completed", "Tier 1", "Snowflake"))
+        written.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    thread.join()
+
+    assert written.is_set()
+    with store.lock.read():
+        assert store.use_cases[1].platform == "Snowflake"
+    assert store.filter_options == {}
+
+
+def test_load_runs_once():
+    store = SharedStore()
+    calls = []
+
+    assert store.load(lambda: calls.append(1))
+    assert not store.load(lambda: calls.append(1))
+    assert calls == [1]
+
+
+def test_records_read_as_mappings_and_share_interned_categories():
+    first = account('A', "Alpha")
+    second = make_account('B', "Beta", "".join(["Fin", "ance"]), "VP", "Admin", "Partner")
+
+    assert isinstance(first, Account)
+    assert first['team'] == "Alpha" and first.get('missing', 0) == 0
+    assert dict(first)['bsnid'] == 'A'
+    assert first.business_area is second.business_area
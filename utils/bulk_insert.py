@@ -0,0 +1,45 @@
+"""
+Batched multi-row INSERT helper
+Sends many rows per statement as one parameterized VALUES list instead of one INSERT per row
+"""
+
+from utils.config import get_config
+
+# Default rows per INSERT statement, overridable via DATABRICKS_BULK_BATCH_SIZE;
+# keep rows * columns well under the warehouse parameter limit
+BULK_INSERT_BATCH_SIZE = 100
+
+
+def get_batch_size(batch_size=None):
+    """Resolve the rows-per-statement batch size, falling back to DATABRICKS_BULK_BATCH_SIZE"""
+    batch_size = batch_size or get_config().bulk_batch_size or BULK_INSERT_BATCH_SIZE
+    if batch_size < 1:
+        raise ValueError(f"Invalid batch size: {batch_size}")
+    return batch_size
+
+
+def insert_rows(cursor, table, rows, columns=None, batch_size=None):
+    """Insert row tuples into table in batches of multi-row VALUES statements
+
+    columns names the target columns; when omitted each row must supply every table
+    column in order. Returns the number of rows inserted. An exception from a batch
+    propagates after the earlier batches have been committed.
+    """
+    batch_size = get_batch_size(batch_size)
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    width = len(columns) if columns else len(rows[0])
+    placeholders = "(" + ", ".join(["?"] * width) + ")"
+    column_list = f" ({', '.join(columns)})" if columns else ""
+
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        cursor.execute(
+            f"INSERT INTO {table}{column_list} VALUES {', '.join([placeholders] * len(batch))}",
+            [value for row in batch for value in row]
+        )
+        inserted += len(batch)
+    return inserted
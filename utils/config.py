@@ -0,0 +1,138 @@
+"""
+Application configuration
+Read from the environment (and a .env file) once per process and validated up front, so
+pages and data access share one set of settings instead of each calling load_dotenv()
+and os.getenv()
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+DEFAULT_CATALOG = "corporate_information_technology_raw_dev_000"
+DEFAULT_SCHEMA = "developer_psprawls"
+DEFAULT_TABLE_PREFIX = "edip_crm"
+
+# Catalog, schema and table prefix are interpolated into SQL, so they must be plain identifiers
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_CACHE_TTL_PREFIX = "QUERY_CACHE_TTL_"
+
+
+class ConfigError(ValueError):
+    """Raised when an environment setting is present but invalid"""
+
+
+@dataclass(frozen=True)
+class Config:
+    """Validated settings; optional tuning values are None when left to the module defaults"""
+    catalog: str = DEFAULT_CATALOG
+    schema: str = DEFAULT_SCHEMA
+    table_prefix: str = DEFAULT_TABLE_PREFIX
+    server_hostname: str | None = None
+    http_path: str | None = None
+    access_token: str | None = None
+    client_id: str | None = None
+    client_secret: str | None = None
+    local_sql_database: str | None = None
+    local_sql_latency_ms: float = 0.0
+    local_sql_jitter_ms: float = 0.0
+    pool_min_size: int | None = None
+    pool_max_size: int | None = None
+    pool_timeout: float | None = None
+    pool_health_check_interval: float | None = None
+    bulk_batch_size: int | None = None
+    id_block_size: int | None = None
+    cache_ttls: dict = field(default_factory=dict)
+    synthetic_accounts: int = 0
+    page_profiler: bool = False
+    warmup: bool = True
+
+    @property
+    def table_base(self):
+        """Prefix of the CRM table names: catalog.schema.prefix"""
+        return f"{self.catalog}.{self.schema}.{self.table_prefix}"
+
+    def pool_options(self):
+        """ConnectionPool keyword arguments for the pool settings given in the environment"""
+        options = {
+            'min_size': self.pool_min_size,
+            'max_size': self.pool_max_size,
+            'timeout': self.pool_timeout,
+            'health_check_interval': self.pool_health_check_interval,
+        }
+        return {name: value for name, value in options.items() if value is not None}
+
+
+def _number(environ, name, kind, minimum):
+    value = environ.get(name)
+    if value is None or value == "":
+        return None
+    try:
+        number = kind(value)
+    except ValueError:
+        raise ConfigError(f"{name} must be a number, got {value!r}") from None
+    if number < minimum:
+        raise ConfigError(f"{name} must be at least {minimum}, got {value!r}")
+    return number
+
+
+def _identifier(environ, name, default):
+    value = environ.get(name) or default
+    if not _IDENTIFIER.match(value):
+        raise ConfigError(f"{name} must be a SQL identifier (letters, digits, underscores), got {value!r}")
+    return value
+
+
+def load_config(environ=None):
+    """Build and validate a Config from environ (default: os.environ after loading .env)"""
+    if environ is None:
+        from dotenv import load_dotenv
+        load_dotenv()
+        environ = os.environ
+
+    cache_ttls = {
+        name[len(_CACHE_TTL_PREFIX):].lower(): _number(environ, name, float, 0)
+        for name in environ if name.startswith(_CACHE_TTL_PREFIX)
+    }
+    config = Config(
+        catalog=_identifier(environ, "DATABRICKS_CATALOG", DEFAULT_CATALOG),
+        schema=_identifier(environ, "DATABRICKS_SCHEMA", DEFAULT_SCHEMA),
+        table_prefix=_identifier(environ, "DATABRICKS_TABLE_PREFIX", DEFAULT_TABLE_PREFIX),
+        server_hostname=environ.get("DATABRICKS_SERVER_HOSTNAME") or None,
+        http_path=environ.get("DATABRICKS_HTTP_PATH") or None,
+        access_token=environ.get("DATABRICKS_TOKEN") or None,
+        client_id=environ.get("DATABRICKS_CLIENT_ID") or None,
+        client_secret=environ.get("DATABRICKS_CLIENT_SECRET") or None,
+        local_sql_database=environ.get("LOCAL_SQL_DATABASE") or None,
+        local_sql_latency_ms=_number(environ, "LOCAL_SQL_LATENCY_MS", float, 0) or 0.0,
+        local_sql_jitter_ms=_number(environ, "LOCAL_SQL_JITTER_MS", float, 0) or 0.0,
+        pool_min_size=_number(environ, "DATABRICKS_POOL_MIN_SIZE", int, 0),
+        pool_max_size=_number(environ, "DATABRICKS_POOL_MAX_SIZE", int, 1),
+        pool_timeout=_number(environ, "DATABRICKS_POOL_TIMEOUT", float, 0),
+        pool_health_check_interval=_number(environ, "DATABRICKS_POOL_HEALTH_CHECK_INTERVAL", float, 0),
+        bulk_batch_size=_number(environ, "DATABRICKS_BULK_BATCH_SIZE", int, 1),
+        id_block_size=_number(environ, "ID_ALLOCATOR_BLOCK_SIZE", int, 1),
+        cache_ttls={entity: ttl for entity, ttl in cache_ttls.items() if ttl is not None},
+        synthetic_accounts=_number(environ, "SYNTHETIC_ACCOUNTS", int, 0) or 0,
+        page_profiler=environ.get("PAGE_PROFILER", "").lower() in ("1", "true", "yes"),
+        warmup=environ.get("WARMUP", "").lower() not in ("0", "false", "no"),
+    )
+    if (config.pool_min_size is not None and config.pool_max_size is not None
+            and config.pool_min_size > config.pool_max_size):
+        raise ConfigError("DATABRICKS_POOL_MIN_SIZE must not exceed DATABRICKS_POOL_MAX_SIZE")
+    return config
+
+
+_config = None
+_config_lock = threading.Lock()
+
+
+def get_config():
+    """Get the process-wide configuration, loading and validating it on first use"""
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = load_config()
+    return _config
@@ -0,0 +1,280 @@
+"""
+Connection pool for Databricks SQL
+Shares a bounded set of warehouse connections between all Streamlit sessions in the process
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+from utils.config import get_config
+
+# Default pool sizing and health check configuration, overridable via environment
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 8
+POOL_CHECKOUT_TIMEOUT = 30.0
+POOL_HEALTH_CHECK_INTERVAL = 60.0
+
+# Number of recent checkout wait times kept for percentile metrics
+WAIT_SAMPLE_SIZE = 1000
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+def get_connection_params():
+    """Resolve Databricks connection parameters, or None when not configured"""
+    config = get_config()
+    # Method 1: Environment variables (for production deployment)
+    server_hostname = config.server_hostname
+    http_path = config.http_path
+    access_token = config.access_token
+
+    # Method 2: Streamlit secrets (for development)
+    if not all([server_hostname, http_path, access_token]):
+        try:
+            server_hostname = server_hostname or st.secrets["DATABRICKS_SERVER_HOSTNAME"]
+            http_path = http_path or st.secrets["DATABRICKS_HTTP_PATH"]
+            access_token = access_token or st.secrets["DATABRICKS_TOKEN"]
+        except (KeyError, FileNotFoundError):
+            pass
+
+    if not server_hostname or not http_path:
+        return None
+
+    if access_token:
+        return {
+            'server_hostname': server_hostname,
+            'http_path': http_path,
+            'access_token': access_token
+        }
+
+    # Method 3: Service principal (for production with OAuth)
+    client_id = config.client_id
+    client_secret = config.client_secret
+    if client_id and client_secret:
+        return {
+            'server_hostname': server_hostname,
+            'http_path': http_path,
+            'client_id': client_id,
+            'client_secret': client_secret
+        }
+
+    return None
+
+
+def _percentile(sorted_values, fraction):
+    """Return the value at the given fraction of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ConnectionPool:
+    """Thread-safe pool of Databricks SQL connections"""
+
+    def __init__(self, connect, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                 timeout=POOL_CHECKOUT_TIMEOUT, health_check_interval=POOL_HEALTH_CHECK_INTERVAL):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._available = threading.Condition(threading.Lock())
+        self._idle = deque()  # (connection, last_returned_at), most recently used on the right
+        self._size = 0  # Idle plus checked-out connections
+        self._closed = False
+
+        self._wait_times = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._counters = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'created': 0,
+            'reconnects': 0,
+            'failed_health_checks': 0
+        }
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+            self._size += 1
+
+    def _open(self):
+        """Open a new connection and count it"""
+        conn = self._connect()
+        with self._available:
+            self._counters['created'] += 1
+        return conn
+
+    def _close_quietly(self, conn):
+        """Close a connection, ignoring errors from already dead sessions"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn, last_used=None):
+        """Check that a connection is still usable, pinging it if it has been idle for a while"""
+        if not getattr(conn, 'open', True):
+            return False
+        if last_used is not None and time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None):
+        """Check out a healthy connection, waiting up to timeout seconds for one to free up"""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        conn, last_used = None, None
+
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # Reserve a slot now and open the connection outside the lock
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {timeout:.1f}s "
+                        f"(pool size {self.max_size})"
+                    )
+                self._available.wait(remaining)
+
+        try:
+            if conn is None:
+                conn = self._open()
+            elif not self._is_healthy(conn, last_used):
+                # Transparently replace sessions that expired or were dropped by the warehouse
+                self._close_quietly(conn)
+                conn = self._open()
+                with self._available:
+                    self._counters['failed_health_checks'] += 1
+                    self._counters['reconnects'] += 1
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+
+        with self._available:
+            self._counters['checkouts'] += 1
+            self._wait_times.append(time.monotonic() - started)
+        return conn
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool, or close it if it is no longer usable"""
+        with self._available:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._available.notify()
+
+        if conn is not None:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a with block"""
+        conn = self.acquire()
+        healthy = True
+        try:
+            yield conn
+        except Exception:
+            # A failed statement may mean the session died; verify before reusing it
+            healthy = self._is_healthy(conn)
+            raise
+        finally:
+            self.release(conn, discard=not healthy)
+
+    @contextmanager
+    def cursor(self):
+        """Check out a connection and open a cursor on it, mirroring Connection.cursor()"""
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+
+    def stats(self):
+        """Return pool occupancy, counters and checkout wait-time metrics"""
+        with self._available:
+            waits = sorted(self._wait_times)
+            stats = dict(self._counters)
+            stats.update({
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+
+        stats.update({
+            'wait_avg_ms': (sum(waits) / len(waits) * 1000) if waits else 0.0,
+            'wait_p50_ms': _percentile(waits, 0.50) * 1000,
+            'wait_p95_ms': _percentile(waits, 0.95) * 1000,
+            'wait_max_ms': (waits[-1] * 1000) if waits else 0.0
+        })
+        return stats
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts"""
+        with self._available:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._available.notify_all()
+
+        for conn in idle:
+            self._close_quietly(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """Get the process-wide connection pool, creating it on first use. Returns None if not configured.
+
+    With LOCAL_SQL_DATABASE set, the pool connects to a local warehouse stand-in instead of Databricks.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = get_config()
+                if config.local_sql_database:
+                    # Offline mode: a local stand-in for the warehouse (utils.local_sql)
+                    from utils import local_sql
+                    connect = lambda: local_sql.connect(config.local_sql_database)
+                else:
+                    params = get_connection_params()
+                    if params is None:
+                        return None
+                    # The connector is only imported once a warehouse is actually configured
+                    from databricks import sql
+                    connect = lambda: sql.connect(**params)
+                _pool = ConnectionPool(connect, **config.pool_options())
+    return _pool
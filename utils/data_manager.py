@@ -1,43 +1,43 @@
 import streamlit as st
+import heapq
 import uuid
-from datetime import datetime
+from dataclasses import replace
+from utils.pagination import DEFAULT_PAGE_SIZE, decode_page_token, make_page
+from utils.search_index import TrigramIndex
+from utils.full_text import FullTextIndex
+from utils.config import get_config
+from utils.instrumentation import instrumented
+from utils.synthetic_data import CrmDataGenerator, load_session_store
+from utils.shared_store import shared_store
+from utils.records import UseCase, category, make_account, make_update, make_use_case
 
+# Session state keys that point at the shared store
+_STORE_KEYS = ('accounts', 'use_cases', 'updates', 'business_areas', 'platforms',
+               'onboarding_statuses', 'enablement_tiers')
+
+def _attach():
+    """Point this session at the store's current maps and lists (O(1), nothing is copied)"""
+    for key in _STORE_KEYS:
+        st.session_state[key] = getattr(shared_store, key)
+
+def _load_sample_data():
+    synthetic_accounts = get_config().synthetic_accounts
+    if synthetic_accounts:
+        # Production-sized generated data instead of the demo accounts, for load testing
+        load_session_store(CrmDataGenerator(synthetic_accounts).chunks(), shared_store)
+        return
+    _add_sample_data()
+    _add_sample_updates()
+
+@instrumented
 def initialize_data():
-    """Initialize the data structures in session state if not already present"""
-    # Initialize all session state variables first
-    if 'accounts' not in st.session_state:
-        st.session_state.accounts = {}
-    
-    if 'use_cases' not in st.session_state:
-        st.session_state.use_cases = {}
-    
-    if 'updates' not in st.session_state:
-        st.session_state.updates = {}
-    
-    if 'business_areas' not in st.session_state:
-        st.session_state.business_areas = {
-            'Finance': 'John Smith',
-            'Marketing': 'Sarah Johnson', 
-            'Operations': 'Mike Davis',
-            'HR': 'Lisa Brown'
-        }
-    
-    if 'platforms' not in st.session_state:
-        st.session_state.platforms = ['Databricks', 'Snowflake', 'Power Platform']
-    
-    if 'onboarding_statuses' not in st.session_state:
-        st.session_state.onboarding_statuses = ['Requested', 'In Progress', 'Completed']
-    
-    if 'enablement_tiers' not in st.session_state:
-        st.session_state.enablement_tiers = ['Tier 1', 'Tier 2', 'Tier 3', 'None']
-    
-    # Check if sample data needs to be added (only if accounts is empty)
-    if not st.session_state.accounts and 'sample_data_loaded' not in st.session_state:
-        _add_sample_data()
-        st.session_state.sample_data_loaded = True
-        # Add sample updates after all data is loaded
-        if hasattr(st.session_state, 'accounts') and st.session_state.accounts:
-            _add_sample_updates()
+    """Attach this session to the process-wide store, loading the sample data on first use
+
+    Sessions share one copy of the data and see each other's writes; each run reads a
+    consistent snapshot taken here.
+    """
+    shared_store.load(_load_sample_data)
+    _attach()
 
 def _add_sample_data():
     """Add sample data for demonstration purposes"""
@@ -108,163 +108,275 @@ def _add_sample_data():
     # Add sample updates for demonstration
     # _add_sample_updates()  # Will be called after initialization
 
+@instrumented
 def add_account(team, business_area, vp, admin, primary_it_partner, platforms_status=None):
     """Add a new account to the system"""
     bsnid = str(uuid.uuid4())
-    if platforms_status is None:
-        platforms_status = {}
-    
-    st.session_state.accounts[bsnid] = {
-        'bsnid': bsnid,
-        'team': team,
-        'business_area': business_area,
-        'vp': vp,
-        'admin': admin,
-        'primary_it_partner': primary_it_partner,
-        'azure_devops_links': [],
-        'artifacts_folder_links': [],
-        'platforms_status': platforms_status,
-        'use_cases': [],
-        'updates': [],
-        'created_at': datetime.now()
-    }
+    account = make_account(bsnid, team, business_area, vp, admin, primary_it_partner, platforms_status)
+    with shared_store.lock.write():
+        shared_store.put('accounts', bsnid, account)
+        if shared_store.account_index is not None:
+            shared_store.account_index.add(bsnid, account)
+    _attach()
     return bsnid
 
+@instrumented
 def add_use_case(account_bsnid, problem, solution, leader, status, enablement_tier, platform):
     """Add a new use case to an account"""
-    use_case_id = str(uuid.uuid4())
-    use_case = {
-        'id': use_case_id,
-        'account_bsnid': account_bsnid,
-        'problem': problem,
-        'solution': solution,
-        'leader': leader,
-        'status': status,
-        'enablement_tier': enablement_tier,
-        'platform': platform,
-        'created_at': datetime.now()
-    }
-    
-    st.session_state.use_cases[use_case_id] = use_case
+    use_case_id = next(shared_store.ids)
+    use_case = make_use_case(use_case_id, account_bsnid, problem, solution, leader, status,
+                             enablement_tier, platform)
     
-    # Add use case to account
-    if account_bsnid in st.session_state.accounts:
-        st.session_state.accounts[account_bsnid]['use_cases'].append(use_case_id)
+    with shared_store.lock.write():
+        shared_store.put('use_cases', use_case_id, use_case)
+        if shared_store.use_case_text_index is not None:
+            shared_store.use_case_text_index.add(use_case_id, use_case)
+        
+        # Add use case to account
+        _update_account(account_bsnid, lambda account: {'use_cases': account.use_cases + (use_case_id,)})
+    _attach()
     
     return use_case_id
 
+@instrumented
 def update_use_case(use_case_id, problem, solution, leader, status, enablement_tier, platform):
     """Update an existing use case"""
-    if use_case_id in st.session_state.use_cases:
-        st.session_state.use_cases[use_case_id].update({
-            'problem': problem,
-            'solution': solution,
-            'leader': leader,
-            'status': status,
-            'enablement_tier': enablement_tier,
-            'platform': platform
-        })
+    with shared_store.lock.write():
+        if use_case_id not in shared_store.use_cases:
+            return
+        current = shared_store.use_cases[use_case_id]
+        use_case = make_use_case(use_case_id, current.account_bsnid, problem, solution, leader, status,
+                                 enablement_tier, platform, current.created_at)
+        shared_store.put('use_cases', use_case_id, use_case)
+        if shared_store.use_case_text_index is not None:
+            shared_store.use_case_text_index.add(use_case_id, use_case)
+    _attach()
 
+@instrumented
 def get_account_use_cases(account_bsnid):
     """Get all use cases for a specific account"""
     if account_bsnid not in st.session_state.accounts:
         return []
     
-    use_case_ids = st.session_state.accounts[account_bsnid]['use_cases']
-    return [st.session_state.use_cases[uc_id] for uc_id in use_case_ids if uc_id in st.session_state.use_cases]
+    use_cases = st.session_state.use_cases
+    return [use_cases[uc_id] for uc_id in st.session_state.accounts[account_bsnid].use_cases if uc_id in use_cases]
 
+@instrumented
 def update_primary_it_partner(business_area, partner_name):
     """Update the primary IT partner for a business area"""
-    st.session_state.business_areas[business_area] = partner_name
+    with shared_store.lock.write():
+        shared_store.put('business_areas', category(business_area), category(partner_name))
+    _attach()
+
+def _update_account(account_bsnid, changes):
+    """Copy-on-write update of an account with the fields changes(account) returns (hold the write lock)"""
+    account = shared_store.accounts.get(account_bsnid)
+    if account is not None:
+        shared_store.put('accounts', account_bsnid, replace(account, **changes(account)))
+
+def _build_index(index, records):
+    for record_id, record in records.items():
+        index.add(record_id, record)
+    return index
 
+def _account_index():
+    """Get the shared account search index, building it from the accounts on first use"""
+    return shared_store.index('account_index', lambda: _build_index(TrigramIndex(), shared_store.accounts))
+
+@instrumented
 def search_accounts(search_term):
-    """Search accounts by team, business area, VP, admin, or IT partner"""
+    """Search accounts by team, business area, VP, admin, or IT partner, best matches first"""
     if not search_term:
         return list(st.session_state.accounts.values())
     
-    search_term = search_term.lower()
-    filtered_accounts = []
-    
-    for account in st.session_state.accounts.values():
-        if (search_term in account['team'].lower() or
-            search_term in account['business_area'].lower() or
-            search_term in account['vp'].lower() or
-            search_term in account['admin'].lower() or
-            search_term in account['primary_it_partner'].lower()):
-            filtered_accounts.append(account)
-    
-    return filtered_accounts
+    accounts = st.session_state.accounts
+    index = _account_index()
+    with shared_store.lock.read():
+        matches = index.search(search_term)
+    # Accounts added after this session's snapshot are left for its next run
+    return [accounts[bsnid] for bsnid, _ in matches if bsnid in accounts]
+
+def _use_case_text_index():
+    return shared_store.index('use_case_text_index', lambda: _build_index(
+        FullTextIndex(('problem', 'solution')), shared_store.use_cases))
+
+def _update_text_index():
+    return shared_store.index('update_text_index', lambda: _build_index(
+        FullTextIndex(('description',)), shared_store.updates))
 
+def _text_search(index, records, query, limit, filters):
+    """Rank records for a query, keep those passing filters and attach a highlighted snippet"""
+    hits = []
+    accounts = st.session_state.accounts
+    with shared_store.lock.read():
+        for record_id, _ in index.search(query):
+            record = records.get(record_id)
+            if record is None or (filters is not None and
+                                  not filters.matches(lambda field: _record_value(record, field, accounts))):
+                continue
+            hits.append((record, index.snippet(record_id, query)[1]))
+            if limit and len(hits) >= limit:
+                break
+    return hits
+
+@instrumented
+def search_use_cases(query, limit=None, filters=None):
+    """Full-text search over use case problems and solutions
+
+    Returns (use_case, snippet) pairs ranked by BM25; quote words to search for a phrase.
+    """
+    return _text_search(_use_case_text_index(), st.session_state.use_cases, query, limit, filters)
+
+@instrumented
+def search_updates(query, limit=None, filters=None):
+    """Full-text search over update descriptions
+
+    Returns (update, snippet) pairs ranked by BM25; quote words to search for a phrase.
+    """
+    return _text_search(_update_text_index(), st.session_state.updates, query, limit, filters)
+
+@instrumented
 def add_platform_to_account(account_bsnid, platform, status):
     """Add a platform with status to an account"""
-    if account_bsnid in st.session_state.accounts:
-        st.session_state.accounts[account_bsnid]['platforms_status'][platform] = status
+    with shared_store.lock.write():
+        _update_account(account_bsnid, lambda account: {
+            'platforms_status': {**account.platforms_status, category(platform): category(status)}
+        })
+    _attach()
 
+@instrumented
 def update_platform_status(account_bsnid, platform, status):
     """Update the onboarding status of a platform for an account"""
-    if account_bsnid in st.session_state.accounts:
-        st.session_state.accounts[account_bsnid]['platforms_status'][platform] = status
+    with shared_store.lock.write():
+        _update_account(account_bsnid, lambda account: {
+            'platforms_status': {**account.platforms_status, category(platform): category(status)}
+        })
+    _attach()
 
+@instrumented
 def add_azure_devops_link(account_bsnid, link):
     """Add an Azure DevOps link to an account"""
-    if account_bsnid in st.session_state.accounts:
-        st.session_state.accounts[account_bsnid]['azure_devops_links'].append(link)
+    with shared_store.lock.write():
+        _update_account(account_bsnid, lambda account: {
+            'azure_devops_links': account.azure_devops_links + (link,)
+        })
+    _attach()
 
+@instrumented
 def add_artifacts_folder_link(account_bsnid, link):
     """Add an artifacts folder link to an account"""
-    if account_bsnid in st.session_state.accounts:
-        st.session_state.accounts[account_bsnid]['artifacts_folder_links'].append(link)
+    with shared_store.lock.write():
+        _update_account(account_bsnid, lambda account: {
+            'artifacts_folder_links': account.artifacts_folder_links + (link,)
+        })
+    _attach()
 
+@instrumented
 def add_update(account_bsnid, author, date, platform, description):
     """Add a new update to an account"""
-    update_id = str(uuid.uuid4())
-    update = {
-        'id': update_id,
-        'account_bsnid': account_bsnid,
-        'author': author,
-        'date': date,
-        'platform': platform,
-        'description': description,
-        'created_at': datetime.now()
-    }
+    update_id = next(shared_store.ids)
+    update = make_update(update_id, account_bsnid, author, date, platform, description)
     
-    st.session_state.updates[update_id] = update
-    
-    # Add update to account
-    if account_bsnid in st.session_state.accounts:
-        if 'updates' not in st.session_state.accounts[account_bsnid]:
-            st.session_state.accounts[account_bsnid]['updates'] = []
-        st.session_state.accounts[account_bsnid]['updates'].append(update_id)
+    with shared_store.lock.write():
+        shared_store.put('updates', update_id, update)
+        if shared_store.update_text_index is not None:
+            shared_store.update_text_index.add(update_id, update)
+        
+        # Add update to account
+        _update_account(account_bsnid, lambda account: {'updates': account.updates + (update_id,)})
+    _attach()
     
     return update_id
 
+@instrumented
 def get_account_updates(account_bsnid):
     """Get all updates for a specific account"""
     if account_bsnid not in st.session_state.accounts:
         return []
     
-    if 'updates' not in st.session_state.accounts[account_bsnid]:
-        return []
-        
-    update_ids = st.session_state.accounts[account_bsnid]['updates']
-    return [st.session_state.updates[update_id] for update_id in update_ids if update_id in st.session_state.updates]
+    updates = st.session_state.updates
+    return [updates[update_id] for update_id in st.session_state.accounts[account_bsnid].updates
+            if update_id in updates]
 
+@instrumented
 def update_update(update_id, author, date, platform, description):
     """Update an existing update"""
-    if update_id in st.session_state.updates:
-        st.session_state.updates[update_id].update({
-            'author': author,
-            'date': date,
-            'platform': platform,
-            'description': description
-        })
+    with shared_store.lock.write():
+        if update_id not in shared_store.updates:
+            return
+        current = shared_store.updates[update_id]
+        update = make_update(update_id, current.account_bsnid, author, date, platform, description,
+                             current.created_at)
+        shared_store.put('updates', update_id, update)
+        if shared_store.update_text_index is not None:
+            shared_store.update_text_index.add(update_id, update)
+    _attach()
+
+def _use_case_sort_key(use_case):
+    return (use_case.created_at, use_case.id)
+
+def _update_sort_key(update):
+    return (update.date, update.created_at, update.id)
+
+def _record_value(record, field, accounts):
+    """Get a filterable field of a use case or update; business area comes from the owning account"""
+    if field == 'business_area':
+        account = accounts.get(record.account_bsnid)
+        return account.business_area if account is not None else 'Unknown'
+    if field == 'author' and type(record) is UseCase:
+        # Use cases record their owner as the leader
+        return record.leader
+    return getattr(record, field, None)
+
+def _keyset_page(records, sort_key, page_token, limit, filters):
+    """Select the next page of records in descending sort_key order without sorting the whole store"""
+    candidates = records
+    if filters is not None and filters.active():
+        accounts = st.session_state.accounts
+        candidates = (record for record in candidates
+                      if filters.matches(lambda field: _record_value(record, field, accounts)))
+    if page_token:
+        last_key = decode_page_token(page_token)
+        candidates = (record for record in candidates if sort_key(record) < last_key)
+    return make_page(heapq.nlargest(limit + 1, candidates, key=sort_key), limit, sort_key)
+
+@instrumented
+def get_use_cases_page(page_token=None, limit=DEFAULT_PAGE_SIZE, filters=None):
+    """Get one page of use cases, newest first, restricted by an optional ListingFilter"""
+    return _keyset_page(st.session_state.use_cases.values(), _use_case_sort_key,
+                        page_token, limit, filters)
+
+@instrumented
+def get_updates_page(page_token=None, limit=DEFAULT_PAGE_SIZE, filters=None):
+    """Get one page of updates, most recent date first, restricted by an optional ListingFilter"""
+    return _keyset_page(st.session_state.updates.values(), _update_sort_key,
+                        page_token, limit, filters)
+
+@instrumented
+def get_filter_options(listing, field):
+    """Get the sorted distinct values of a field for the 'use_cases' or 'updates' listing"""
+    key = (listing, field)
+    cached = shared_store.filter_options.get(key)
+    if cached is not None:
+        return cached
+
+    records = st.session_state.use_cases if listing == 'use_cases' else st.session_state.updates
+    accounts = st.session_state.accounts
+    values = {_record_value(record, field, accounts) for record in records.values()}
+    options = sorted(value for value in values if value is not None)
+    # Keep the result only if this session's snapshot is still the store's current one;
+    # put() resets the options under the same lock
+    with shared_store.lock.write():
+        if shared_store.accounts is accounts and getattr(shared_store, listing) is records:
+            shared_store.filter_options[key] = options
+    return options
 
 def _add_sample_updates():
     """Add sample updates for demonstration purposes"""
     from datetime import datetime, timedelta
     
     # Get account BSNIDs to add updates
-    account_bsnids = list(st.session_state.accounts.keys())
+    account_bsnids = list(shared_store.accounts.keys())
     
     if len(account_bsnids) >= 3:
         # Find specific accounts to add updates to
@@ -272,12 +384,12 @@ def _add_sample_updates():
         sales_bsnid = None
         operations_bsnid = None
         
-        for bsnid, account in st.session_state.accounts.items():
-            if account['team'] == 'Analytics Team':
+        for bsnid, account in shared_store.accounts.items():
+            if account.team == 'Analytics Team':
                 analytics_bsnid = bsnid
-            elif account['team'] == 'Sales Analytics':
+            elif account.team == 'Sales Analytics':
                 sales_bsnid = bsnid
-            elif account['team'] == 'Operations Intelligence':
+            elif account.team == 'Operations Intelligence':
                 operations_bsnid = bsnid
         
         # Analytics Team Updates
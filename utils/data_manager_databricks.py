@@ -4,57 +4,43 @@ Provides database operations for the EDIP CRM system
 """
 
 import streamlit as st
-import pandas as pd
 import uuid
 from datetime import datetime, date
-from databricks import sql
-import os
+from utils.connection_pool import get_connection_pool
+from utils.bulk_insert import insert_rows
+from utils.id_allocator import IdAllocator, create_sequence_table
+from utils.instrumentation import instrumented, record_error
+
+# Counter table backing BSNID allocation
+SEQUENCES_TABLE = "edip_crm.main.id_sequences"
+
+_bsnid_allocator = IdAllocator(
+    get_connection_pool, SEQUENCES_TABLE, "bsnid",
+    seed_query="""
+        SELECT MAX(TRY_CAST(SUBSTRING(bsnid, 4) AS BIGINT))
+        FROM edip_crm.main.accounts WHERE bsnid LIKE 'BSN%'
+    """
+)
+
+def _empty_frame():
+    import pandas as pd  # Deferred: pandas is costly to import and only needed here and by to_pandas()
+    return pd.DataFrame()
 
-@st.cache_resource
 def get_databricks_connection():
-    """Get cached Databricks SQL connection with multiple auth methods"""
+    """Get the shared Databricks SQL connection pool"""
     try:
-        # Method 1: Environment variables (for production deployment)
-        server_hostname = os.getenv("DATABRICKS_SERVER_HOSTNAME")
-        http_path = os.getenv("DATABRICKS_HTTP_PATH")
-        access_token = os.getenv("DATABRICKS_TOKEN")
-        
-        # Method 2: Streamlit secrets (for development)
-        if not all([server_hostname, http_path, access_token]):
-            try:
-                server_hostname = st.secrets["DATABRICKS_SERVER_HOSTNAME"]
-                http_path = st.secrets["DATABRICKS_HTTP_PATH"]
-                access_token = st.secrets["DATABRICKS_TOKEN"]
-            except KeyError:
-                pass
-        
-        # Method 3: Service principal (for production with OAuth)
-        if not access_token:
-            client_id = os.getenv("DATABRICKS_CLIENT_ID")
-            client_secret = os.getenv("DATABRICKS_CLIENT_SECRET")
-            
-            if client_id and client_secret:
-                return sql.connect(
-                    server_hostname=server_hostname,
-                    http_path=http_path,
-                    client_id=client_id,
-                    client_secret=client_secret
-                )
-        
-        if not all([server_hostname, http_path, access_token]):
-            st.error("Databricks credentials not configured. Please set up connection details.")
-            return None
-            
-        return sql.connect(
-            server_hostname=server_hostname,
-            http_path=http_path,
-            access_token=access_token
-        )
-        
+        pool = get_connection_pool()
     except Exception as e:
+        record_error()
         st.error(f"Failed to connect to Databricks: {str(e)}")
         return None
 
+    if pool is None:
+        record_error()
+        st.error("Databricks credentials not configured. Please set up connection details.")
+    return pool
+
+@instrumented
 def initialize_data():
     """Initialize the data structures in session state if not already present"""
     if 'databricks_initialized' not in st.session_state:
@@ -65,6 +51,7 @@ def initialize_data():
         else:
             st.error("Failed to initialize Databricks connection")
 
+@instrumented
 def create_database_schema():
     """Create Unity Catalog tables if they don't exist"""
     conn = get_databricks_connection()
@@ -135,8 +122,12 @@ def create_database_schema():
                 ) USING DELTA
             """)
             
+            # Create ID sequence counter table
+            create_sequence_table(cursor, SEQUENCES_TABLE)
+            
         return True
     except Exception as e:
+        record_error()
         st.error(f"Failed to create database schema: {str(e)}")
         return False
 
@@ -171,11 +162,8 @@ def _add_sample_data():
                  'https://dev.azure.com/company/project5', 'https://company.sharepoint.com/artifacts/project5')
             ]
             
-            for account in accounts_data:
-                cursor.execute("""
-                    INSERT INTO edip_crm.main.accounts 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, account + (current_time, current_time))
+            insert_rows(cursor, "edip_crm.main.accounts",
+                        [account + (current_time, current_time) for account in accounts_data])
             
             # Sample platform statuses
             platforms_data = [
@@ -196,12 +184,9 @@ def _add_sample_data():
                 ('BSN005', 'Power Platform', 'Not Started')
             ]
             
-            for platform in platforms_data:
-                platform_id = str(uuid.uuid4())
-                cursor.execute("""
-                    INSERT INTO edip_crm.main.platforms_status 
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (platform_id,) + platform + (current_time, current_time))
+            insert_rows(cursor, "edip_crm.main.platforms_status",
+                        [(str(uuid.uuid4()),) + platform + (current_time, current_time)
+                         for platform in platforms_data])
             
             # Sample use cases
             use_cases_data = [
@@ -216,12 +201,9 @@ def _add_sample_data():
                  'Robert Kim', 'Not Started', 'Managed', 'Power Platform')
             ]
             
-            for use_case in use_cases_data:
-                use_case_id = str(uuid.uuid4())
-                cursor.execute("""
-                    INSERT INTO edip_crm.main.use_cases 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (use_case_id,) + use_case + (current_time, current_time))
+            insert_rows(cursor, "edip_crm.main.use_cases",
+                        [(str(uuid.uuid4()),) + use_case + (current_time, current_time)
+                         for use_case in use_cases_data])
             
             # Sample updates
             updates_data = [
@@ -233,21 +215,20 @@ def _add_sample_data():
                  'Completed stakeholder requirements gathering and initial dashboard mockups.')
             ]
             
-            for update in updates_data:
-                update_id = str(uuid.uuid4())
-                cursor.execute("""
-                    INSERT INTO edip_crm.main.updates 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (update_id,) + update + (current_time, current_time))
+            insert_rows(cursor, "edip_crm.main.updates",
+                        [(str(uuid.uuid4()),) + update + (current_time, current_time)
+                         for update in updates_data])
             
     except Exception as e:
+        record_error()
         st.error(f"Failed to add sample data: {str(e)}")
 
+@instrumented
 def search_accounts(search_term):
     """Search accounts by team, business area, VP, admin, or IT partner"""
     conn = get_databricks_connection()
     if not conn:
-        return pd.DataFrame()
+        return _empty_frame()
     
     try:
         with conn.cursor() as cursor:
@@ -267,9 +248,11 @@ def search_accounts(search_term):
             
             return cursor.fetchall_arrow().to_pandas()
     except Exception as e:
+        record_error()
         st.error(f"Failed to search accounts: {str(e)}")
-        return pd.DataFrame()
+        return _empty_frame()
 
+@instrumented
 def add_account(team, business_area, vp, admin, primary_it_partner, platforms_status=None):
     """Add a new account to the system"""
     conn = get_databricks_connection()
@@ -277,8 +260,8 @@ def add_account(team, business_area, vp, admin, primary_it_partner, platforms_st
         return None
     
     try:
-        # Generate new BSNID
-        bsnid = f"BSN{len(search_accounts('')) + 1:03d}"
+        # Generate new BSNID from a reserved block, without scanning the accounts table
+        bsnid = f"BSN{_bsnid_allocator.next_value():03d}"
         current_time = datetime.now()
         
         with conn.cursor() as cursor:
@@ -299,14 +282,16 @@ def add_account(team, business_area, vp, admin, primary_it_partner, platforms_st
         
         return bsnid
     except Exception as e:
+        record_error()
         st.error(f"Failed to add account: {str(e)}")
         return None
 
+@instrumented
 def get_account_use_cases(account_bsnid):
     """Get all use cases for a specific account"""
     conn = get_databricks_connection()
     if not conn:
-        return pd.DataFrame()
+        return _empty_frame()
     
     try:
         with conn.cursor() as cursor:
@@ -317,9 +302,11 @@ def get_account_use_cases(account_bsnid):
             """, (account_bsnid,))
             return cursor.fetchall_arrow().to_pandas()
     except Exception as e:
+        record_error()
         st.error(f"Failed to get use cases: {str(e)}")
-        return pd.DataFrame()
+        return _empty_frame()
 
+@instrumented
 def add_use_case(account_bsnid, problem, solution, leader, status, enablement_tier, platform):
     """Add a new use case to an account"""
     conn = get_databricks_connection()
@@ -338,14 +325,16 @@ def add_use_case(account_bsnid, problem, solution, leader, status, enablement_ti
         
         return use_case_id
     except Exception as e:
+        record_error()
         st.error(f"Failed to add use case: {str(e)}")
         return None
 
+@instrumented
 def get_account_updates(account_bsnid):
     """Get all updates for a specific account"""
     conn = get_databricks_connection()
     if not conn:
-        return pd.DataFrame()
+        return _empty_frame()
     
     try:
         with conn.cursor() as cursor:
@@ -356,5 +345,6 @@ def get_account_updates(account_bsnid):
             """, (account_bsnid,))
             return cursor.fetchall_arrow().to_pandas()
     except Exception as e:
+        record_error()
         st.error(f"Failed to get updates: {str(e)}")
-        return pd.DataFrame()
\ No newline at end of file
+        return _empty_frame()
\ No newline at end of file
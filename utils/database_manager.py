@@ -1,39 +1,101 @@
 import streamlit as st
 import uuid
+import bisect
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, date
-from databricks import sql
-import os
-from dotenv import load_dotenv
+from utils.config import get_config
+from utils.connection_pool import get_connection_pool
+from utils.query_cache import query_cache, mark_uncacheable
+from utils.pagination import DEFAULT_PAGE_SIZE, Page, decode_page_token, make_page
+from utils.bulk_insert import get_batch_size, insert_rows
+from utils.search_index import TrigramIndex
+from utils.instrumentation import instrumented, record_error
 
-# Load environment variables
-load_dotenv()
-
-# Get database configuration from environment
-CATALOG_NAME = os.getenv("DATABRICKS_CATALOG", "corporate_information_technology_raw_dev_000")
-SCHEMA_NAME = os.getenv("DATABRICKS_SCHEMA", "developer_psprawls")
-TABLE_PREFIX = os.getenv("DATABRICKS_TABLE_PREFIX", "edip_crm")
+# Get database configuration from the validated process-wide config
+CATALOG_NAME = get_config().catalog
+SCHEMA_NAME = get_config().schema
+TABLE_PREFIX = get_config().table_prefix
 
 # Database connection
-@st.cache_resource
 def get_databricks_connection():
-    """Get cached Databricks SQL connection"""
+    """Get the shared Databricks SQL connection pool"""
     try:
-        server_hostname = os.getenv("DATABRICKS_SERVER_HOSTNAME")
-        http_path = os.getenv("DATABRICKS_HTTP_PATH")
-        access_token = os.getenv("DATABRICKS_TOKEN")
-        
-        if not all([server_hostname, http_path, access_token]):
-            return None
-            
-        return sql.connect(
-            server_hostname=server_hostname,
-            http_path=http_path,
-            access_token=access_token
-        )
+        return get_connection_pool()
     except Exception as e:
         st.error(f"Database connection error: {str(e)}")
         return None
 
+def _query_failed(default):
+    """Return a fallback result for a failed query, keeping it out of the query cache"""
+    mark_uncacheable()
+    record_error()
+    return default
+
+@instrumented
+def create_database_schema():
+    """Create the CRM tables if they don't exist, with the columns the queries in this module use"""
+    conn = get_databricks_connection()
+    if not conn:
+        return False
+    
+    table = f"{CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}"
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table}_accounts (
+                    bsnid STRING,
+                    team STRING,
+                    business_area STRING,
+                    vp STRING,
+                    admin STRING,
+                    primary_it_partner STRING,
+                    azure_devops_links STRING,
+                    artifacts_folder_links STRING,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP
+                ) USING DELTA
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table}_platforms_status (
+                    platform_id STRING,
+                    account_bsnid STRING,
+                    platform STRING,
+                    status STRING,
+                    enablement_tier STRING,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP
+                ) USING DELTA
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table}_use_cases (
+                    use_case_id STRING,
+                    account_bsnid STRING,
+                    platform STRING,
+                    problem STRING,
+                    solution STRING,
+                    author STRING,
+                    created_at TIMESTAMP,
+                    updated_at TIMESTAMP
+                ) USING DELTA
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table}_updates (
+                    update_id STRING,
+                    account_bsnid STRING,
+                    author STRING,
+                    platform STRING,
+                    description STRING,
+                    update_date DATE,
+                    created_at TIMESTAMP
+                ) USING DELTA
+            """)
+        return True
+    except Exception as e:
+        record_error()
+        st.error(f"Failed to create database schema: {str(e)}")
+        return False
+
 def get_sample_accounts():
     """Return sample account data when database is not available"""
     return [
@@ -99,111 +161,196 @@ def get_sample_account_detail(bsnid):
     }
     return sample_accounts.get(bsnid)
 
+@dataclass
+class AccountBundle:
+    """Everything the Account Details page shows for one account"""
+    account: dict
+    platform_status: dict = field(default_factory=dict)
+    use_cases: list = field(default_factory=list)
+    updates: list = field(default_factory=list)
+
+@dataclass
+class SystemStats:
+    """Row counts and the per-business-area account breakdown"""
+    accounts: int = 0
+    use_cases: int = 0
+    updates: int = 0
+    platform_statuses: int = 0
+    business_areas: int = 0
+    accounts_by_business_area: list = field(default_factory=list)  # [(business_area, count)], largest first
+
+def _account_from_row(row):
+    """Build an account detail dict from a result row"""
+    return {
+        'bsnid': row[0],
+        'team': row[1],
+        'business_area': row[2],
+        'vp': row[3],
+        'admin': row[4],
+        'primary_it_partner': row[5],
+        'azure_devops_links': row[6].split(',') if row[6] else [],
+        'artifacts_folder_links': row[7].split(',') if row[7] else []
+    }
+
+def _account_use_case_from_row(row):
+    """Build an account use case dict from a result row"""
+    return {
+        'use_case_id': row[0],
+        'platform': row[1],
+        'problem': row[2],
+        'solution': row[3],
+        'author': row[4],
+        'created_at': row[5]
+    }
+
+def _account_update_from_row(row):
+    """Build an account update dict from a result row"""
+    return {
+        'update_id': row[0],
+        'author': row[1],
+        'platform': row[2],
+        'description': row[3],
+        'update_date': row[4],
+        'created_at': row[5]
+    }
+
+def _parse_timestamp(value):
+    """Convert a timestamp or date that was cast to STRING back into a datetime/date
+
+    Returns None for a value that does not parse, so pages fall back to 'Unknown'
+    instead of calling strftime() on a string.
+    """
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            return date.fromisoformat(value)
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+# Read queries, shared by the row-dict getters and their *_arrow variants.
+# Each returns (sql, parameters) ready for cursor.execute(*...)
+def _account_query(bsnid):
+    return f"""
+        SELECT bsnid, team, business_area, vp, admin, primary_it_partner,
+               azure_devops_links, artifacts_folder_links
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+        WHERE bsnid = ?
+    """, (bsnid,)
+
+def _account_use_cases_query(bsnid):
+    return f"""
+        SELECT use_case_id, platform, problem, solution, author, created_at
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases
+        WHERE account_bsnid = ?
+        ORDER BY created_at DESC
+    """, (bsnid,)
+
+def _account_updates_query(bsnid):
+    return f"""
+        SELECT update_id, author, platform, description, update_date, created_at
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates
+        WHERE account_bsnid = ?
+        ORDER BY update_date DESC, created_at DESC
+    """, (bsnid,)
+
+def _platform_status_query(bsnid):
+    return f"""
+        SELECT platform, status, enablement_tier
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_platforms_status
+        WHERE account_bsnid = ?
+    """, (bsnid,)
+
+def _all_accounts_query():
+    return f"""
+        SELECT bsnid, team, business_area, vp, admin, primary_it_partner
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+        ORDER BY team
+    """, ()
+
+def _all_use_cases_query():
+    return f"""
+        SELECT u.use_case_id, u.account_bsnid, a.team, u.platform, u.problem, u.solution,
+               u.author, u.created_at
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases u
+        JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
+        ORDER BY u.created_at DESC
+    """, ()
+
+def _all_updates_query():
+    return f"""
+        SELECT u.update_id, u.account_bsnid, a.team, u.author, u.platform, u.description,
+               u.update_date, u.created_at
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates u
+        JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
+        ORDER BY u.update_date DESC, u.created_at DESC
+    """, ()
+
+@query_cache.cached("accounts")
+@instrumented
 def get_account_by_bsnid(bsnid):
     """Get account details by BSNID"""
     conn = get_databricks_connection()
     if not conn:
-        return None
+        return _query_failed(None)
     
     try:
         with conn.cursor() as cursor:
-            query = f"""
-                SELECT bsnid, team, business_area, vp, admin, primary_it_partner,
-                       azure_devops_links, artifacts_folder_links
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
-                WHERE bsnid = '{bsnid}'
-            """
-            cursor.execute(query)
+            cursor.execute(*_account_query(bsnid))
             result = cursor.fetchone()
             
             if result:
-                return {
-                    'bsnid': result[0],
-                    'team': result[1],
-                    'business_area': result[2],
-                    'vp': result[3],
-                    'admin': result[4],
-                    'primary_it_partner': result[5],
-                    'azure_devops_links': result[6].split(',') if result[6] else [],
-                    'artifacts_folder_links': result[7].split(',') if result[7] else []
-                }
+                return _account_from_row(result)
             return None
     except Exception as e:
-        return None
+        return _query_failed(None)
 
+@query_cache.cached("use_cases")
+@instrumented
 def get_account_use_cases(bsnid):
     """Get use cases for an account"""
     conn = get_databricks_connection()
     if not conn:
-        return []
+        return _query_failed([])
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"""
-                SELECT use_case_id, platform, problem, solution, author, created_at
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases
-                WHERE account_bsnid = '{bsnid}'
-                ORDER BY created_at DESC
-            """)
+            cursor.execute(*_account_use_cases_query(bsnid))
             results = cursor.fetchall()
             
-            use_cases = []
-            for row in results:
-                use_cases.append({
-                    'use_case_id': row[0],
-                    'platform': row[1],
-                    'problem': row[2],
-                    'solution': row[3],
-                    'author': row[4],
-                    'created_at': row[5]
-                })
-            return use_cases
+            return [_account_use_case_from_row(row) for row in results]
     except Exception:
-        return []
+        return _query_failed([])
 
+@query_cache.cached("updates")
+@instrumented
 def get_account_updates(bsnid):
     """Get updates for an account"""
     conn = get_databricks_connection()
     if not conn:
-        return []
+        return _query_failed([])
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"""
-                SELECT update_id, author, platform, description, update_date, created_at
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates
-                WHERE account_bsnid = '{bsnid}'
-                ORDER BY update_date DESC, created_at DESC
-            """)
+            cursor.execute(*_account_updates_query(bsnid))
             results = cursor.fetchall()
             
-            updates = []
-            for row in results:
-                updates.append({
-                    'update_id': row[0],
-                    'author': row[1],
-                    'platform': row[2],
-                    'description': row[3],
-                    'update_date': row[4],
-                    'created_at': row[5]
-                })
-            return updates
+            return [_account_update_from_row(row) for row in results]
     except Exception:
-        return []
+        return _query_failed([])
 
+@query_cache.cached("platform_status")
+@instrumented
 def get_platform_status(bsnid):
     """Get platform status for an account"""
     conn = get_databricks_connection()
     if not conn:
-        return {}
+        return _query_failed({})
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"""
-                SELECT platform, status, enablement_tier
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_platforms_status
-                WHERE account_bsnid = '{bsnid}'
-            """)
+            cursor.execute(*_platform_status_query(bsnid))
             results = cursor.fetchall()
             
             platforms = {}
@@ -214,8 +361,122 @@ def get_platform_status(bsnid):
                 }
             return platforms
     except Exception:
-        return {}
+        return _query_failed({})
 
+@query_cache.cached("account_bundle")
+@instrumented
+def get_account_bundle(bsnid):
+    """Get account details, platform status, use cases and updates in a single round trip"""
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed(None)
+    
+    # One UNION ALL statement with a record-kind discriminator; every value is cast to
+    # STRING so the four differently shaped result sets share one column layout
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT 'account' AS kind, bsnid AS c1, team AS c2, business_area AS c3, vp AS c4,
+                       admin AS c5, primary_it_partner AS c6, azure_devops_links AS c7,
+                       artifacts_folder_links AS c8, NULL AS sort1, NULL AS sort2
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+                WHERE bsnid = ?
+                UNION ALL
+                SELECT 'platform', platform, status, enablement_tier, NULL, NULL, NULL, NULL, NULL,
+                       NULL, NULL
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_platforms_status
+                WHERE account_bsnid = ?
+                UNION ALL
+                SELECT 'use_case', use_case_id, platform, problem, solution, author,
+                       CAST(created_at AS STRING), NULL, NULL, CAST(created_at AS STRING), NULL
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases
+                WHERE account_bsnid = ?
+                UNION ALL
+                SELECT 'update', update_id, author, platform, description,
+                       CAST(update_date AS STRING), CAST(created_at AS STRING), NULL, NULL,
+                       CAST(update_date AS STRING), CAST(created_at AS STRING)
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates
+                WHERE account_bsnid = ?
+                ORDER BY kind, sort1 DESC, sort2 DESC
+            """, (bsnid, bsnid, bsnid, bsnid))
+            results = cursor.fetchall()
+    except Exception:
+        return _query_failed(None)
+    
+    bundle = None
+    platform_status, use_cases, updates = {}, [], []
+    for row in results:
+        kind, values = row[0], row[1:9]
+        if kind == 'account':
+            bundle = AccountBundle(account=_account_from_row(values))
+        elif kind == 'platform':
+            platform_status[values[0]] = {
+                'status': values[1],
+                'enablement_tier': values[2]
+            }
+        elif kind == 'use_case':
+            use_cases.append(_account_use_case_from_row(
+                values[:5] + (_parse_timestamp(values[5]),)
+            ))
+        elif kind == 'update':
+            updates.append(_account_update_from_row(
+                values[:4] + (_parse_timestamp(values[4]), _parse_timestamp(values[5]))
+            ))
+    
+    if bundle is None:
+        return None
+    bundle.platform_status = platform_status
+    bundle.use_cases = use_cases
+    bundle.updates = updates
+    return bundle
+
+@instrumented
+def get_account_samples(limit=10):
+    """Get a few (bsnid, team) pairs for connection diagnostics"""
+    conn = get_databricks_connection()
+    if not conn:
+        return []
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT bsnid, team FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+                LIMIT {int(limit)}
+            """)
+            return cursor.fetchall()
+    except Exception:
+        record_error()
+        return []
+
+def _invalidate_use_cases(*account_bsnids):
+    """Evict cached reads that include the given accounts' use cases"""
+    for account_bsnid in account_bsnids:
+        get_account_use_cases.invalidate(account_bsnid)
+        get_account_use_cases_arrow.invalidate(account_bsnid)
+        get_account_bundle.invalidate(account_bsnid)
+    # Listing-wide entries scan the cache, so they are evicted once per write
+    get_all_use_cases.invalidate()
+    get_all_use_cases_arrow.invalidate()
+    get_system_stats.invalidate()
+    query_cache.invalidate_entity("use_case_pages")
+    get_filter_options.invalidate('use_cases', 'platform')
+    get_filter_options.invalidate('use_cases', 'author')
+
+def _invalidate_updates(*account_bsnids):
+    """Evict cached reads that include the given accounts' updates"""
+    for account_bsnid in account_bsnids:
+        get_account_updates.invalidate(account_bsnid)
+        get_account_updates_arrow.invalidate(account_bsnid)
+        get_account_bundle.invalidate(account_bsnid)
+    # Listing-wide entries scan the cache, so they are evicted once per write
+    get_all_updates.invalidate()
+    get_all_updates_arrow.invalidate()
+    get_system_stats.invalidate()
+    query_cache.invalidate_entity("update_pages")
+    get_filter_options.invalidate('updates', 'platform')
+    get_filter_options.invalidate('updates', 'author')
+
+@instrumented
 def add_use_case(account_bsnid, platform, problem, solution, author):
     """Add a new use case"""
     conn = get_databricks_connection()
@@ -228,13 +489,15 @@ def add_use_case(account_bsnid, platform, problem, solution, author):
             cursor.execute(f"""
                 INSERT INTO {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases
                 (use_case_id, account_bsnid, platform, problem, solution, author, created_at, updated_at)
-                VALUES ('{use_case_id}', '{account_bsnid}', '{platform}', '{problem}', '{solution}', 
-                        '{author}', current_timestamp(), current_timestamp())
-            """)
+                VALUES (?, ?, ?, ?, ?, ?, current_timestamp(), current_timestamp())
+            """, (use_case_id, account_bsnid, platform, problem, solution, author))
+        _invalidate_use_cases(account_bsnid)
         return True
     except Exception:
+        record_error()
         return False
 
+@instrumented
 def add_update(account_bsnid, author, platform, description, update_date):
     """Add a new update"""
     conn = get_databricks_connection()
@@ -247,26 +510,152 @@ def add_update(account_bsnid, author, platform, description, update_date):
             cursor.execute(f"""
                 INSERT INTO {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates
                 (update_id, account_bsnid, author, platform, description, update_date, created_at)
-                VALUES ('{update_id}', '{account_bsnid}', '{author}', '{platform}', '{description}', 
-                        '{update_date}', current_timestamp())
-            """)
+                VALUES (?, ?, ?, ?, ?, ?, current_timestamp())
+            """, (update_id, account_bsnid, author, platform, description, update_date))
+        _invalidate_updates(account_bsnid)
         return True
     except Exception:
+        record_error()
         return False
 
+def _insert_bulk(table, columns, rows, batch_size):
+    """Insert rows into a CRM table in multi-row batches, returning how many were written"""
+    conn = get_databricks_connection()
+    if not conn or not rows:
+        return 0
+
+    batch_size = get_batch_size(batch_size)
+    inserted = 0
+    try:
+        with conn.cursor() as cursor:
+            # One statement per batch so a failure reports exactly how many rows landed
+            for start in range(0, len(rows), batch_size):
+                inserted += insert_rows(
+                    cursor, f"{CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_{table}",
+                    rows[start:start + batch_size], columns=columns, batch_size=batch_size
+                )
+    except Exception as e:
+        record_error()
+        st.error(f"Bulk insert into {table} stopped after {inserted} rows: {str(e)}")
+    return inserted
+
+def _join_links(links):
+    """Store a list of links as the comma-separated string the accounts table uses"""
+    if isinstance(links, (list, tuple)):
+        return ",".join(links)
+    return links or ""
+
+@instrumented
+def add_accounts_bulk(accounts, batch_size=None):
+    """Add many accounts in batched INSERTs; returns the number of accounts written
+
+    An account's created_at, if given, is kept (as is updated_at); otherwise both are now.
+    """
+    now = datetime.now()
+    rows = [
+        (a['bsnid'], a['team'], a['business_area'], a.get('vp', ''), a.get('admin', ''),
+         a.get('primary_it_partner', ''), _join_links(a.get('azure_devops_links')),
+         _join_links(a.get('artifacts_folder_links')), created_at, created_at)
+        for a in accounts
+        for created_at in [a.get('created_at') or now]
+    ]
+    inserted = _insert_bulk(
+        "accounts",
+        ("bsnid", "team", "business_area", "vp", "admin", "primary_it_partner",
+         "azure_devops_links", "artifacts_folder_links", "created_at", "updated_at"),
+        rows, batch_size
+    )
+    if inserted:
+        # Lookups that previously found nothing for these BSNIDs must be re-read
+        for row in rows[:inserted]:
+            get_account_by_bsnid.invalidate(row[0])
+            get_account_by_bsnid_arrow.invalidate(row[0])
+            get_account_bundle.invalidate(row[0])
+        get_all_accounts.invalidate()
+        get_all_accounts_arrow.invalidate()
+        get_system_stats.invalidate()
+        query_cache.invalidate_entity("account_pages")
+        query_cache.invalidate_entity("filter_options")
+    return inserted
+
+@instrumented
+def add_use_cases_bulk(use_cases, batch_size=None):
+    """Add many use cases in batched INSERTs; returns the number of use cases written
+
+    A use case's created_at, if given, is kept (as is updated_at); otherwise both are now.
+    """
+    now = datetime.now()
+    rows = [
+        (str(uuid.uuid4()), u['account_bsnid'], u['platform'], u['problem'], u['solution'],
+         u['author'], created_at, created_at)
+        for u in use_cases
+        for created_at in [u.get('created_at') or now]
+    ]
+    inserted = _insert_bulk(
+        "use_cases",
+        ("use_case_id", "account_bsnid", "platform", "problem", "solution", "author",
+         "created_at", "updated_at"),
+        rows, batch_size
+    )
+    if inserted:
+        _invalidate_use_cases(*{row[1] for row in rows[:inserted]})
+    return inserted
+
+@instrumented
+def add_updates_bulk(updates, batch_size=None):
+    """Add many updates in batched INSERTs; returns the number of updates written
+
+    An update's created_at, if given, is kept; otherwise it is now.
+    """
+    now = datetime.now()
+    rows = [
+        (str(uuid.uuid4()), u['account_bsnid'], u['author'], u['platform'], u['description'],
+         u['update_date'], u.get('created_at') or now)
+        for u in updates
+    ]
+    inserted = _insert_bulk(
+        "updates",
+        ("update_id", "account_bsnid", "author", "platform", "description", "update_date", "created_at"),
+        rows, batch_size
+    )
+    if inserted:
+        _invalidate_updates(*{row[1] for row in rows[:inserted]})
+    return inserted
+
+@instrumented
+def add_platform_statuses_bulk(statuses, batch_size=None):
+    """Add many platform statuses in batched INSERTs; returns the number of statuses written"""
+    now = datetime.now()
+    rows = [
+        (str(uuid.uuid4()), s['account_bsnid'], s['platform'], s['status'],
+         s.get('enablement_tier', ''), now, now)
+        for s in statuses
+    ]
+    inserted = _insert_bulk(
+        "platforms_status",
+        ("platform_id", "account_bsnid", "platform", "status", "enablement_tier",
+         "created_at", "updated_at"),
+        rows, batch_size
+    )
+    for bsnid in {row[1] for row in rows[:inserted]}:
+        get_platform_status.invalidate(bsnid)
+        get_platform_status_arrow.invalidate(bsnid)
+        get_account_bundle.invalidate(bsnid)
+    if inserted:
+        get_system_stats.invalidate()
+    return inserted
+
+@query_cache.cached("accounts")
+@instrumented
 def get_all_accounts():
     """Get all accounts"""
     conn = get_databricks_connection()
     if not conn:
-        return []
+        return _query_failed([])
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"""
-                SELECT bsnid, team, business_area, vp, admin, primary_it_partner
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
-                ORDER BY team
-            """)
+            cursor.execute(*_all_accounts_query())
             results = cursor.fetchall()
             
             accounts = []
@@ -282,23 +671,19 @@ def get_all_accounts():
             return accounts
     except Exception as e:
         st.error(f"Database query error: {str(e)}")
-        return []
+        return _query_failed([])
 
+@query_cache.cached("use_cases")
+@instrumented
 def get_all_use_cases():
     """Get all use cases"""
     conn = get_databricks_connection()
     if not conn:
-        return []
+        return _query_failed([])
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"""
-                SELECT u.use_case_id, u.account_bsnid, a.team, u.platform, u.problem, u.solution, 
-                       u.author, u.created_at
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases u
-                JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
-                ORDER BY u.created_at DESC
-            """)
+            cursor.execute(*_all_use_cases_query())
             results = cursor.fetchall()
             
             use_cases = []
@@ -315,23 +700,19 @@ def get_all_use_cases():
                 })
             return use_cases
     except Exception:
-        return []
+        return _query_failed([])
 
+@query_cache.cached("updates")
+@instrumented
 def get_all_updates():
     """Get all updates"""
     conn = get_databricks_connection()
     if not conn:
-        return []
+        return _query_failed([])
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(f"""
-                SELECT u.update_id, u.account_bsnid, a.team, u.author, u.platform, u.description, 
-                       u.update_date, u.created_at
-                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates u
-                JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
-                ORDER BY u.update_date DESC, u.created_at DESC
-            """)
+            cursor.execute(*_all_updates_query())
             results = cursor.fetchall()
             
             updates = []
@@ -348,4 +729,357 @@ def get_all_updates():
                 })
             return updates
     except Exception:
-        return []
\ No newline at end of file
+        return _query_failed([])
+
+# Keyset-paginated listings. Each call returns a Page whose next_token resumes
+# strictly after the last row served, using the same ORDER BY as the full listings
+# plus the primary key as a tie-breaker, so pages stay stable as rows are added.
+def _fetch_page(query, params, limit, sort_key):
+    """Run a page query that selects limit + 1 rows and wrap the result in a Page"""
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed(Page())
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return make_page(cursor.fetchall(), limit, sort_key)
+    except Exception:
+        return _query_failed(Page())
+
+# Trigram index over the cached account list; when that list is refreshed only the
+# accounts that were added, changed or removed are re-indexed
+_account_index = TrigramIndex()
+_account_index_records = {}
+_account_index_source = None
+_account_index_lock = threading.Lock()
+
+def _get_account_index():
+    """Return (accounts by bsnid, index) for the current cached account list"""
+    global _account_index_records, _account_index_source
+    accounts = get_all_accounts()
+    with _account_index_lock:
+        if accounts is not _account_index_source:
+            records = {account['bsnid']: account for account in accounts}
+            for bsnid in _account_index_records.keys() - records.keys():
+                _account_index.remove(bsnid)
+            for bsnid, account in records.items():
+                if _account_index_records.get(bsnid) != account:
+                    _account_index.add(bsnid, account)
+            _account_index_records, _account_index_source = records, accounts
+        return _account_index_records, _account_index
+
+@instrumented
+def search_accounts(search_term, limit=None):
+    """Search accounts by team, business area, VP, admin, or IT partner, best matches first
+
+    Served from an in-process trigram index, so typing a search term does not scan the
+    warehouse; misspelt terms still find close matches.
+    """
+    accounts, index = _get_account_index()
+    return [accounts[bsnid] for bsnid, _ in index.search(search_term, limit)]
+
+def _search_accounts_page(search_term, page_token, limit):
+    """Page through ranked search hits, keyed by (-score, team, bsnid)"""
+    accounts, index = _get_account_index()
+    hits = sorted(
+        (-score, accounts[bsnid]['team'] or "", bsnid)
+        for bsnid, score in index.search(search_term)
+    )
+    start = bisect.bisect_right(hits, tuple(decode_page_token(page_token))) if page_token else 0
+    page = make_page(hits[start:start + limit + 1], limit, lambda key: key)
+    page.rows = [accounts[key[2]] for key in page.rows]
+    return page
+
+@query_cache.cached("account_pages")
+@instrumented
+def get_accounts_page(search_term="", page_token=None, limit=DEFAULT_PAGE_SIZE):
+    """Get one page of accounts ordered by team, or by relevance when searching"""
+    if search_term:
+        return _search_accounts_page(search_term, page_token, limit)
+
+    # team is nullable, and a NULL would make every keyset comparison NULL and end the
+    # listing early, so NULL teams sort (and page) as empty strings
+    conditions, params = [], []
+    if page_token:
+        last_team, last_bsnid = decode_page_token(page_token)
+        conditions.append("(COALESCE(team, '') > ? OR (COALESCE(team, '') = ? AND bsnid > ?))")
+        params.extend([last_team, last_team, last_bsnid])
+    
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"""
+        SELECT bsnid, team, business_area, vp, admin, primary_it_partner
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+        {where}
+        ORDER BY COALESCE(team, ''), bsnid
+        LIMIT {int(limit) + 1}
+    """
+    page = _fetch_page(query, params, limit, lambda row: (row[1] or '', row[0]))
+    page.rows = [{
+        'bsnid': row[0],
+        'team': row[1],
+        'business_area': row[2],
+        'vp': row[3],
+        'admin': row[4],
+        'primary_it_partner': row[5]
+    } for row in page.rows]
+    return page
+
+# Filterable columns of the use case and update listings, keyed by ListingFilter field
+USE_CASE_FILTER_COLUMNS = {
+    'business_area': 'a.business_area',
+    'platform': 'u.platform',
+    'author': 'u.author'
+}
+UPDATE_FILTER_COLUMNS = {
+    'business_area': 'a.business_area',
+    'platform': 'u.platform',
+    'author': 'u.author'
+}
+
+def _listing_where(filters, columns, keyset_condition=None, keyset_params=()):
+    """Combine a ListingFilter and an optional keyset condition into a WHERE clause"""
+    conditions, params = [], []
+    if filters is not None:
+        filter_clause, filter_params = filters.to_sql(columns)
+        if filter_clause:
+            conditions.append(filter_clause)
+            params.extend(filter_params)
+    if keyset_condition:
+        conditions.append(f"({keyset_condition})")
+        params.extend(keyset_params)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+@query_cache.cached("use_case_pages")
+@instrumented
+def get_use_cases_page(page_token=None, limit=DEFAULT_PAGE_SIZE, filters=None):
+    """Get one page of use cases, newest first, restricted by an optional ListingFilter"""
+    keyset_condition, keyset_params = None, ()
+    if page_token:
+        last_created_at, last_id = decode_page_token(page_token)
+        keyset_condition = "u.created_at < ? OR (u.created_at = ? AND u.use_case_id < ?)"
+        keyset_params = (last_created_at, last_created_at, last_id)
+    where, params = _listing_where(filters, USE_CASE_FILTER_COLUMNS, keyset_condition, keyset_params)
+    
+    query = f"""
+        SELECT u.use_case_id, u.account_bsnid, a.team, a.business_area, u.platform, u.problem,
+               u.solution, u.author, u.created_at
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases u
+        JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
+        {where}
+        ORDER BY u.created_at DESC, u.use_case_id DESC
+        LIMIT {int(limit) + 1}
+    """
+    page = _fetch_page(query, params, limit, lambda row: (row[8], row[0]))
+    page.rows = [{
+        'use_case_id': row[0],
+        'account_bsnid': row[1],
+        'team': row[2],
+        'business_area': row[3],
+        'platform': row[4],
+        'problem': row[5],
+        'solution': row[6],
+        'author': row[7],
+        'created_at': row[8]
+    } for row in page.rows]
+    return page
+
+@query_cache.cached("update_pages")
+@instrumented
+def get_updates_page(page_token=None, limit=DEFAULT_PAGE_SIZE, filters=None):
+    """Get one page of updates, most recent update date first, restricted by an optional ListingFilter"""
+    keyset_condition, keyset_params = None, ()
+    if page_token:
+        last_date, last_created_at, last_id = decode_page_token(page_token)
+        keyset_condition = """u.update_date < ?
+               OR (u.update_date = ? AND u.created_at < ?)
+               OR (u.update_date = ? AND u.created_at = ? AND u.update_id < ?)"""
+        keyset_params = (last_date, last_date, last_created_at, last_date, last_created_at, last_id)
+    where, params = _listing_where(filters, UPDATE_FILTER_COLUMNS, keyset_condition, keyset_params)
+    
+    query = f"""
+        SELECT u.update_id, u.account_bsnid, a.team, a.business_area, u.author, u.platform,
+               u.description, u.update_date, u.created_at
+        FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates u
+        JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
+        {where}
+        ORDER BY u.update_date DESC, u.created_at DESC, u.update_id DESC
+        LIMIT {int(limit) + 1}
+    """
+    page = _fetch_page(query, params, limit, lambda row: (row[7], row[8], row[0]))
+    page.rows = [{
+        'update_id': row[0],
+        'account_bsnid': row[1],
+        'team': row[2],
+        'business_area': row[3],
+        'author': row[4],
+        'platform': row[5],
+        'description': row[6],
+        'update_date': row[7],
+        'created_at': row[8]
+    } for row in page.rows]
+    return page
+
+@query_cache.cached("filter_options")
+@instrumented
+def get_filter_options(listing, field):
+    """Get the distinct values of a filterable field for the 'use_cases' or 'updates' listing"""
+    columns = {'use_cases': USE_CASE_FILTER_COLUMNS, 'updates': UPDATE_FILTER_COLUMNS}[listing]
+    if field not in columns:
+        raise ValueError(f"Filtering on '{field}' is not supported for {listing}")
+    
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed([])
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT DISTINCT {columns[field]}
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_{listing} u
+                JOIN {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts a ON u.account_bsnid = a.bsnid
+                WHERE {columns[field]} IS NOT NULL
+                ORDER BY 1
+            """)
+            return [row[0] for row in cursor.fetchall()]
+    except Exception:
+        return _query_failed([])
+
+@query_cache.cached("stats")
+@instrumented
+def get_system_stats():
+    """Get all table counts and the accounts-per-business-area breakdown in a single round trip"""
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed(None)
+    
+    # The first row carries the totals as scalar subqueries; the remaining rows are the
+    # GROUP BY breakdown, so an empty accounts table still reports the other counts
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT 'total' AS kind, NULL AS business_area,
+                       (SELECT COUNT(*) FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts) AS accounts,
+                       (SELECT COUNT(*) FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_use_cases) AS use_cases,
+                       (SELECT COUNT(*) FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_updates) AS updates,
+                       (SELECT COUNT(*) FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_platforms_status) AS platform_statuses,
+                       (SELECT COUNT(DISTINCT business_area) FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts) AS business_areas
+                UNION ALL
+                SELECT 'business_area', business_area, COUNT(*), NULL, NULL, NULL, NULL
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+                GROUP BY business_area
+            """)
+            results = cursor.fetchall()
+    except Exception:
+        return _query_failed(None)
+    
+    stats = SystemStats()
+    for row in results:
+        if row[0] == 'total':
+            stats.accounts, stats.use_cases, stats.updates, stats.platform_statuses, stats.business_areas = row[2:7]
+        else:
+            stats.accounts_by_business_area.append((row[1], row[2]))
+    stats.accounts_by_business_area.sort(key=lambda item: item[1], reverse=True)
+    return stats
+
+@query_cache.cached("accounts")
+@instrumented
+def get_it_partner_assignments():
+    """Get the distinct (business area, primary IT partner) pairs, ordered by business area"""
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed(None)
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT DISTINCT business_area, primary_it_partner
+                FROM {CATALOG_NAME}.{SCHEMA_NAME}.{TABLE_PREFIX}_accounts
+                ORDER BY business_area
+            """)
+            return [tuple(row) for row in cursor.fetchall()]
+    except Exception:
+        return _query_failed(None)
+
+@query_cache.cached("tables")
+@instrumented
+def get_crm_tables():
+    """Get the names of the CRM tables in the configured schema from information_schema"""
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed(None)
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT table_name 
+                FROM information_schema.tables 
+                WHERE table_schema = '{SCHEMA_NAME}' 
+                AND table_name LIKE '{TABLE_PREFIX}_%'
+            """)
+            return [row[0] for row in cursor.fetchall()]
+    except Exception:
+        return _query_failed(None)
+
+# Arrow variants of the read API. These return a pyarrow.Table straight from
+# fetchall_arrow() without building a dict per row, so pages can hand them to
+# st.dataframe or filter them with pyarrow.compute. An empty table is returned
+# when the database is unavailable.
+def _empty_table():
+    import pyarrow as pa  # Deferred: only needed when there is no result to return
+    return pa.table({})
+
+def _fetch_arrow(query, params):
+    """Run a read query and return the result as a pyarrow.Table"""
+    conn = get_databricks_connection()
+    if not conn:
+        return _query_failed(_empty_table())
+    
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall_arrow()
+    except Exception:
+        return _query_failed(_empty_table())
+
+@query_cache.cached("accounts")
+@instrumented
+def get_account_by_bsnid_arrow(bsnid):
+    """Get account details by BSNID as an Arrow table (zero or one row)"""
+    return _fetch_arrow(*_account_query(bsnid))
+
+@query_cache.cached("use_cases")
+@instrumented
+def get_account_use_cases_arrow(bsnid):
+    """Get use cases for an account as an Arrow table"""
+    return _fetch_arrow(*_account_use_cases_query(bsnid))
+
+@query_cache.cached("updates")
+@instrumented
+def get_account_updates_arrow(bsnid):
+    """Get updates for an account as an Arrow table"""
+    return _fetch_arrow(*_account_updates_query(bsnid))
+
+@query_cache.cached("platform_status")
+@instrumented
+def get_platform_status_arrow(bsnid):
+    """Get platform status for an account as an Arrow table"""
+    return _fetch_arrow(*_platform_status_query(bsnid))
+
+@query_cache.cached("accounts")
+@instrumented
+def get_all_accounts_arrow():
+    """Get all accounts as an Arrow table"""
+    return _fetch_arrow(*_all_accounts_query())
+
+@query_cache.cached("use_cases")
+@instrumented
+def get_all_use_cases_arrow():
+    """Get all use cases as an Arrow table"""
+    return _fetch_arrow(*_all_use_cases_query())
+
+@query_cache.cached("updates")
+@instrumented
+def get_all_updates_arrow():
+    """Get all updates as an Arrow table"""
+    return _fetch_arrow(*_all_updates_query())
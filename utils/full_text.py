@@ -0,0 +1,178 @@
+"""
+In-process full-text search for use case and update text
+A positional inverted index ranks documents with BM25, answers quoted phrase queries
+and cuts highlighted snippets, so free-text search never scans the long text columns
+"""
+
+import math
+import re
+from collections import defaultdict
+
+# BM25 term-frequency saturation and document-length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Characters of context in a snippet
+SNIPPET_WIDTH = 160
+
+_TOKEN = re.compile(r"\w+")
+_PHRASE = re.compile(r'"([^"]*)"')
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return _TOKEN.findall(str(text or "").lower())
+
+
+def parse_query(query):
+    """Split a query into (terms, phrases); quoted text is a phrase, everything else loose terms"""
+    phrases = [tokens for tokens in (tokenize(p) for p in _PHRASE.findall(query or "")) if tokens]
+    terms = tokenize(_PHRASE.sub(" ", query or ""))
+    # Single-word phrases behave exactly like terms
+    terms += [tokens[0] for tokens in phrases if len(tokens) == 1]
+    phrases = [tokens for tokens in phrases if len(tokens) > 1]
+    return list(dict.fromkeys(terms)), phrases
+
+
+class FullTextIndex:
+    """BM25-ranked positional index over selected text fields of records keyed by id
+
+    A document matches when it contains every quoted phrase and, if the query has
+    loose terms, at least one of them. Phrases never span two fields.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._postings = defaultdict(dict)  # token -> {id: [positions]}
+        self._texts = {}  # id -> tuple of field texts, for snippets and removal
+        self._lengths = {}  # id -> number of tokens
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._texts
+
+    def _positions(self, texts):
+        """Map each token to its positions, leaving a gap between fields"""
+        positions = defaultdict(list)
+        offset = 0
+        for text in texts:
+            tokens = tokenize(text)
+            for i, token in enumerate(tokens):
+                positions[token].append(offset + i)
+            offset += len(tokens) + 1
+        return positions, offset - len(texts)
+
+    def add(self, doc_id, record):
+        """Index a record, replacing any previous version with the same id"""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+
+        texts = tuple(str(record.get(field) or "") for field in self.fields)
+        positions, length = self._positions(texts)
+        for token, token_positions in positions.items():
+            self._postings[token][doc_id] = token_positions
+
+        self._texts[doc_id] = texts
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id):
+        """Drop a record from the index if present"""
+        texts = self._texts.pop(doc_id, None)
+        if texts is None:
+            return
+        positions, _ = self._positions(texts)
+        for token in positions:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+        self._total_length -= self._lengths.pop(doc_id)
+
+    def _phrase_matches(self, tokens):
+        """Ids containing the tokens at consecutive positions"""
+        postings = [self._postings.get(token) for token in tokens]
+        if not all(postings):
+            return set()
+        candidates = set(min(postings, key=len)).intersection(*postings)
+        matches = set()
+        for doc_id in candidates:
+            following = [set(p[doc_id]) for p in postings[1:]]
+            if any(all(start + i + 1 in positions for i, positions in enumerate(following))
+                   for start in postings[0][doc_id]):
+                matches.add(doc_id)
+        return matches
+
+    def _bm25(self, tokens, candidates):
+        """BM25 score of each candidate for the given tokens"""
+        count = len(self._texts)
+        average_length = self._total_length / count if count else 0.0
+        scores = dict.fromkeys(candidates, 0.0)
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id in candidates:
+                positions = postings.get(doc_id)
+                if positions:
+                    frequency = len(positions)
+                    norm = 1 - BM25_B + BM25_B * self._lengths[doc_id] / (average_length or 1)
+                    scores[doc_id] += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+        return scores
+
+    def search(self, query, limit=None):
+        """Return up to limit (id, score) pairs for a query, best first"""
+        terms, phrases = parse_query(query)
+        if not terms and not phrases:
+            return []
+
+        candidates = None
+        for tokens in phrases:
+            matches = self._phrase_matches(tokens)
+            candidates = matches if candidates is None else candidates & matches
+        if terms:
+            with_terms = set().union(*(self._postings.get(term, {}).keys() for term in terms))
+            candidates = with_terms if candidates is None else candidates & with_terms
+        if not candidates:
+            return []
+
+        scores = self._bm25(terms + [token for tokens in phrases for token in tokens], candidates)
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return ranked[:limit] if limit else ranked
+
+    def snippet(self, doc_id, query, width=SNIPPET_WIDTH):
+        """Return (field, text) around the first match in a document, with matches in **bold**
+
+        Falls back to the start of the first non-empty field when nothing matches.
+        """
+        texts = self._texts.get(doc_id)
+        if texts is None:
+            return None, ""
+
+        terms, phrases = parse_query(query)
+        alternatives = [r"\W+".join(map(re.escape, tokens)) for tokens in phrases]
+        alternatives += [re.escape(term) for term in terms]
+        pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE) if alternatives else None
+
+        for field, text in zip(self.fields, texts):
+            match = pattern.search(text) if pattern else None
+            if match is None:
+                continue
+            start = max(0, match.start() - width // 3)
+            if start:
+                # Start the window on a word boundary
+                space = text.find(" ", start)
+                start = space + 1 if 0 <= space < match.start() else start
+            end = min(len(text), start + width)
+            window = pattern.sub(lambda m: f"**{m.group(0)}**", text[start:end])
+            return field, f"{'…' if start else ''}{window}{'…' if end < len(text) else ''}"
+
+        for field, text in zip(self.fields, texts):
+            if text:
+                return field, text[:width] + ("…" if len(text) > width else "")
+        return None, ""
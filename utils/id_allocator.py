@@ -0,0 +1,137 @@
+"""
+Block-reserving ID allocator
+Sequence numbers are reserved from a small counter table a block at a time and then
+handed out from memory, so generating an ID does not depend on the size of the table
+it is used in
+"""
+
+import random
+import threading
+import time
+
+from utils.config import get_config
+
+# Sequence numbers reserved per round trip to the counter table
+DEFAULT_BLOCK_SIZE = 20
+# Attempts at reserving a block before giving up under contention
+MAX_RESERVE_ATTEMPTS = 8
+
+
+class IdAllocationError(Exception):
+    """Raised when a block of IDs cannot be reserved from the counter table"""
+
+
+def create_sequence_table(cursor, table):
+    """Create the counter table holding the next free value of each named sequence"""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            name STRING,
+            next_value BIGINT
+        )
+    """)
+
+
+class IdAllocator:
+    """Thread-safe allocator handing out values of one named sequence
+
+    get_pool() must return an object with a cursor() context manager (the connection
+    pool). seed_query, if given, returns the highest value already in use and is run
+    once when the sequence row does not exist yet. Reservation is a compare-and-swap
+    UPDATE on the counter row, retried with backoff, so concurrent sessions and
+    processes never receive the same value. Values reserved but not used before the
+    process exits are skipped. Duplicate counter rows (left by writers that predate
+    the MERGE seed) are tolerated: the highest value wins and lower rows are removed.
+    """
+
+    def __init__(self, get_pool, table, name, seed_query=None, block_size=None):
+        self._get_pool = get_pool
+        self.table = table
+        self.name = name
+        self.seed_query = seed_query
+        self.block_size = block_size or get_config().id_block_size or DEFAULT_BLOCK_SIZE
+        if self.block_size < 1:
+            raise ValueError(f"Invalid block size: {self.block_size}")
+
+        self._lock = threading.Lock()
+        self._next = 0
+        self._limit = 0  # Exclusive end of the reserved block
+        self.blocks_reserved = 0
+        self.conflicts = 0
+
+    def _read_next_value(self, cursor):
+        """Get the sequence's next free value, or None if it has no row yet
+
+        Should the sequence have several rows, the highest value is the only safe one,
+        so the lower rows are deleted to stop them being read again.
+        """
+        cursor.execute(f"SELECT MAX(next_value), COUNT(*) FROM {self.table} WHERE name = ?", (self.name,))
+        row = cursor.fetchone()
+        if row is None or row[0] is None:
+            return None
+        current = int(row[0])
+        if row[1] > 1:
+            cursor.execute(f"DELETE FROM {self.table} WHERE name = ? AND next_value < ?", (self.name, current))
+        return current
+
+    def _seed(self, cursor):
+        """Insert the sequence row, starting after the highest value already in use"""
+        start = 1
+        if self.seed_query:
+            cursor.execute(self.seed_query)
+            row = cursor.fetchone()
+            if row and row[0] is not None:
+                start = int(row[0]) + 1
+        # MERGE checks and inserts in one atomic statement; INSERT ... WHERE NOT EXISTS
+        # lets two processes starting together both insert a row
+        cursor.execute(f"""
+            MERGE INTO {self.table} AS sequences
+            USING (SELECT ? AS name, ? AS next_value) AS seed
+            ON sequences.name = seed.name
+            WHEN NOT MATCHED THEN INSERT (name, next_value) VALUES (seed.name, seed.next_value)
+        """, (self.name, start))
+
+    def _reserve_block(self):
+        """Claim the next block_size values from the counter table; returns its first value"""
+        pool = self._get_pool()
+        if pool is None:
+            raise IdAllocationError("No database connection available")
+
+        for attempt in range(MAX_RESERVE_ATTEMPTS):
+            try:
+                with pool.cursor() as cursor:
+                    current = self._read_next_value(cursor)
+                    if current is None:
+                        self._seed(cursor)
+                        current = self._read_next_value(cursor)
+
+                    # Only succeeds if nobody moved the counter since we read it. Rows
+                    # duplicating the current value all move together in this one
+                    # statement, so any matched row means the block is ours
+                    cursor.execute(f"""
+                        UPDATE {self.table} SET next_value = ?
+                        WHERE name = ? AND next_value = ?
+                    """, (current + self.block_size, self.name, current))
+                    row = cursor.fetchone()
+                    if row is not None and row[0] >= 1:
+                        self.blocks_reserved += 1
+                        return current
+            except Exception:
+                # Concurrent writers to the counter table can also surface as commit conflicts
+                if attempt == MAX_RESERVE_ATTEMPTS - 1:
+                    raise
+            self.conflicts += 1
+            time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+
+        raise IdAllocationError(
+            f"Could not reserve IDs for sequence '{self.name}' after {MAX_RESERVE_ATTEMPTS} attempts"
+        )
+
+    def next_value(self):
+        """Return the next unused value of the sequence"""
+        with self._lock:
+            if self._next >= self._limit:
+                self._next = self._reserve_block()
+                self._limit = self._next + self.block_size
+            value = self._next
+            self._next += 1
+            return value
@@ -0,0 +1,211 @@
+"""
+Latency and volume instrumentation for data-access functions
+Each decorated function records a latency histogram, rows and bytes returned and an
+error count in a process-wide registry that the Admin Performance tab renders
+"""
+
+import contextvars
+import dataclasses
+import functools
+import math
+import threading
+import time
+from datetime import date, datetime
+
+# Latency histogram buckets grow geometrically from 10 microseconds, which keeps
+# percentile estimates within ~5% while using a fixed amount of memory per function
+BUCKET_START_MS = 0.01
+BUCKET_GROWTH = 1.1
+BUCKET_COUNT = 200
+
+# Records measured when estimating the size of a large list result
+BYTES_SAMPLE_SIZE = 100
+
+# Per-call state letting a function that swallows its own exceptions report a failure
+_current_call = contextvars.ContextVar('instrumented_call', default=None)
+
+
+def record_error():
+    """Count the instrumented call in progress as failed even though it returned normally"""
+    state = _current_call.get()
+    if state is not None:
+        state['failed'] = True
+
+
+class LatencyHistogram:
+    """Fixed-size log-bucketed histogram of latencies in milliseconds"""
+
+    def __init__(self):
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        if ms <= BUCKET_START_MS:
+            index = 0
+        else:
+            index = min(BUCKET_COUNT - 1, int(math.log(ms / BUCKET_START_MS, BUCKET_GROWTH)) + 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min(self.max_ms, BUCKET_START_MS * BUCKET_GROWTH ** index)
+        return self.max_ms
+
+
+def _payload_bytes(value):
+    """Approximate size of the data carried by a result, ignoring Python object overhead"""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (bool, int, float, datetime, date)):
+        return 8
+    if hasattr(value, 'nbytes') and hasattr(value, 'num_rows'):  # pyarrow.Table
+        return int(value.nbytes)
+    if hasattr(value, 'memory_usage'):  # pandas.DataFrame
+        return int(value.memory_usage(index=False, deep=True).sum())
+    if isinstance(value, dict):
+        return sum(_payload_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)) and len(value) > BYTES_SAMPLE_SIZE:
+        # Extrapolate from evenly spaced records so large results stay cheap to measure
+        step = len(value) / BYTES_SAMPLE_SIZE
+        sample = sum(_payload_bytes(value[int(i * step)]) for i in range(BYTES_SAMPLE_SIZE))
+        return int(sample * step)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(_payload_bytes(item) for item in value)
+    if dataclasses.is_dataclass(value):
+        return sum(_payload_bytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    return 0
+
+
+def _row_count(value):
+    """Number of records in a result; an int result (e.g. rows inserted) counts as itself"""
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, int):
+        return value
+    if hasattr(value, 'num_rows'):
+        return int(value.num_rows)
+    if isinstance(value, (list, tuple)) or hasattr(value, 'memory_usage'):
+        return len(value)
+    if isinstance(value, dict):
+        return 1
+    if dataclasses.is_dataclass(value):
+        if isinstance(getattr(value, 'rows', None), list):  # pagination.Page
+            return len(value.rows)
+        # One record plus any record lists it carries (e.g. an account bundle)
+        items = [getattr(value, f.name) for f in dataclasses.fields(value)]
+        return 1 + sum(len(item) for item in items if isinstance(item, list))
+    return 0
+
+
+class FunctionStats:
+    """Counters and latency histogram for one instrumented function"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self, name):
+        return {
+            'function': name,
+            'calls': self.calls,
+            'errors': self.errors,
+            'p50_ms': self.latency.percentile(0.50),
+            'p95_ms': self.latency.percentile(0.95),
+            'p99_ms': self.latency.percentile(0.99),
+            'max_ms': self.latency.max_ms,
+            'total_ms': self.latency.total_ms,
+            'rows': self.rows,
+            'bytes': self.bytes
+        }
+
+
+class Instrumentation:
+    """Thread-safe registry of per-function call metrics"""
+
+    def __init__(self):
+        self._functions = {}
+        self._lock = threading.Lock()
+        self._observers = []
+
+    def add_observer(self, observer):
+        """Call observer(name, elapsed_ms) after each outermost instrumented call
+
+        Nested instrumented calls are not reported separately, so observers can sum
+        elapsed times without double counting.
+        """
+        self._observers.append(observer)
+
+    def record(self, name, elapsed_ms, rows=0, nbytes=0, failed=False):
+        with self._lock:
+            stats = self._functions.get(name)
+            if stats is None:
+                stats = self._functions[name] = FunctionStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.rows += rows
+            stats.bytes += nbytes
+            stats.latency.add(elapsed_ms)
+
+    def _finish(self, name, outermost, elapsed_ms, rows=0, nbytes=0, failed=False):
+        self.record(name, elapsed_ms, rows, nbytes, failed)
+        if outermost:
+            for observer in self._observers:
+                observer(name, elapsed_ms)
+
+    def stats(self):
+        """Return one metrics dict per function, slowest total time first"""
+        with self._lock:
+            snapshots = [stats.snapshot(name) for name, stats in self._functions.items()]
+        return sorted(snapshots, key=lambda s: s['total_ms'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._functions.clear()
+
+    def instrumented(self, func):
+        """Decorator recording latency, rows, bytes and failures of every call
+
+        Place it under @query_cache.cached so the numbers describe executed data
+        access rather than cache hits.
+        """
+        name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state = {'failed': False}
+            outermost = _current_call.get() is None
+            token = _current_call.set(state)
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                self._finish(name, outermost, (time.perf_counter() - started) * 1000, failed=True)
+                raise
+            finally:
+                _current_call.reset(token)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._finish(name, outermost, elapsed_ms, _row_count(result), _payload_bytes(result),
+                         state['failed'])
+            return result
+        return wrapper
+
+
+instrumentation = Instrumentation()
+instrumented = instrumentation.instrumented
@@ -0,0 +1,45 @@
+"""
+Lazily loaded tab data
+st.tabs runs every tab body on every rerun, so a page that picks its visible tab with a
+radio can skip the hidden ones; these helpers keep what an opened tab loaded in session
+state, so switching back to it costs nothing until the user refreshes it.
+"""
+
+from datetime import datetime
+
+import streamlit as st
+
+_STATE_KEY = 'lazy_tabs'
+
+
+def tab_data(tab, load):
+    """Get a tab's data, calling load() only the first time the tab is opened in this session
+
+    A None result is not kept, so a failed load is retried on the next run.
+    """
+    loaded = st.session_state.setdefault(_STATE_KEY, {})
+    if tab not in loaded:
+        data = load()
+        if data is None:
+            return None
+        loaded[tab] = {'data': data, 'loaded_at': datetime.now()}
+    return loaded[tab]['data']
+
+
+def refresh_tab(tab, *sources):
+    """Forget a tab's data and evict the cached queries it came from, so it reloads on the next run"""
+    st.session_state.get(_STATE_KEY, {}).pop(tab, None)
+    for source in sources:
+        source.invalidate()
+
+
+def refresh_control(tab, *sources):
+    """Show when a tab's data was loaded, with a Refresh button that reloads it from the warehouse"""
+    loaded = st.session_state.get(_STATE_KEY, {}).get(tab)
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        if loaded:
+            st.caption(f"Loaded at {loaded['loaded_at'].strftime('%H:%M:%S')}")
+    with col2:
+        st.button("Refresh", key=f"refresh_{tab}", on_click=refresh_tab, args=(tab, *sources),
+                  use_container_width=True)
@@ -0,0 +1,208 @@
+"""
+Local stand-in for a Databricks SQL warehouse
+An in-process DuckDB database answering the same statements the data managers send to
+Databricks, through the same connection and cursor API, so data access can be
+exercised and benchmarked without a workspace.
+
+Set LOCAL_SQL_DATABASE (":memory:" or a file path) to make get_connection_pool() use
+it instead of Databricks, and LOCAL_SQL_LATENCY_MS / LOCAL_SQL_JITTER_MS to add a
+simulated network delay to every round trip.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+
+from utils.config import get_config
+
+# Databricks-only syntax rewritten before a statement reaches DuckDB
+_REWRITES = (
+    (re.compile(r"\bcurrent_timestamp\s*\(\s*\)", re.IGNORECASE), "current_timestamp"),
+    (re.compile(r"\bUSING\s+DELTA\b", re.IGNORECASE), ""),
+)
+_CREATE_CATALOG = re.compile(r"^\s*CREATE\s+CATALOG\s+(IF\s+NOT\s+EXISTS\s+)?(\w+)\s*;?\s*$", re.IGNORECASE)
+_THREE_PART_NAME = re.compile(r"\b([A-Za-z_]\w*)\.([A-Za-z_]\w*)\.([A-Za-z_]\w*)\b")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+def _translate(operation):
+    for pattern, replacement in _REWRITES:
+        operation = pattern.sub(replacement, operation)
+    return operation
+
+
+class LocalCursor:
+    """Cursor over one DuckDB connection, mirroring databricks.sql Cursor
+
+    execute() is one round trip to the warehouse; fetches read the result it returned.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._result = None
+        self.open = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def description(self):
+        return self._result.description if self._result is not None else None
+
+    def execute(self, operation, parameters=None):
+        self._connection.round_trip()
+        catalog = _CREATE_CATALOG.match(operation)
+        if catalog:
+            self._connection.warehouse.attach(catalog.group(2))
+            self._result = None
+            return self
+
+        self._connection.warehouse.prepare(operation)
+        self._result = self._connection.duckdb.execute(_translate(operation), list(parameters or ()))
+        return self
+
+    def executemany(self, operation, seq_of_parameters):
+        for parameters in seq_of_parameters:
+            self.execute(operation, parameters)
+        return self
+
+    def _require_result(self):
+        if self._result is None:
+            raise RuntimeError("No result set: execute() a query first")
+        return self._result
+
+    def fetchone(self):
+        return self._require_result().fetchone()
+
+    def fetchmany(self, size=1):
+        return self._require_result().fetchmany(size)
+
+    def fetchall(self):
+        return self._require_result().fetchall()
+
+    def fetchall_arrow(self):
+        return self._require_result().fetch_arrow_table()
+
+    def close(self):
+        self._result = None
+        self.open = False
+
+
+class LocalConnection:
+    """Connection to a LocalWarehouse, mirroring databricks.sql Connection
+
+    Opening the connection and every statement it executes sleep for latency_ms plus
+    up to jitter_ms, like a session and a round trip to a remote warehouse would.
+    """
+
+    def __init__(self, warehouse, latency_ms=0.0, jitter_ms=0.0):
+        self.warehouse = warehouse
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.round_trips = 0
+        self.round_trip()
+        self.duckdb = warehouse.database.cursor()
+        self.open = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def round_trip(self):
+        """Account for one request to the warehouse, sleeping for the simulated latency"""
+        self.round_trips += 1
+        delay_ms = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def cursor(self):
+        if not self.open:
+            raise RuntimeError("Connection is closed")
+        return LocalCursor(self)
+
+    def close(self):
+        if self.open:
+            self.duckdb.close()
+            self.open = False
+
+
+class LocalWarehouse:
+    """An in-memory (or file-backed) DuckDB database shared by all its connections
+
+    Three-part names (catalog.schema.table) work as on Databricks: a catalog is an
+    attached database, and catalogs and schemas referenced by a statement are created
+    on first use. Catalogs of a file-backed warehouse are stored next to its file as
+    <name>.<catalog>.duckdb, so they persist across restarts.
+    """
+
+    def __init__(self, path=":memory:"):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("The local SQL warehouse requires duckdb (pip install duckdb)") from e
+
+        self.path = path
+        self.database = duckdb.connect(path)
+        self._lock = threading.Lock()
+        self._catalogs = {
+            row[0] for row in self.database.execute("SELECT database_name FROM duckdb_databases()").fetchall()
+        }
+        self._schemas = set()
+
+    def attach(self, catalog):
+        """Create a catalog if it does not exist yet"""
+        with self._lock:
+            if catalog not in self._catalogs:
+                location = ":memory:"
+                if self.path != ":memory:":
+                    location = f"{os.path.splitext(self.path)[0]}.{catalog}.duckdb"
+                self.database.execute(f"ATTACH IF NOT EXISTS '{location}' AS {catalog}")
+                self._catalogs.add(catalog)
+
+    def prepare(self, operation):
+        """Create the catalogs and schemas referenced by three-part names in a statement"""
+        for catalog, schema, _ in _THREE_PART_NAME.findall(_STRING_LITERAL.sub("''", operation)):
+            if (catalog, schema) in self._schemas:
+                continue
+            self.attach(catalog)
+            with self._lock:
+                self.database.execute(f"CREATE SCHEMA IF NOT EXISTS {catalog}.{schema}")
+                self._schemas.add((catalog, schema))
+
+    def connect(self, latency_ms=0.0, jitter_ms=0.0):
+        return LocalConnection(self, latency_ms, jitter_ms)
+
+    def close(self):
+        self.database.close()
+
+
+_warehouses = {}
+_warehouses_lock = threading.Lock()
+
+
+def connect(database=None, latency_ms=None, jitter_ms=None):
+    """Open a connection to a local warehouse, like databricks.sql.connect()
+
+    Connections to the same database share one process-wide LocalWarehouse. Arguments
+    left as None come from the configured LOCAL_SQL_DATABASE (default ":memory:"),
+    LOCAL_SQL_LATENCY_MS and LOCAL_SQL_JITTER_MS.
+    """
+    config = get_config()
+    database = database or config.local_sql_database or ":memory:"
+    if latency_ms is None:
+        latency_ms = config.local_sql_latency_ms
+    if jitter_ms is None:
+        jitter_ms = config.local_sql_jitter_ms
+
+    with _warehouses_lock:
+        warehouse = _warehouses.get(database)
+        if warehouse is None:
+            warehouse = _warehouses[database] = LocalWarehouse(database)
+    return warehouse.connect(latency_ms, jitter_ms)
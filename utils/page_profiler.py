@@ -0,0 +1,191 @@
+"""
+Opt-in per-rerun profiler for Streamlit pages
+Records, for every rerun of a page, the total script time split into data access and
+rendering, the number of elements sent to the browser and the widget that triggered
+the rerun. Runs are kept per session in a ring buffer shown in a sidebar panel.
+
+Enable with PAGE_PROFILER=1 in the environment or by opening a page with ?profile=1.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.config import get_config
+from utils.instrumentation import instrumentation
+
+# Reruns kept per session
+PROFILE_HISTORY = 50
+
+_STATE_KEY = 'page_profiler'
+
+# Profile of the rerun executing on the current script thread
+_active = threading.local()
+
+
+def _record_data_time(name, elapsed_ms):
+    profile = getattr(_active, 'profile', None)
+    if profile is not None:
+        profile['data_ms'] += elapsed_ms
+        profile['data_calls'] += 1
+
+
+instrumentation.add_observer(_record_data_time)
+
+
+class _ElementCounter:
+    """Wraps a script run context's outgoing message queue to count rendered elements"""
+
+    def __init__(self, enqueue):
+        self._enqueue = enqueue
+        self.elements = 0
+        self.last_sent = None
+        self.widget_labels = {}  # widget id -> "type: label", shared with the session's profiler state
+
+    def __call__(self, msg):
+        if msg.HasField('delta') and msg.delta.HasField('new_element'):
+            self.elements += 1
+            element = msg.delta.new_element
+            kind = element.WhichOneof('type')
+            proto = getattr(element, kind, None) if kind else None
+            if getattr(proto, 'id', None):
+                self.widget_labels[proto.id] = f"{kind}: {getattr(proto, 'label', '')}"
+        self.last_sent = time.perf_counter()
+        self._enqueue(msg)
+
+
+def _element_counter(ctx, widget_labels):
+    """Install (once per context) and reset the element counter for this rerun"""
+    counter = getattr(ctx, '_enqueue', None)
+    if counter is None:
+        return None
+    if not isinstance(counter, _ElementCounter):
+        counter = _ElementCounter(counter)
+        ctx._enqueue = counter
+    counter.elements = 0
+    counter.last_sent = None
+    counter.widget_labels = widget_labels
+    return counter
+
+
+def _widget_snapshot(ctx):
+    """Serialized value of every widget that has one, keyed by widget id"""
+    try:
+        states = ctx.session_state.get_widget_states()
+    except Exception:
+        return {}
+    # Buttons only hold True for the run they fire; their reset must not count as a trigger
+    return {w.id: w.SerializeToString() for w in states
+            if not (w.WhichOneof('value') == 'trigger_value' and not w.trigger_value)}
+
+
+def profiler_enabled():
+    """Check whether profiling was opted into via PAGE_PROFILER or ?profile=1"""
+    if get_config().page_profiler:
+        return True
+    if st.query_params.get("profile") == "1":
+        st.session_state.page_profiler_enabled = True
+    return st.session_state.get('page_profiler_enabled', False)
+
+
+def _close_run(profile, counter, completed):
+    """Turn an in-progress profile into a history record"""
+    if completed:
+        ended = time.perf_counter()
+    else:
+        # The script stopped early (st.rerun, st.stop, switch_page): last output is the best end
+        ended = counter.last_sent if counter and counter.last_sent else profile['started']
+    total_ms = (ended - profile['started']) * 1000
+    return {
+        'run': profile['run'],
+        'page': profile['page'],
+        'started_at': profile['started_at'],
+        'total_ms': round(total_ms, 2),
+        'data_ms': round(profile['data_ms'], 2),
+        'render_ms': round(max(0.0, total_ms - profile['data_ms']), 2),
+        'data_calls': profile['data_calls'],
+        'elements': counter.elements if counter else None,
+        'trigger': profile['trigger'],
+        'completed': completed
+    }
+
+
+def start_page_profile(page):
+    """Begin profiling this rerun of a page; returns None when profiling is off
+
+    Call right after st.set_page_config and pass the result to finish_page_profile at
+    the end of the script.
+    """
+    if not profiler_enabled():
+        return None
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+
+    state = st.session_state.setdefault(_STATE_KEY, {
+        'history': deque(maxlen=PROFILE_HISTORY), 'runs': 0, 'open': None,
+        'page': None, 'widgets': {}, 'labels': {}
+    })
+    if state['open'] is not None:
+        # The previous rerun never reached finish_page_profile
+        state['history'].append(_close_run(state['open'], state['open']['counter'], False))
+
+    widgets = _widget_snapshot(ctx)
+    changed = [widget_id for widget_id, value in widgets.items() if state['widgets'].get(widget_id) != value]
+    if state['page'] != page:
+        trigger = "page opened"
+    elif changed:
+        trigger = ", ".join(state['labels'].get(widget_id, widget_id) for widget_id in changed)
+    else:
+        trigger = "rerun"
+    state['page'], state['widgets'] = page, widgets
+
+    state['runs'] += 1
+    profile = {
+        'run': state['runs'],
+        'page': page,
+        'started': time.perf_counter(),
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'data_ms': 0.0,
+        'data_calls': 0,
+        'trigger': trigger,
+        'counter': _element_counter(ctx, state['labels'])
+    }
+    state['open'] = profile
+    _active.profile = profile
+    return profile
+
+
+def finish_page_profile(profile):
+    """Record a completed rerun and render the profiler panel in the sidebar"""
+    if profile is None:
+        return
+    _active.profile = None
+    state = st.session_state[_STATE_KEY]
+    state['open'] = None
+    record = _close_run(profile, profile['counter'], True)
+    state['history'].append(record)
+
+    history = list(reversed(state['history']))
+    with st.sidebar.expander("⏱️ Page profiler"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Total", f"{record['total_ms']:.0f} ms")
+            st.metric("Elements", record['elements'] if record['elements'] is not None else "n/a")
+        with col2:
+            st.metric("Data", f"{record['data_ms']:.0f} ms")
+            st.metric("Render", f"{record['render_ms']:.0f} ms")
+        st.caption(f"Triggered by: {record['trigger']}")
+        st.dataframe(history, hide_index=True)
+        st.download_button(
+            "Export JSON",
+            data=json.dumps(history, indent=2),
+            file_name="page_profile.json",
+            mime="application/json",
+            key="page_profiler_export"
+        )
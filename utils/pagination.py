@@ -0,0 +1,109 @@
+"""
+Keyset pagination helpers
+Page tokens encode the sort key of the last row served, so the next page starts
+strictly after it regardless of rows inserted in the meantime
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, date
+
+import streamlit as st
+
+DEFAULT_PAGE_SIZE = 50
+
+
+@dataclass
+class Page:
+    """One page of rows plus the token for the following page (None on the last page)"""
+    rows: list = field(default_factory=list)
+    next_token: str = None
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+    return value
+
+
+def encode_page_token(key_values):
+    """Encode the sort key of the last row on a page as an opaque, URL-safe token"""
+    payload = json.dumps([_encode_value(value) for value in key_values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_page_token(token):
+    """Decode a page token back into the sort key values it was built from"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+    return tuple(_decode_value(value) for value in payload)
+
+
+def make_page(rows, limit, sort_key):
+    """Build a Page from up to limit + 1 fetched rows, deriving the next token from the last row kept"""
+    if len(rows) <= limit:
+        return Page(rows=list(rows))
+    rows = list(rows[:limit])
+    return Page(rows=rows, next_token=encode_page_token(sort_key(rows[-1])))
+
+
+# Page sizes offered by paged tables
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+
+
+def load_page(state_key, listing_key, fetch_page):
+    """Fetch only the page the user is on for a paged table
+
+    fetch_page(page_token) must return a Page. The tokens of the pages visited so far
+    are kept in session state under state_key, so going back does not walk the listing
+    again; the position resets to the first page whenever listing_key (e.g. the search
+    term and page size) changes. Returns (page, page_number starting at 1).
+    """
+    state = st.session_state.get(state_key)
+    if state is None or state['listing_key'] != listing_key:
+        state = {'listing_key': listing_key, 'tokens': [None]}
+        st.session_state[state_key] = state
+    return fetch_page(state['tokens'][-1]), len(state['tokens'])
+
+
+def next_page(state_key, page):
+    """Move a paged table to the page after the given one on the next rerun"""
+    if state_key in st.session_state and page.next_token is not None:
+        st.session_state[state_key]['tokens'].append(page.next_token)
+
+
+def previous_page(state_key):
+    """Move a paged table back one page on the next rerun"""
+    if state_key in st.session_state and len(st.session_state[state_key]['tokens']) > 1:
+        st.session_state[state_key]['tokens'].pop()
+
+
+def page_controls(state_key, page, page_number):
+    """Render Previous / Page N / Next under a paged table
+
+    The buttons move the listing in click callbacks, so inside a fragment only the
+    fragment reruns.
+    """
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("← Previous", key=f"{state_key}_previous", disabled=page_number == 1,
+                  use_container_width=True, on_click=previous_page, args=(state_key,))
+    with col2:
+        st.markdown(f"<div style='text-align: center'>Page {page_number}</div>", unsafe_allow_html=True)
+    with col3:
+        st.button("Next →", key=f"{state_key}_next", disabled=page.next_token is None,
+                  use_container_width=True, on_click=next_page, args=(state_key, page))
@@ -0,0 +1,186 @@
+"""
+Process-wide read-through cache for warehouse queries
+Entries are keyed by function and arguments and expire after a per-entity TTL
+"""
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from utils.config import get_config
+
+# Seconds each kind of entity stays cached; override with QUERY_CACHE_TTL_<ENTITY>
+DEFAULT_TTLS = {
+    'accounts': 300,
+    'platform_status': 300,
+    'use_cases': 60,
+    'updates': 60,
+    'account_bundle': 60,
+    'account_pages': 300,
+    'use_case_pages': 60,
+    'update_pages': 60,
+    'filter_options': 600,
+    'tables': 600,
+    'stats': 30
+}
+DEFAULT_TTL = 60
+MAX_ENTRIES = 2048
+
+# Per-call flag that lets a data function opt its current result out of caching
+_current_call = contextvars.ContextVar('query_cache_current_call', default=None)
+
+
+def mark_uncacheable():
+    """Keep the result of the cached call in progress (and any cached caller) out of the cache"""
+    state = _current_call.get()
+    if state is not None:
+        state['cacheable'] = False
+
+
+@contextlib.contextmanager
+def track_uncacheable():
+    """Yield a flag dict whose 'cacheable' turns False if a cached call inside the block fails
+
+    Lets callers outside the cache (warmup, scripts) tell a failed query's fallback result
+    apart from a genuinely empty one.
+    """
+    state = {'cacheable': True}
+    token = _current_call.set(state)
+    try:
+        yield state
+    finally:
+        _current_call.reset(token)
+
+
+class QueryCache:
+    """Thread-safe TTL cache with hit/miss counters"""
+
+    def __init__(self, ttls=None, max_entries=MAX_ENTRIES):
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, entity, value)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0, 'expirations': 0}
+        self._entity_counters = {}
+
+    def ttl_for(self, entity):
+        """Return the TTL in seconds for an entity, honouring environment overrides"""
+        override = get_config().cache_ttls.get(entity)
+        if override is not None:
+            return override
+        return self.ttls.get(entity, DEFAULT_TTL)
+
+    def _count(self, entity, outcome):
+        self._counters[outcome] += 1
+        counters = self._entity_counters.setdefault(entity, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+    def get(self, key, entity):
+        """Return (found, value) for a key, counting the lookup as a hit or miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._count(entity, 'hits')
+                    return True, entry[2]
+                del self._entries[key]
+                self._counters['expirations'] += 1
+            self._count(entity, 'misses')
+            return False, None
+
+    def set(self, key, entity, value, ttl=None):
+        """Store a value until its entity TTL elapses"""
+        ttl = self.ttl_for(entity) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entity, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        """Evict a single key; returns True if it was cached"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._counters['invalidations'] += 1
+                return True
+            return False
+
+    def invalidate_entity(self, entity):
+        """Evict every cached entry belonging to an entity"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[1] == entity]
+            for key in keys:
+                del self._entries[key]
+            self._counters['invalidations'] += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Evict everything"""
+        with self._lock:
+            self._counters['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """Return overall and per-entity hit/miss counters"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['entities'] = {entity: dict(counters)
+                                 for entity, counters in self._entity_counters.items()}
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def cached(self, entity, ttl=None):
+        """Decorator caching a function's results by its arguments under an entity TTL
+
+        Cached values are shared between sessions and must be treated as read-only.
+        The wrapper gains an invalidate(*args, **kwargs) method that evicts exactly
+        the entry those arguments would produce.
+        """
+        def decorator(func):
+            signature = inspect.signature(func)
+            name = f"{func.__module__}.{func.__qualname__}"
+
+            def make_key(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return (name,) + tuple(bound.arguments.items())
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(*args, **kwargs)
+                found, value = self.get(key, entity)
+                if found:
+                    return value
+
+                state = {'cacheable': True}
+                parent = _current_call.get()
+                token = _current_call.set(state)
+                try:
+                    value = func(*args, **kwargs)
+                finally:
+                    _current_call.reset(token)
+
+                if state['cacheable']:
+                    self.set(key, entity, value, ttl)
+                elif parent is not None:
+                    parent['cacheable'] = False
+                return value
+
+            wrapper.cache_key = make_key
+            wrapper.invalidate = lambda *args, **kwargs: self.invalidate(make_key(*args, **kwargs))
+            return wrapper
+        return decorator
+
+
+query_cache = QueryCache()
@@ -0,0 +1,47 @@
+"""
+Structured filters for use case and update listings
+A ListingFilter compiles to a parameterized WHERE clause for the warehouse and can
+also be evaluated against in-memory records for the session store
+"""
+
+from dataclasses import dataclass, fields
+
+# Selectbox value meaning "no filter on this field"
+ALL = 'All'
+
+
+@dataclass(frozen=True)
+class ListingFilter:
+    """Equality filters on listing fields; a field left as None is not filtered"""
+    business_area: str = None
+    platform: str = None
+    author: str = None
+    status: str = None
+    enablement_tier: str = None
+
+    @classmethod
+    def from_selections(cls, **selections):
+        """Build a filter from selectbox values, treating 'All' as unfiltered"""
+        return cls(**{name: (None if value == ALL else value) for name, value in selections.items()})
+
+    def active(self):
+        """Return {field: value} for the fields that are filtered"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+
+    def to_sql(self, columns):
+        """Compile to (where_clause, params) using columns to map field names to SQL expressions
+
+        The clause is an empty string when nothing is filtered. Raises ValueError for a
+        filtered field that has no column in this listing.
+        """
+        conditions, params = [], []
+        for name, value in self.active().items():
+            if name not in columns:
+                raise ValueError(f"Filtering on '{name}' is not supported for this listing")
+            conditions.append(f"{columns[name]} = ?")
+            params.append(value)
+        return " AND ".join(conditions), params
+
+    def matches(self, get_value):
+        """Check an in-memory record, where get_value(field) returns the record's value for a field"""
+        return all(get_value(name) == value for name, value in self.active().items())
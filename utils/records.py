@@ -0,0 +1,137 @@
+"""
+Compact record types for the shared session store
+Accounts, use cases and updates are frozen slotted dataclasses instead of dicts: no
+per-record key table, categorical strings (statuses, platforms, tiers, business areas
+and people) interned so every record shares one copy, and use case and update ids are
+small integers instead of UUID strings. Records also read as read-only mappings
+(record['status'], record.get('team')), so pages written against dicts keep working;
+code on hot paths should use attributes.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+
+def category(value):
+    """Intern a categorical string so records holding it share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record(Mapping):
+    """Read-only mapping view of a record's fields"""
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, field):
+        if field in self._fields:
+            return getattr(self, field)
+        raise KeyError(field)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+def _record(cls):
+    cls = dataclass(frozen=True, slots=True, eq=False, repr=False)(cls)
+    cls._fields = tuple(field.name for field in fields(cls))
+    return cls
+
+
+@_record
+class Account(Record):
+    bsnid: str
+    team: str
+    business_area: str
+    vp: str
+    admin: str
+    primary_it_partner: str
+    azure_devops_links: tuple = ()
+    artifacts_folder_links: tuple = ()
+    platforms_status: dict = None
+    use_cases: tuple = ()
+    updates: tuple = ()
+    created_at: datetime = None
+
+
+@_record
+class UseCase(Record):
+    id: int
+    account_bsnid: str
+    problem: str
+    solution: str
+    leader: str
+    status: str
+    enablement_tier: str
+    platform: str
+    created_at: datetime
+
+
+@_record
+class Update(Record):
+    id: int
+    account_bsnid: str
+    author: str
+    date: datetime
+    platform: str
+    description: str
+    created_at: datetime
+
+
+def make_account(bsnid, team, business_area, vp, admin, primary_it_partner, platforms_status=None,
+                 azure_devops_links=(), artifacts_folder_links=(), use_cases=(), updates=(),
+                 created_at=None):
+    """Build an Account with its categorical fields interned"""
+    return Account(
+        bsnid=bsnid,
+        team=team,
+        business_area=category(business_area),
+        vp=category(vp),
+        admin=category(admin),
+        primary_it_partner=category(primary_it_partner),
+        azure_devops_links=tuple(azure_devops_links),
+        artifacts_folder_links=tuple(artifacts_folder_links),
+        platforms_status={category(platform): category(status)
+                          for platform, status in (platforms_status or {}).items()},
+        use_cases=tuple(use_cases),
+        updates=tuple(updates),
+        created_at=created_at or datetime.now()
+    )
+
+
+def make_use_case(use_case_id, account_bsnid, problem, solution, leader, status, enablement_tier,
+                  platform, created_at=None):
+    """Build a UseCase with its categorical fields interned"""
+    return UseCase(
+        id=use_case_id,
+        account_bsnid=account_bsnid,
+        problem=problem,
+        solution=solution,
+        leader=category(leader),
+        status=category(status),
+        enablement_tier=category(enablement_tier),
+        platform=category(platform),
+        created_at=created_at or datetime.now()
+    )
+
+
+def make_update(update_id, account_bsnid, author, date, platform, description, created_at=None):
+    """Build an Update with its categorical fields interned"""
+    return Update(
+        id=update_id,
+        account_bsnid=account_bsnid,
+        author=category(author),
+        date=date,
+        platform=category(platform),
+        description=description,
+        created_at=created_at or datetime.now()
+    )
+
@@ -0,0 +1,156 @@
+"""
+In-process trigram index for account search
+Lowercased copies of the searchable fields are computed once per account and their
+trigrams kept in an inverted index, so a search touches only accounts sharing trigrams
+with the term instead of lowercasing every field of every account
+"""
+
+import heapq
+from collections import Counter, defaultdict
+
+# Account fields covered by search
+ACCOUNT_SEARCH_FIELDS = ('team', 'business_area', 'vp', 'admin', 'primary_it_partner')
+
+# Minimum share of the term's trigrams an account must contain to count as a fuzzy match
+FUZZY_THRESHOLD = 0.4
+
+# Scores for exact matches, best first; fuzzy matches score their similarity (< 1)
+_SCORE_EQUAL = 4.0
+_SCORE_PREFIX = 3.0
+_SCORE_WORD_PREFIX = 2.0
+_SCORE_SUBSTRING = 1.0
+
+_SEPARATOR = "\x1f"
+
+
+def normalize(text):
+    """Lowercase and collapse whitespace, as stored in the shadow fields"""
+    return " ".join(str(text or "").split()).lower()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _padded_trigrams(text):
+    """Trigrams of text padded like pg_trgm, so word starts and ends carry weight"""
+    return _trigrams(f"  {text} ")
+
+
+def _shadow_trigrams(shadow):
+    """Padded trigrams of all fields; double spaces give every field its own start and end"""
+    return _padded_trigrams("  ".join(shadow))
+
+
+class TrigramIndex:
+    """Trigram inverted index over selected string fields of records keyed by id
+
+    search() returns (id, score) pairs, best first. A field equal to the term beats
+    one starting with it, which beats a word starting with it, which beats any
+    substring. Terms no record contains fall back to trigram similarity, which
+    tolerates typos.
+    """
+
+    def __init__(self, fields=ACCOUNT_SEARCH_FIELDS):
+        self.fields = tuple(fields)
+        self._postings = defaultdict(set)  # trigram -> set of ids
+        self._shadow = {}  # id -> tuple of normalized field values
+        self._joined = {}  # id -> normalized fields, each wrapped in separators
+        self._order = {}  # id -> insertion sequence, for stable tie-breaking
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._shadow)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._shadow
+
+    def add(self, doc_id, record):
+        """Index a record, replacing any previous version with the same id"""
+        if doc_id in self._shadow:
+            self.remove(doc_id)
+
+        shadow = tuple(normalize(record.get(field)) for field in self.fields)
+        postings = self._postings
+        for gram in _shadow_trigrams(shadow):
+            postings[gram].add(doc_id)
+
+        self._shadow[doc_id] = shadow
+        self._joined[doc_id] = f"{_SEPARATOR}{_SEPARATOR.join(shadow)}{_SEPARATOR}"
+        self._order[doc_id] = self._sequence
+        self._sequence += 1
+
+    def remove(self, doc_id):
+        """Drop a record from the index if present"""
+        shadow = self._shadow.get(doc_id)
+        if shadow is None:
+            return
+        for gram in _shadow_trigrams(shadow):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+        del self._shadow[doc_id], self._joined[doc_id], self._order[doc_id]
+
+    def _exact_scores(self, candidates, term):
+        """Score the candidates that contain the term, dropping those that do not"""
+        equal, prefix, word_prefix = f"{_SEPARATOR}{term}{_SEPARATOR}", f"{_SEPARATOR}{term}", f" {term}"
+        joined = self._joined
+        scores = {}
+        for doc_id in candidates:
+            text = joined[doc_id]
+            if term not in text:
+                continue
+            if equal in text:
+                scores[doc_id] = _SCORE_EQUAL
+            elif prefix in text:
+                scores[doc_id] = _SCORE_PREFIX
+            elif word_prefix in text:
+                scores[doc_id] = _SCORE_WORD_PREFIX
+            else:
+                scores[doc_id] = _SCORE_SUBSTRING
+        return scores
+
+    def _exact_candidates(self, term):
+        """Ids whose joined fields contain every trigram of the term (a superset of the matches)"""
+        if len(term) < 3:
+            return self._joined.keys()
+
+        postings = []
+        for gram in _trigrams(term):
+            ids = self._postings.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _fuzzy_matches(self, term):
+        """Ids sharing at least FUZZY_THRESHOLD of the term's padded trigrams, with their similarity"""
+        grams = _padded_trigrams(term)
+        if not grams:
+            return {}
+        counts = Counter()
+        for gram in grams:
+            counts.update(self._postings.get(gram, ()))
+        needed = FUZZY_THRESHOLD * len(grams)
+        return {doc_id: count / len(grams) for doc_id, count in counts.items() if count >= needed}
+
+    def search(self, term, limit=None):
+        """Return up to limit (id, score) pairs ranked best first; every record when term is blank"""
+        term = normalize(term)
+        if not term:
+            ids = sorted(self._order, key=self._order.get)
+            return [(doc_id, 0.0) for doc_id in (ids[:limit] if limit else ids)]
+
+        scores = self._exact_scores(self._exact_candidates(term), term)
+        if not scores and len(term) >= 3:
+            scores = self._fuzzy_matches(term)
+
+        rank = lambda doc_id: (-scores[doc_id], self._order[doc_id])
+        if limit:
+            ranked = heapq.nsmallest(limit, scores, key=rank)
+        else:
+            ranked = sorted(scores, key=rank)
+        return [(doc_id, scores[doc_id]) for doc_id in ranked]
@@ -0,0 +1,191 @@
+"""
+Process-wide store behind utils.data_manager
+Accounts, use cases, updates and the reference lists live here once per process instead
+of once per session, so sessions attach to them in O(1) and see each other's writes.
+Record maps are copy-on-write: a writer swaps in a new RecordMap that shares every
+unchanged entry with the previous one, so a session holding the previous map keeps a
+consistent snapshot for the rest of its run. The search indexes are updated in place and
+are read under the store's read lock.
+"""
+
+import itertools
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+# Reference data every session starts with
+DEFAULT_BUSINESS_AREAS = {
+    'Finance': 'John Smith',
+    'Marketing': 'Sarah Johnson',
+    'Operations': 'Mike Davis',
+    'HR': 'Lisa Brown'
+}
+DEFAULT_PLATFORMS = ['Databricks', 'Snowflake', 'Power Platform']
+DEFAULT_ONBOARDING_STATUSES = ['Requested', 'In Progress', 'Completed']
+DEFAULT_ENABLEMENT_TIERS = ['Tier 1', 'Tier 2', 'Tier 3', 'None']
+
+
+class ReadWriteLock:
+    """Any number of readers or a single writer; a waiting writer holds back new readers"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writer or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class RecordMap(Mapping):
+    """Immutable mapping whose with_item() shares all unchanged entries with the original
+
+    Entries live in a base dict that is never modified plus a small overlay of the
+    entries written since the base was built. with_item() copies only the overlay, and
+    folds it into a new base once it outgrows the square root of the base, so a write
+    costs O(sqrt(n)) amortised instead of a full copy. Iteration order matches a dict
+    that had the same writes applied.
+    """
+    __slots__ = ('_base', '_overlay', '_size')
+
+    def __init__(self, entries=()):
+        self._base = dict(entries)
+        self._overlay = {}
+        self._size = len(self._base)
+
+    @classmethod
+    def _from_parts(cls, base, overlay, size):
+        records = cls.__new__(cls)
+        records._base, records._overlay, records._size = base, overlay, size
+        return records
+
+    def with_item(self, key, value):
+        """A new map with key set to value; this map is left unchanged"""
+        base, overlay = self._base, self._overlay
+        size = self._size if key in self else self._size + 1
+        overlay = {**overlay, key: value}
+        if len(overlay) ** 2 > len(base):
+            base = {**base, **overlay}
+            overlay = {}
+        return RecordMap._from_parts(base, overlay, size)
+
+    def __getitem__(self, key):
+        overlay = self._overlay
+        if key in overlay:
+            return overlay[key]
+        return self._base[key]
+
+    def get(self, key, default=None):
+        overlay = self._overlay
+        if key in overlay:
+            return overlay[key]
+        return self._base.get(key, default)
+
+    def __contains__(self, key):
+        return key in self._overlay or key in self._base
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        if not self._overlay:
+            return iter(self._base)
+        return itertools.chain(self._base, (key for key in self._overlay if key not in self._base))
+
+    def values(self):
+        if not self._overlay:
+            return self._base.values()
+        return [value for _, value in self.items()]
+
+    def items(self):
+        base, overlay = self._base, self._overlay
+        if not overlay:
+            return base.items()
+        items = [(key, overlay.get(key, value)) for key, value in base.items()]
+        items.extend((key, value) for key, value in overlay.items() if key not in base)
+        return items
+
+
+class SharedStore:
+    """Record maps, reference lists and derived data shared by every session
+
+    Replace record maps with put() while holding lock.write(); never mutate a map or
+    record that sessions may already hold.
+    """
+
+    def __init__(self):
+        self.lock = ReadWriteLock()
+        self._load_lock = threading.Lock()
+        self.loaded = False
+        self.accounts = RecordMap()
+        self.use_cases = RecordMap()
+        self.updates = RecordMap()
+        self.business_areas = RecordMap(DEFAULT_BUSINESS_AREAS)
+        self.platforms = list(DEFAULT_PLATFORMS)
+        self.onboarding_statuses = list(DEFAULT_ONBOARDING_STATUSES)
+        self.enablement_tiers = list(DEFAULT_ENABLEMENT_TIERS)
+        # Use case and update ids; next() on a count is atomic under the GIL
+        self.ids = itertools.count(1)
+        # Derived from the records; built on first use and kept current by writers
+        self.filter_options = {}
+        self.account_index = None
+        self.use_case_text_index = None
+        self.update_text_index = None
+
+    def load(self, loader):
+        """Run loader() once per process; sessions arriving meanwhile wait for it to finish"""
+        if self.loaded:
+            return False
+        with self._load_lock:
+            if self.loaded:
+                return False
+            loader()
+            self.loaded = True
+            return True
+
+    def put(self, collection, key, value):
+        """Copy-on-write insert or replace of one entry in a record map (hold lock.write())"""
+        setattr(self, collection, getattr(self, collection).with_item(key, value))
+        # Filter option lists are derived from every record, so any write invalidates them
+        self.filter_options = {}
+
+    def index(self, name, build):
+        """Get a derived search index, building it with build() on first use"""
+        index = getattr(self, name)
+        if index is None:
+            with self.lock.write():
+                index = getattr(self, name)
+                if index is None:
+                    index = build()
+                    setattr(self, name, index)
+        return index
+
+
+shared_store = SharedStore()
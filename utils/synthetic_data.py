@@ -0,0 +1,321 @@
+"""
+Synthetic CRM data at production-like scale
+Generates accounts, platform statuses, use cases and updates with skewed business
+areas, Zipfian per-account activity, long-tail text lengths and a realistic status
+mix, in reproducible chunks that can be bulk-loaded into the session store, the
+Databricks tables used by database_manager (or the local stand-in behind
+LOCAL_SQL_DATABASE) and the edip_crm.main tables used by data_manager_databricks
+"""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from utils.bulk_insert import insert_rows
+from utils.records import make_account, make_update, make_use_case
+from utils.shared_store import RecordMap
+
+# Accounts generated (and loaded) per chunk
+DEFAULT_CHUNK_SIZE = 10_000
+
+# P(k) ~ 1 / k**exponent for k = 1..max; an account gets k - 1 records, so most have
+# none or a few and a handful have hundreds
+UPDATE_ZIPF_EXPONENT = 2.0
+MAX_UPDATES_PER_ACCOUNT = 500
+USE_CASE_ZIPF_EXPONENT = 2.5
+MAX_USE_CASES_PER_ACCOUNT = 50
+
+# Share of accounts per business area follows 1 / rank**exponent
+BUSINESS_AREA_ZIPF_EXPONENT = 1.1
+
+# Sentences per text field are log-normally distributed (median ~ e**mu)
+TEXT_SENTENCES_MU = 0.4
+TEXT_SENTENCES_SIGMA = 0.8
+MAX_TEXT_SENTENCES = 60
+
+# Accounts are created over this many days; activity is skewed towards recent dates
+HISTORY_DAYS = 3 * 365
+
+BUSINESS_AREAS = (
+    'Finance', 'Marketing', 'Operations', 'Sales', 'Technology', 'HR', 'Supply Chain',
+    'Legal', 'Customer Service', 'Research', 'Procurement', 'Risk', 'Compliance', 'Facilities'
+)
+PLATFORMS = ('Databricks', 'Snowflake', 'Power Platform')
+# (status, weight) of a platform an account has engaged with
+PLATFORM_STATUS_MIX = (('Completed', 0.45), ('In Progress', 0.30), ('Requested', 0.20), ('None', 0.05))
+# Probability that an account has a status row for each platform
+PLATFORM_ADOPTION = {'Databricks': 0.7, 'Snowflake': 0.45, 'Power Platform': 0.35}
+ENABLEMENT_TIER_MIX = (('Tier 1', 0.2), ('Tier 2', 0.35), ('Tier 3', 0.3), ('None', 0.15))
+USE_CASE_STATUS_MIX = (('Active', 0.35), ('Planning', 0.25), ('Completed', 0.3), ('On Hold', 0.1))
+
+_FIRST_NAMES = (
+    'Sarah', 'John', 'Mike', 'Lisa', 'Robert', 'Jennifer', 'David', 'Mark', 'Emily', 'James',
+    'Angela', 'Michael', 'Maria', 'Wei', 'Priya', 'Carlos', 'Fatima', 'Olga', 'Kenji', 'Amara'
+)
+_LAST_NAMES = (
+    'Smith', 'Johnson', 'Davis', 'Wang', 'Kim', 'Walsh', 'Rodriguez', 'Thompson', 'Chen', 'Brown',
+    'Lee', 'Wilson', 'Garcia', 'Patel', 'Nguyen', 'Okafor', 'Ivanova', 'Tanaka', 'Silva', 'Müller'
+)
+_TEAM_FUNCTIONS = (
+    'Analytics', 'Reporting', 'Data Engineering', 'Insights', 'Planning', 'Forecasting',
+    'Automation', 'Intelligence', 'Platform', 'Governance', 'Strategy', 'Operations'
+)
+_SUBJECTS = (
+    'Monthly reporting', 'The forecasting model', 'Data ingestion', 'The executive dashboard',
+    'Reconciliation', 'Customer segmentation', 'Inventory tracking', 'The ETL pipeline',
+    'Access provisioning', 'Data quality checking', 'The approval workflow', 'Spend analysis'
+)
+_PROBLEMS = (
+    'takes days of manual effort every cycle', 'relies on spreadsheets emailed between teams',
+    'breaks whenever an upstream schema changes', 'is too slow for the current data volume',
+    'produces numbers that do not match the source systems', 'has no audit trail',
+    'cannot be refreshed more than once a week', 'depends on a single analyst'
+)
+_SOLUTIONS = (
+    'Build an automated pipeline with scheduled refreshes', 'Move the workload to a shared lakehouse',
+    'Publish a governed semantic model for self-service reporting', 'Add data quality checks with alerting',
+    'Replace the manual steps with a low-code workflow', 'Train a forecasting model on historical data',
+    'Consolidate the sources into a single curated table', 'Expose the results through a dashboard'
+)
+_PROGRESS = (
+    'Kickoff meeting completed and requirements documented', 'Source connections established',
+    'First version of the pipeline deployed to development', 'User acceptance testing in progress',
+    'Dashboard deployed to production', 'Blocked on access to the source system',
+    'Performance tuning reduced the refresh time', 'Training session scheduled with the business users',
+    'Data quality issues found and raised with the data owners', 'Handed over to the support team'
+)
+
+
+@dataclass
+class CrmChunk:
+    """One chunk of generated records; every record references an account in the same chunk"""
+    accounts: list = field(default_factory=list)
+    platform_statuses: list = field(default_factory=list)
+    use_cases: list = field(default_factory=list)
+    updates: list = field(default_factory=list)
+
+
+def _zipf_weights(count, exponent):
+    return [1 / rank ** exponent for rank in range(1, count + 1)]
+
+
+class CrmDataGenerator:
+    """Reproducible generator of synthetic CRM records
+
+    Every account and its records come from a seed derived from the account number,
+    so any chunk can be regenerated on its own and the data does not depend on the
+    chunk size used to load it.
+    """
+
+    def __init__(self, accounts, seed=0, now=None):
+        self.accounts = accounts
+        self.seed = seed
+        self.now = now or datetime.now().replace(microsecond=0)
+
+        self.people = [f"{first} {last}" for first in _FIRST_NAMES for last in _LAST_NAMES]
+        self._area_weights = _zipf_weights(len(BUSINESS_AREAS), BUSINESS_AREA_ZIPF_EXPONENT)
+        # A few VPs and IT partners per business area, as in a real org chart
+        area_random = random.Random(seed)
+        self.vps = {area: area_random.sample(self.people, 3) for area in BUSINESS_AREAS}
+        self.it_partners = {area: area_random.sample(self.people, 2) for area in BUSINESS_AREAS}
+
+        self._update_counts = range(MAX_UPDATES_PER_ACCOUNT)
+        self._update_weights = _zipf_weights(MAX_UPDATES_PER_ACCOUNT, UPDATE_ZIPF_EXPONENT)
+        self._use_case_counts = range(MAX_USE_CASES_PER_ACCOUNT)
+        self._use_case_weights = _zipf_weights(MAX_USE_CASES_PER_ACCOUNT, USE_CASE_ZIPF_EXPONENT)
+        self._platform_statuses, self._platform_status_weights = zip(*PLATFORM_STATUS_MIX)
+        self._tiers, self._tier_weights = zip(*ENABLEMENT_TIER_MIX)
+        self._use_case_statuses, self._use_case_status_weights = zip(*USE_CASE_STATUS_MIX)
+
+    def bsnid(self, number):
+        return f"BSN{number:07d}"
+
+    def _text(self, rng, first, pool):
+        """A sentence starting with first, then a long-tail number of sentences from pool"""
+        sentences = min(MAX_TEXT_SENTENCES, int(rng.lognormvariate(TEXT_SENTENCES_MU, TEXT_SENTENCES_SIGMA)))
+        return " ".join([first] + [f"{rng.choice(pool)}." for _ in range(sentences)])
+
+    def _recent_date(self, rng, since):
+        """A time between since and now, skewed towards now"""
+        span = (self.now - since).total_seconds()
+        return self.now - timedelta(seconds=span * rng.random() ** 2)
+
+    def _account(self, rng, number, chunk):
+        area = rng.choices(BUSINESS_AREAS, self._area_weights)[0]
+        bsnid = self.bsnid(number)
+        created_at = self.now - timedelta(seconds=rng.uniform(0, HISTORY_DAYS * 86400))
+        chunk.accounts.append({
+            'bsnid': bsnid,
+            'team': f"{area} {rng.choice(_TEAM_FUNCTIONS)} {number}",
+            'business_area': area,
+            'vp': rng.choice(self.vps[area]),
+            'admin': rng.choice(self.people),
+            'primary_it_partner': rng.choice(self.it_partners[area]),
+            'azure_devops_links': [f"https://dev.azure.com/company/{bsnid.lower()}"] if rng.random() < 0.6 else [],
+            'artifacts_folder_links': (
+                [f"https://company.sharepoint.com/artifacts/{bsnid.lower()}"] if rng.random() < 0.4 else []
+            ),
+            'created_at': created_at
+        })
+
+        for platform in PLATFORMS:
+            if rng.random() < PLATFORM_ADOPTION[platform]:
+                chunk.platform_statuses.append({
+                    'account_bsnid': bsnid,
+                    'platform': platform,
+                    'status': rng.choices(self._platform_statuses, self._platform_status_weights)[0],
+                    'enablement_tier': rng.choices(self._tiers, self._tier_weights)[0]
+                })
+
+        for _ in range(rng.choices(self._use_case_counts, self._use_case_weights)[0]):
+            subject = rng.choice(_SUBJECTS)
+            chunk.use_cases.append({
+                'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                'account_bsnid': bsnid,
+                'platform': rng.choice(PLATFORMS),
+                'problem': self._text(rng, f"{subject} {rng.choice(_PROBLEMS)}.", _PROBLEMS),
+                'solution': self._text(rng, f"{rng.choice(_SOLUTIONS)}.", _SOLUTIONS),
+                'author': rng.choice(self.people),
+                'status': rng.choices(self._use_case_statuses, self._use_case_status_weights)[0],
+                'enablement_tier': rng.choices(self._tiers, self._tier_weights)[0],
+                'created_at': self._recent_date(rng, created_at)
+            })
+
+        for _ in range(rng.choices(self._update_counts, self._update_weights)[0]):
+            update_date = self._recent_date(rng, created_at)
+            chunk.updates.append({
+                'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                'account_bsnid': bsnid,
+                'author': rng.choice(self.people),
+                'platform': rng.choice(PLATFORMS),
+                'description': self._text(rng, f"{rng.choice(_PROGRESS)}.", _PROGRESS),
+                'update_date': update_date,
+                'created_at': update_date
+            })
+
+    def chunk(self, index, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Generate the accounts numbered index * chunk_size + 1 onwards, with their records"""
+        chunk = CrmChunk()
+        first = index * chunk_size + 1
+        for number in range(first, min(self.accounts, first + chunk_size - 1) + 1):
+            # Seeding per account keeps every account identical whatever the chunk size
+            self._account(random.Random(f"{self.seed}:{number}"), number, chunk)
+        return chunk
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Yield every chunk in order"""
+        for index in range((self.accounts + chunk_size - 1) // chunk_size):
+            yield self.chunk(index, chunk_size)
+
+
+def load_session_store(chunks, store):
+    """Add generated records to the shared store used by utils.data_manager
+
+    Call this only while the store is loading and no session holds its maps yet; the
+    search indexes and filter options rebuild on next use. Generated UUIDs are replaced
+    by the store's compact ids. Returns the number of accounts loaded.
+    """
+    accounts, use_cases, updates = dict(store.accounts), dict(store.use_cases), dict(store.updates)
+    loaded = 0
+    for chunk in chunks:
+        # Every record in a chunk belongs to one of its accounts, so each account is
+        # built once its statuses and record ids for the chunk are known
+        platforms_status = {account['bsnid']: {} for account in chunk.accounts}
+        use_case_ids = {bsnid: [] for bsnid in platforms_status}
+        update_ids = {bsnid: [] for bsnid in platforms_status}
+        for status in chunk.platform_statuses:
+            platforms_status[status['account_bsnid']][status['platform']] = status['status']
+        for use_case in chunk.use_cases:
+            use_case_id = next(store.ids)
+            use_cases[use_case_id] = make_use_case(
+                use_case_id, use_case['account_bsnid'], use_case['problem'], use_case['solution'],
+                use_case['author'], use_case['status'], use_case['enablement_tier'],
+                use_case['platform'], use_case['created_at']
+            )
+            use_case_ids[use_case['account_bsnid']].append(use_case_id)
+        for update in chunk.updates:
+            update_id = next(store.ids)
+            updates[update_id] = make_update(
+                update_id, update['account_bsnid'], update['author'], update['update_date'],
+                update['platform'], update['description'], update['created_at']
+            )
+            update_ids[update['account_bsnid']].append(update_id)
+        for account in chunk.accounts:
+            bsnid = account['bsnid']
+            accounts[bsnid] = make_account(
+                bsnid, account['team'], account['business_area'], account['vp'], account['admin'],
+                account['primary_it_partner'], platforms_status[bsnid],
+                account['azure_devops_links'], account['artifacts_folder_links'],
+                use_case_ids[bsnid], update_ids[bsnid], account['created_at']
+            )
+        loaded += len(chunk.accounts)
+    store.accounts, store.use_cases, store.updates = RecordMap(accounts), RecordMap(use_cases), RecordMap(updates)
+    store.filter_options = {}
+    return loaded
+
+
+def load_warehouse(chunks, batch_size=None, progress=None):
+    """Bulk-load generated records into the database_manager tables
+
+    Rows are written through the add_*_bulk API with their generated created_at, so
+    listings sort and page over the generated history. Uses whatever
+    get_connection_pool() connects to: Databricks, or the local stand-in when
+    LOCAL_SQL_DATABASE is set. progress(accounts_loaded), if given, is called
+    after each chunk. Returns the number of accounts loaded.
+    """
+    from utils import database_manager
+
+    loaded = 0
+    for chunk in chunks:
+        if database_manager.add_accounts_bulk(chunk.accounts, batch_size) < len(chunk.accounts):
+            break
+        database_manager.add_platform_statuses_bulk(chunk.platform_statuses, batch_size)
+        database_manager.add_use_cases_bulk(chunk.use_cases, batch_size)
+        database_manager.add_updates_bulk(chunk.updates, batch_size)
+        loaded += len(chunk.accounts)
+        if progress:
+            progress(loaded)
+    return loaded
+
+
+def load_edip_crm(chunks, batch_size=None, progress=None):
+    """Bulk-load generated records into the edip_crm.main tables of data_manager_databricks
+
+    The tables must exist (data_manager_databricks.create_database_schema). Returns
+    the number of accounts loaded.
+    """
+    from utils.connection_pool import get_connection_pool
+
+    pool = get_connection_pool()
+    if pool is None:
+        raise RuntimeError("No database connection configured")
+
+    loaded = 0
+    for chunk in chunks:
+        now = datetime.now()
+        with pool.cursor() as cursor:
+            insert_rows(cursor, "edip_crm.main.accounts", [
+                (a['bsnid'], a['team'], a['business_area'], a['vp'], a['admin'], a['primary_it_partner'],
+                 ",".join(a['azure_devops_links']), ",".join(a['artifacts_folder_links']),
+                 a['created_at'], a['created_at'])
+                for a in chunk.accounts
+            ], batch_size=batch_size)
+            insert_rows(cursor, "edip_crm.main.platforms_status", [
+                (str(uuid.uuid4()), s['account_bsnid'], s['platform'], s['status'], now, now)
+                for s in chunk.platform_statuses
+            ], batch_size=batch_size)
+            insert_rows(cursor, "edip_crm.main.use_cases", [
+                (u['id'], u['account_bsnid'], u['problem'], u['solution'], u['author'], u['status'],
+                 u['enablement_tier'], u['platform'], u['created_at'], u['created_at'])
+                for u in chunk.use_cases
+            ], batch_size=batch_size)
+            insert_rows(cursor, "edip_crm.main.updates", [
+                (u['id'], u['account_bsnid'], u['author'], u['update_date'].date(), u['platform'],
+                 u['description'], u['created_at'], u['created_at'])
+                for u in chunk.updates
+            ], batch_size=batch_size)
+        loaded += len(chunk.accounts)
+        if progress:
+            progress(loaded)
+    return loaded
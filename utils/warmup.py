@@ -0,0 +1,148 @@
+"""
+Process warmup
+Opens the connection pool, wakes the warehouse with a probe query and prefetches the
+account list, reference dimensions and system stats into the query cache once per
+process, so the first session after a cold start or scale-up does not pay for them.
+serve.py starts it before the server accepts sessions; app.py starts it on first run
+when the server was launched with plain `streamlit run`.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from utils.config import get_config
+from utils.connection_pool import get_connection_pool
+from utils.query_cache import track_uncacheable
+from utils import database_manager
+
+# Reference dimensions prefetched for the listing filters: (listing, field)
+DIMENSIONS = [
+    (listing, field)
+    for listing, columns in (('use_cases', database_manager.USE_CASE_FILTER_COLUMNS),
+                             ('updates', database_manager.UPDATE_FILTER_COLUMNS))
+    for field in columns
+]
+
+
+class WarmupStepError(Exception):
+    """Raised by a warmup step whose data could not be loaded"""
+
+
+def _open_pool():
+    pool = get_connection_pool()
+    if pool is None:
+        raise WarmupStepError("no warehouse configured")
+    return f"{pool.stats()['size']} connection(s) open"
+
+
+def _probe():
+    with get_connection_pool().cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+    return "warehouse responding"
+
+
+def _prefetch_accounts():
+    # A failed query returns [] like an empty table, but keeps its result out of the cache
+    with track_uncacheable() as call:
+        accounts = database_manager.get_all_accounts()
+        database_manager.get_accounts_page()
+    if not call['cacheable']:
+        raise WarmupStepError("accounts query failed")
+    # Builds the trigram index behind account search from the cached list
+    database_manager.search_accounts("")
+    return f"{len(accounts):,} accounts"
+
+
+def _prefetch_dimensions():
+    values = sum(len(database_manager.get_filter_options(listing, field)) for listing, field in DIMENSIONS)
+    return f"{len(DIMENSIONS)} dimensions, {values:,} values"
+
+
+def _prefetch_stats():
+    if database_manager.get_system_stats() is None:
+        raise WarmupStepError("stats query failed")
+    return "cached"
+
+
+STEPS = [
+    ("Open connection pool", _open_pool),
+    ("Probe warehouse", _probe),
+    ("Prefetch accounts", _prefetch_accounts),
+    ("Prefetch reference dimensions", _prefetch_dimensions),
+    ("Prefetch system stats", _prefetch_stats),
+]
+
+
+class Warmup:
+    """Runs STEPS once per process in a background thread and records their progress"""
+
+    def __init__(self, steps=STEPS):
+        self.steps = steps
+        self._lock = threading.Lock()
+        self._thread = None
+        self._done = threading.Event()
+        self._reset()
+
+    def _reset(self):
+        self.state = 'pending'
+        self.started_at = None
+        self.duration_ms = None
+        self.results = [{'step': name, 'status': 'pending', 'ms': None, 'detail': ''} for name, _ in self.steps]
+
+    def start(self, force=False):
+        """Start the warmup unless it already ran (or is running); force repeats a finished one"""
+        with self._lock:
+            if self._thread is not None and (self._thread.is_alive() or not force):
+                return False
+            if not get_config().warmup:
+                self.state = 'disabled'
+                self._done.set()
+                return False
+            self._reset()
+            self._done.clear()
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def run(self):
+        """Run every step in order; a failed step skips the ones after it"""
+        self.state = 'running'
+        self.started_at = datetime.now()
+        started = time.perf_counter()
+        failed = False
+        for result, (_, step) in zip(self.results, self.steps):
+            if failed:
+                result['status'] = 'skipped'
+                continue
+            result['status'] = 'running'
+            step_started = time.perf_counter()
+            try:
+                result['detail'] = step()
+                result['status'] = 'done'
+            except Exception as e:
+                result['detail'] = str(e)
+                result['status'] = 'failed'
+                failed = True
+            result['ms'] = (time.perf_counter() - step_started) * 1000
+        self.duration_ms = (time.perf_counter() - started) * 1000
+        self.state = 'failed' if failed else 'done'
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Block until the warmup finished; returns False on timeout"""
+        return self._done.wait(timeout)
+
+    def status(self):
+        """Snapshot of the warmup state, start time, duration and per-step results"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'started_at': self.started_at,
+                'duration_ms': self.duration_ms,
+                'steps': [dict(result) for result in self.results],
+            }
+
+
+warmup = Warmup()